@@ -0,0 +1,113 @@
+"""
+Login throughput at different bcrypt cost factors.
+
+Boots the app against a temporary SQLite database, creates one user per cost
+factor and fires concurrent POST /api/v1/auth/login requests through the WSGI
+test client, reporting logins/second, latency percentiles and how many
+requests were shed with 503 by the password hashing pool.
+
+    python benchmarks/bench_login_throughput.py --costs 4 8 10 12 --requests 200 --concurrency 16
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+PASSWORD = 'Benchmark-Passw0rd!'
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def build_app(db_path, workers, queue_size):
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ['PASSWORD_HASH_WORKERS'] = str(workers)
+    os.environ['PASSWORD_HASH_QUEUE_SIZE'] = str(queue_size)
+    from src.app import create_app
+    from src.db.models import db
+
+    app, _ = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+    return app
+
+def create_user(app, email, cost):
+    from src.auth import helpers
+    from src.db.models import db, User
+
+    with app.app_context():
+        user = User(name=email, email=email, password=helpers._hash(PASSWORD, cost), role='client')
+        db.session.add(user)
+        db.session.commit()
+
+def run_logins(app, email, requests, concurrency):
+    counter = iter(range(requests))
+    lock = threading.Lock()
+    latencies, statuses = [], []
+
+    def login(_):
+        with lock:
+            number = next(counter)
+        client = app.test_client()
+        # A distinct address per request keeps the global rate limiter out of the measurement
+        start = time.perf_counter()
+        response = client.post('/api/v1/auth/login', json={'email': email, 'password': PASSWORD},
+                               environ_base={'REMOTE_ADDR': f'10.{number // 65536 % 256}.{number // 256 % 256}.{number % 256}'})
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses.append(response.status_code)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(login, range(requests)))
+    wall = time.perf_counter() - started
+
+    ok = [latency for latency, status in zip(latencies, statuses) if status == 200]
+    return {
+        'throughput': len(ok) / wall,
+        'p50': percentile(ok, 50) if ok else 0,
+        'p95': percentile(ok, 95) if ok else 0,
+        'ok': len(ok),
+        'shed': statuses.count(503),
+        'other': len(statuses) - len(ok) - statuses.count(503)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--costs', type=int, nargs='+', default=[4, 8, 10, 12])
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--queue-size', type=int, default=32)
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(os.path.join(tmp, 'bench.db'), args.workers, args.queue_size)
+
+        print(f"{args.requests} logins, {args.concurrency} concurrent clients, "
+              f"{args.workers} hash workers, queue {args.queue_size}")
+        print(f"{'cost':>4} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'ok':>5} {'shed':>5} {'other':>5}")
+        for cost in args.costs:
+            # Hash at the configured cost so logins do not rehash mid-run
+            from src.auth import helpers
+            helpers.bcrypt_rounds = cost
+            email = f'bench-{cost}@example.com'
+            create_user(app, email, cost)
+            result = run_logins(app, email, args.requests, args.concurrency)
+            print(f"{cost:>4} {result['throughput']:>9.1f} {result['p50'] * 1000:>8.1f} "
+                  f"{result['p95'] * 1000:>8.1f} {result['ok']:>5} {result['shed']:>5} {result['other']:>5}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Per-request cost of the rate limiter as the number of clients grows.
+
+Calls MemoryRateLimitStorage.hit directly (no Flask request) for round-robin
+traffic from 10 up to 10,000 distinct clients and reports the mean cost per
+check. With O(1) state per key the cost should stay flat as clients grow; the
+--threads option runs the same traffic from several threads to show the lock
+stripes keeping contention down. --storage sqlite measures the cross-worker
+SQLite backend instead, against a temporary database file.
+
+    python benchmarks/bench_rate_limiter.py --clients 10 100 1000 10000 --requests 200000 --threads 1 4
+    python benchmarks/bench_rate_limiter.py --storage sqlite --requests 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.api.middlewares.rate_limit_storage import MemoryRateLimitStorage, SQLiteRateLimitStorage
+
+def build_storage(name, clients, workdir):
+    if name == 'sqlite':
+        return SQLiteRateLimitStorage(os.path.join(workdir, f'rate_limits_{clients}.db'))
+    return MemoryRateLimitStorage(max_keys=max(clients, 1) * 2)
+
+def run(limiter, clients, requests, threads, limit, window_seconds):
+    keys = [f"global:ip:10.0.{i // 256}.{i % 256}" for i in range(clients)]
+    per_thread = requests // threads
+    allowed = [0] * threads
+
+    def worker(index):
+        hit = limiter.hit
+        count = 0
+        for i in range(per_thread):
+            if hit(keys[(i * threads + index) % clients], limit, window_seconds)[0]:
+                count += 1
+        allowed[index] = count
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = per_thread * threads
+    return {
+        'clients': clients,
+        'threads': threads,
+        'checks_per_second': total / elapsed,
+        'ns_per_check': elapsed / total * 1e9,
+        'allowed': sum(allowed),
+        'keys_held': len(limiter)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--requests', type=int, default=200000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--limit', type=int, default=300)
+    parser.add_argument('--window', type=int, default=60)
+    parser.add_argument('--storage', choices=['memory', 'sqlite'], default='memory')
+    args = parser.parse_args()
+    workdir = tempfile.mkdtemp(prefix='devsync_bench_')
+
+    print(f"{'clients':>8} {'threads':>8} {'checks/s':>12} {'ns/check':>10} {'allowed':>9} {'keys':>7}")
+    for threads in args.threads:
+        for clients in args.clients:
+            limiter = build_storage(args.storage, clients, workdir)
+            result = run(limiter, clients, args.requests, threads, args.limit, args.window)
+            print(f"{result['clients']:>8} {result['threads']:>8} {result['checks_per_second']:>12.0f} "
+                  f"{result['ns_per_check']:>10.0f} {result['allowed']:>9} {result['keys_held']:>7}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""
+Socket.IO fan-out throughput and latency, and a connection churn soak test.
+
+Builds an app around init_socketio(app) on an in-memory SQLite database,
+connects --clients authenticated Socket.IO test clients, registers them and
+joins each to --rooms-per-client of --projects project rooms. It then
+measures:
+
+  * task_update and comment_added broadcasts: time until the server has
+    delivered the event to every member of the room, and deliveries/second
+  * NotificationService.send_to_user targeted emits, including the
+    notification's INSERT
+
+The test clients talk to the real python-socketio server in process, so the
+numbers are the server's CPU cost per event up to handing the packets to
+engine.io, without network time; divide a node's event budget by them to
+size realtime nodes.
+
+With --soak SECONDS, clients keep disconnecting and reconnecting into
+newly created projects while broadcasts continue. The process RSS, traced
+Python memory and the size of connected_users and project_rooms are
+sampled every --sample-interval seconds, so growth that outlives the
+clients shows up.
+
+    python benchmarks/bench_socketio_fanout.py --clients 5000 --projects 200 --broadcasts 2000
+    python benchmarks/bench_socketio_fanout.py --clients 2000 --soak 1800 --churn 0.05 --output soak.json
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask, request
+from flask_jwt_extended import JWTManager, create_access_token
+
+from src.auth.identity_cache import identity_cache
+from src.db.models import db, User
+from src.services.notification_service import NotificationService
+from src.socketio_server import connected_users, init_socketio, project_rooms
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        import resource
+        # Peak rather than current RSS where /proc is unavailable
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def build_app(users):
+    app = Flask(__name__)
+    app.config.update({
+        'JWT_SECRET_KEY': 'socketio-fanout-benchmark-secret-key',
+        # Identities are dicts, which newer PyJWT releases refuse in the 'sub' claim
+        'JWT_IDENTITY_CLAIM': 'identity',
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'IDENTITY_CACHE_MAX_SIZE': users * 2,
+    })
+    JWTManager(app)
+    db.init_app(app)
+    identity_cache.init_app(app)
+    socketio = init_socketio(app)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(User.__table__.insert(), [
+            {'id': i, 'name': f'User {i}', 'email': f'user{i}@example.com', 'password': 'x', 'role': 'client'}
+            for i in range(1, users + 1)
+        ])
+        db.session.commit()
+    return app, socketio
+
+class Clients:
+    """Authenticated test clients, keyed by user id"""
+
+    def __init__(self, app, socketio):
+        self.app = app
+        self.socketio = socketio
+        self.clients = {}
+        self.rooms = {}
+        self._tokens = {}
+        self._handed_off = 0
+        # Newer python-socketio servers encode a room broadcast once and hand it straight to
+        # engine.io, bypassing the test clients' queues; count those packets instead
+        if hasattr(socketio.server, '_send_eio_packet'):
+            socketio.server._send_eio_packet = self._count_packet
+
+    def _count_packet(self, eio_sid, eio_packet):
+        self._handed_off += 1
+
+    def token(self, user_id):
+        if user_id not in self._tokens:
+            with self.app.app_context():
+                self._tokens[user_id] = create_access_token(identity={'user_id': user_id})
+        return self._tokens[user_id]
+
+    def connect(self, user_id, project_ids):
+        client = self.socketio.test_client(self.app, headers={'Authorization': f'Bearer {self.token(user_id)}'})
+        ack = client.emit('register', {}, callback=True)
+        if not ack:
+            raise RuntimeError(f"Socket.IO authentication failed for user {user_id}: 'register' was rejected")
+        for project_id in project_ids:
+            client.emit('join_project', {'project_id': project_id}, callback=True)
+        self.clients[user_id] = client
+        self.rooms[user_id] = project_ids
+        return client
+
+    def disconnect(self, user_id):
+        self.clients.pop(user_id).disconnect()
+        self.rooms.pop(user_id, None)
+
+    def drain(self):
+        """Discard delivered events, returning how many there were"""
+        delivered, self._handed_off = self._handed_off, 0
+        return delivered + sum(len(client.get_received()) for client in self.clients.values())
+
+def connect_all(clients, count, projects, rooms_per_client, rng):
+    started = time.perf_counter()
+    for user_id in range(1, count + 1):
+        clients.connect(user_id, rng.sample(range(1, projects + 1), rooms_per_client))
+    elapsed = time.perf_counter() - started
+    print(f"Connected, registered and joined {count} clients in {elapsed:.1f}s "
+          f"({count / elapsed:.0f}/s, {elapsed / count * 1000:.2f}ms each)")
+
+def measure_broadcasts(clients, event, broadcasts, rng, mentions=0):
+    """Latency of each broadcast until every room member has it queued"""
+    senders = list(clients.clients)
+    latencies, deliveries = [], 0
+    for i in range(broadcasts):
+        sender = rng.choice(senders)
+        payload = {'project_id': rng.choice(clients.rooms[sender]), 'task_id': i + 1, 'timestamp': time.time()}
+        if event == 'comment_added':
+            payload['comment_id'] = i + 1
+            payload['mentioned_users'] = rng.sample(senders, mentions)
+        started = time.perf_counter()
+        clients.clients[sender].emit(event, payload, callback=True)
+        latencies.append(time.perf_counter() - started)
+        # Draining every so often keeps the client queues from skewing memory
+        if i % 50 == 49:
+            deliveries += clients.drain()
+    deliveries += clients.drain()
+    return latencies, deliveries
+
+def measure_targeted(app, socketio, clients, sends, rng):
+    """NotificationService.send_to_user to connected users"""
+    targets = list(clients.clients)
+    latencies = []
+    with app.test_request_context('/'):
+        # send_to_user emits through flask_socketio.emit, which reads the namespace off the request
+        request.namespace = '/'
+        for i in range(sends):
+            started = time.perf_counter()
+            NotificationService.send_to_user(rng.choice(targets), 'task_assigned', 'Task assigned',
+                                             f'You have been assigned task {i}', reference_id=str(i))
+            latencies.append(time.perf_counter() - started)
+        db.session.remove()
+    return latencies, clients.drain()
+
+def report(name, latencies, deliveries):
+    total = sum(latencies)
+    print(f"{name:<28}{len(latencies):>8}{deliveries:>12}{len(latencies) / total:>10.0f}{deliveries / total:>13.0f}"
+          f"{percentile(latencies, 50) * 1000:>9.2f}ms{percentile(latencies, 95) * 1000:>8.2f}ms"
+          f"{percentile(latencies, 99) * 1000:>8.2f}ms")
+    return {
+        'events': len(latencies), 'deliveries': deliveries,
+        'events_per_second': round(len(latencies) / total, 1),
+        'deliveries_per_second': round(deliveries / total, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3)
+    }
+
+def state_sample(started, clients):
+    memberships = sum(len(members) for members in project_rooms.values())
+    return {
+        'elapsed_s': round(time.monotonic() - started, 1),
+        'clients': len(clients.clients),
+        'connected_users': len(connected_users),
+        'project_rooms': len(project_rooms),
+        'empty_rooms': sum(1 for members in project_rooms.values() if not members),
+        'room_memberships': memberships,
+        'rss_mb': round(rss_mb(), 1),
+        'traced_mb': round(tracemalloc.get_traced_memory()[0] / 2 ** 20, 1) if tracemalloc.is_tracing() else None
+    }
+
+def soak(app, socketio, clients, args, rng):
+    """Churn connections into new projects while broadcasting, sampling memory"""
+    started = time.monotonic()
+    next_sample = started
+    next_project = args.projects + 1
+    next_user = len(clients.clients) + 1
+    samples = []
+    print(f"\n{'elapsed':>8}{'clients':>9}{'users':>8}{'rooms':>8}{'empty':>8}{'members':>9}{'rss':>9}{'traced':>9}")
+    while time.monotonic() - started < args.soak:
+        # New projects keep appearing, as they do in production
+        if rng.random() < args.new_project_rate:
+            next_project += 1
+        live_projects = range(max(1, next_project - args.projects), next_project)
+
+        for user_id in rng.sample(list(clients.clients), max(1, int(len(clients.clients) * args.churn))):
+            clients.disconnect(user_id)
+            # Reconnect as a user that has not connected before, as new sessions do
+            if next_user > args.users:
+                next_user = 1
+            while next_user in clients.clients:
+                next_user += 1
+            clients.connect(next_user, rng.sample(live_projects, args.rooms_per_client))
+            next_user += 1
+
+        measure_broadcasts(clients, 'task_update', args.soak_broadcasts, rng)
+
+        if time.monotonic() >= next_sample:
+            gc.collect()
+            sample = state_sample(started, clients)
+            samples.append(sample)
+            traced = f"{sample['traced_mb']:>7.1f}MB" if sample['traced_mb'] is not None else f"{'-':>9}"
+            print(f"{sample['elapsed_s']:>7.0f}s{sample['clients']:>9}{sample['connected_users']:>8}"
+                  f"{sample['project_rooms']:>8}{sample['empty_rooms']:>8}{sample['room_memberships']:>9}"
+                  f"{sample['rss_mb']:>7.1f}MB{traced}")
+            next_sample += args.sample_interval
+
+    first, last = samples[0], samples[-1]
+    print(f"\nOver {last['elapsed_s']:.0f}s: RSS {first['rss_mb']:.1f} -> {last['rss_mb']:.1f}MB, "
+          f"project_rooms {first['project_rooms']} -> {last['project_rooms']} "
+          f"({last['empty_rooms']} empty), connected_users {first['connected_users']} -> {last['connected_users']} "
+          f"for {last['clients']} live clients")
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=2000, help='connected clients')
+    parser.add_argument('--users', type=int, help='distinct users to connect as (default: 2x --clients)')
+    parser.add_argument('--projects', type=int, default=100, help='live project rooms')
+    parser.add_argument('--rooms-per-client', type=int, default=3)
+    parser.add_argument('--broadcasts', type=int, default=1000, help='events of each broadcast type')
+    parser.add_argument('--mentions', type=int, default=2, help='users mentioned in each comment_added')
+    parser.add_argument('--targeted', type=int, default=500, help='NotificationService.send_to_user calls')
+    parser.add_argument('--soak', type=float, default=0, help='seconds of connection churn after the benchmark')
+    parser.add_argument('--churn', type=float, default=0.02, help='share of clients reconnecting per soak step')
+    parser.add_argument('--new-project-rate', type=float, default=0.2, help='chance a soak step creates a project')
+    parser.add_argument('--soak-broadcasts', type=int, default=20, help='broadcasts per soak step')
+    parser.add_argument('--sample-interval', type=float, default=10)
+    parser.add_argument('--tracemalloc', action='store_true', help='also trace Python allocations (slower)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the results as JSON')
+    args = parser.parse_args()
+    args.users = args.users or args.clients * 2
+    args.rooms_per_client = min(args.rooms_per_client, args.projects)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    rng = random.Random(args.seed)
+    app, socketio = build_app(args.users)
+    clients = Clients(app, socketio)
+    baseline_rss = rss_mb()
+    connect_all(clients, args.clients, args.projects, args.rooms_per_client, rng)
+    print(f"RSS grew {rss_mb() - baseline_rss:.1f}MB for {args.clients} clients; "
+          f"{len(connected_users)} connected_users, {len(project_rooms)} project_rooms")
+
+    print(f"\n{'event':<28}{'events':>8}{'deliveries':>12}{'events/s':>10}{'deliveries/s':>13}"
+          f"{'p50':>11}{'p95':>10}{'p99':>10}")
+    results = {
+        'task_update': report('task_update', *measure_broadcasts(clients, 'task_update', args.broadcasts, rng)),
+        'comment_added': report('comment_added', *measure_broadcasts(
+            clients, 'comment_added', args.broadcasts, rng, mentions=min(args.mentions, args.clients))),
+        'send_to_user': report('send_to_user', *measure_targeted(app, socketio, clients, args.targeted, rng))
+    }
+
+    samples = soak(app, socketio, clients, args, rng) if args.soak else []
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'args': vars(args), 'results': results, 'soak': samples}, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+    for user_id in list(clients.clients):
+        clients.disconnect(user_id)
+
+if __name__ == '__main__':
+    main()
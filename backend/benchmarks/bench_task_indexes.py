@@ -0,0 +1,187 @@
+"""
+Task query latency and plans with the old and the workload-driven index sets.
+
+Seeds a database with --tasks tasks (1M by default), then for each index set
+drops every task index, builds the set, ANALYZEs and runs the task query
+shapes the API issues, reporting p50/p95 latency and the query plan of each.
+Defaults to a temporary SQLite file; pass a PostgreSQL URL to see
+EXPLAIN (ANALYZE, BUFFERS) plans, including the partial indexes.
+
+    python benchmarks/bench_task_indexes.py --tasks 1000000
+    python benchmarks/bench_task_indexes.py --database-url postgresql://localhost/devsync_bench --skip-seed
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, func, or_, select, text
+from sqlalchemy.schema import CreateIndex
+
+from src.db.models import db, Task, User, Project
+
+# The single-column index set tasks had before the workload-driven one
+OLD_INDEXES = [
+    ('idx_tasks_assigned_to', 'assigned_to'),
+    ('idx_tasks_created_at', 'created_at'),
+    ('idx_tasks_created_by', 'created_by'),
+    ('idx_tasks_deadline', 'deadline'),
+    ('idx_tasks_deadline_status', 'deadline, status'),
+    ('idx_tasks_progress', 'progress'),
+    ('idx_tasks_status', 'status'),
+    ('idx_tasks_status_assigned', 'status, assigned_to'),
+    ('idx_tasks_updated_at', 'updated_at'),
+]
+STATUSES = ['done'] * 6 + ['todo'] * 2 + ['in_progress'] * 2
+NOW = datetime(2025, 1, 15, 12, 0, 0)
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def seed(engine, tasks, users, projects, chunk_size=10000):
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {'id': i, 'name': f'User {i}', 'email': f'user{i}@example.com', 'password': 'x',
+             'role': 'developer', 'created_at': NOW}
+            for i in range(1, users + 1)
+        ])
+        conn.execute(Project.__table__.insert(), [
+            {'id': i, 'name': f'Project {i}', 'status': 'active', 'created_by': rng.randint(1, users),
+             'created_at': NOW, 'updated_at': NOW}
+            for i in range(1, projects + 1)
+        ])
+
+    started = time.perf_counter()
+    for start in range(0, tasks, chunk_size):
+        rows = []
+        for i in range(start + 1, min(tasks, start + chunk_size) + 1):
+            updated = NOW - timedelta(minutes=rng.randint(0, 525600))
+            rows.append({
+                'id': i, 'title': f'Task {i}', 'status': rng.choice(STATUSES), 'progress': rng.randint(0, 100),
+                'assigned_to': rng.randint(1, users), 'created_by': rng.randint(1, users),
+                'project_id': rng.randint(1, projects),
+                'deadline': NOW + timedelta(hours=rng.randint(-24 * 180, 24 * 180)),
+                'created_at': updated - timedelta(days=rng.randint(0, 60)), 'updated_at': updated
+            })
+        with engine.begin() as conn:
+            conn.execute(Task.__table__.insert(), rows)
+    print(f"Seeded {tasks} tasks in {time.perf_counter() - started:.1f}s")
+
+def task_queries(users, projects):
+    """The task query shapes issued by the API, as (name, statement factory)"""
+    tasks = Task.__table__
+    week_later = NOW + timedelta(days=7)
+    month_ago = NOW - timedelta(days=30)
+    return [
+        ('project tasks', lambda rng: select(tasks).where(tasks.c.project_id == rng.randint(1, projects))),
+        ('project tasks by status', lambda rng: select(tasks).where(
+            tasks.c.project_id == rng.randint(1, projects), tasks.c.status == 'in_progress')),
+        ('project recent activity', lambda rng: select(tasks).where(
+            tasks.c.project_id == rng.randint(1, projects)).order_by(tasks.c.updated_at.desc()).limit(5)),
+        ('project upcoming deadlines', lambda rng: select(tasks).where(
+            tasks.c.project_id == rng.randint(1, projects), tasks.c.deadline.between(NOW, week_later),
+            tasks.c.status != 'done')),
+        ('assignee upcoming deadlines', lambda rng: select(tasks).where(
+            tasks.c.assigned_to == rng.randint(1, users), tasks.c.deadline.between(NOW, week_later),
+            tasks.c.status != 'done')),
+        ('assignee completed this month', lambda rng: select(tasks).where(
+            tasks.c.assigned_to == rng.randint(1, users), tasks.c.status == 'done',
+            tasks.c.updated_at >= month_ago)),
+        ('visible to client', lambda rng: (lambda user: select(func.count()).select_from(tasks).where(
+            or_(tasks.c.assigned_to == user, tasks.c.created_by == user)))(rng.randint(1, users))),
+    ]
+
+def build_indexes(engine, index_set):
+    """Replace every task index with the given set"""
+    declared = sorted(Task.__table__.indexes, key=lambda index: index.name)
+    names = {name for name, _ in OLD_INDEXES} | {index.name for index in declared}
+    with engine.begin() as conn:
+        for name in names:
+            conn.execute(text(f'DROP INDEX IF EXISTS {name}'))
+        if index_set == 'old':
+            for name, columns in OLD_INDEXES:
+                conn.execute(text(f'CREATE INDEX {name} ON tasks ({columns})'))
+        else:
+            for index in declared:
+                conn.execute(CreateIndex(index))
+        conn.execute(text('ANALYZE'))
+
+def explain(conn, statement):
+    compiled = statement.compile(dialect=conn.dialect)
+    if conn.dialect.name == 'postgresql':
+        sql, parameters = f'EXPLAIN (ANALYZE, BUFFERS) {compiled}', compiled.params
+    else:
+        sql = f'EXPLAIN QUERY PLAN {compiled}'
+        parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = conn.exec_driver_sql(sql, parameters).fetchall()
+    return [row[0] if conn.dialect.name == 'postgresql' else row[-1] for row in rows]
+
+def measure(engine, queries, runs):
+    results = {}
+    with engine.connect() as conn:
+        for name, make_statement in queries:
+            rng = random.Random(7)
+            # Warm the cache so both index sets are measured the same way
+            conn.execute(make_statement(rng)).fetchall()
+            latencies = []
+            for _ in range(runs):
+                statement = make_statement(rng)
+                started = time.perf_counter()
+                conn.execute(statement).fetchall()
+                latencies.append((time.perf_counter() - started) * 1000)
+            results[name] = {
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'plan': explain(conn, make_statement(rng))
+            }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='database to seed (default: a temporary SQLite file)')
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--projects', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=50, help='executions of each query per index set')
+    parser.add_argument('--skip-seed', action='store_true', help='reuse the tasks already in --database-url')
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tasks.db')}"
+    engine = create_engine(url)
+    if not args.skip_seed:
+        seed(engine, args.tasks, args.users, args.projects)
+
+    queries = task_queries(args.users, args.projects)
+    results = {}
+    for index_set in ('old', 'new'):
+        started = time.perf_counter()
+        build_indexes(engine, index_set)
+        print(f"Built {index_set} index set in {time.perf_counter() - started:.1f}s")
+        results[index_set] = measure(engine, queries, args.runs)
+
+    print(f"\n{'query':<32}{'old p50':>10}{'old p95':>10}{'new p50':>10}{'new p95':>10}{'speedup':>10}")
+    for name, _ in queries:
+        old, new = results['old'][name], results['new'][name]
+        print(f"{name:<32}{old['p50']:>9.2f}ms{old['p95']:>8.2f}ms{new['p50']:>8.2f}ms{new['p95']:>8.2f}ms"
+              f"{old['p50'] / max(new['p50'], 1e-6):>9.1f}x")
+
+    for name, _ in queries:
+        print(f"\n== {name} ==")
+        for index_set in ('old', 'new'):
+            print(f"  {index_set}:")
+            for line in results[index_set][name]['plan']:
+                print(f"    {line}")
+    engine.dispose()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Local stand-in for the GitHub REST API.
+
+Serves the endpoints the load test reaches (the authenticated user, their
+repositories, and a repository's issues and pulls) with deterministic
+payloads derived from the access token, after an optional artificial
+latency. Point the app at it with GITHUB_API_URL.
+
+    python benchmarks/fake_github.py --port 9100 --latency-ms 40
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+EPOCH = datetime(2025, 1, 1)
+
+def _timestamp(offset_hours):
+    return (EPOCH + timedelta(hours=offset_hours)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _login(token):
+    return token.rsplit('_', 1)[-1] if token else 'anonymous'
+
+def repository(login, number):
+    return {
+        'id': 500000 + number,
+        'name': f'project-{number}',
+        'full_name': f'{login}/project-{number}',
+        'owner': {'login': login},
+        'html_url': f'https://github.com/{login}/project-{number}',
+        'description': f'Synthetic repository {number}',
+        'private': number % 3 == 0,
+        'fork': number % 5 == 0,
+        'created_at': _timestamp(number),
+        'updated_at': _timestamp(number * 2),
+        'pushed_at': _timestamp(number * 2),
+        'language': ['Python', 'JavaScript', 'Go', 'Rust'][number % 4],
+        'default_branch': 'main',
+        'open_issues_count': number % 17
+    }
+
+def issue(owner, repo, number, pull=False):
+    item = {
+        'id': 900000 + number,
+        'number': number,
+        'title': f'{"Pull request" if pull else "Issue"} {number}',
+        'state': 'open' if number % 3 else 'closed',
+        'html_url': f'https://github.com/{owner}/{repo}/{"pull" if pull else "issues"}/{number}',
+        'user': {'login': f'contributor-{number % 7}'},
+        'created_at': _timestamp(number),
+        'updated_at': _timestamp(number + 1),
+        'closed_at': None if number % 3 else _timestamp(number + 2),
+        'body': f'Synthetic body {number}',
+        'labels': [],
+        'assignees': []
+    }
+    if pull:
+        item['merged_at'] = None
+    return item
+
+class FakeGitHub(ThreadingHTTPServer):
+    """Threaded HTTP server answering like api.github.com"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=0, repositories=45):
+        super().__init__(address, FakeGitHubHandler)
+        self.latency = latency_ms / 1000
+        self.repositories = repositories
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def count(self):
+        with self._lock:
+            self.requests_served += 1
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    ROUTES = [
+        (re.compile(r'^/user$'), 'user'),
+        (re.compile(r'^/user/repos$'), 'user_repos'),
+        (re.compile(r'^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)$'), 'repo'),
+        (re.compile(r'^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/issues$'), 'issues'),
+        (re.compile(r'^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/pulls$'), 'pulls'),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.count()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        parsed = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        token = self.headers.get('Authorization', '').replace('token ', '', 1)
+        for pattern, name in self.ROUTES:
+            match = pattern.match(parsed.path)
+            if match:
+                return getattr(self, name)(query, token, **match.groupdict())
+        self.send_json({'message': 'Not Found'}, status=404)
+
+    def user(self, query, token):
+        login = _login(token)
+        self.send_json({'login': login, 'id': zlib.crc32(login.encode()), 'name': login, 'email': None})
+
+    def user_repos(self, query, token):
+        login = _login(token)
+        items = [repository(login, number) for number in range(1, self.server.repositories + 1)]
+        self.send_page('/user/repos', query, items)
+
+    def repo(self, query, token, owner, repo):
+        number = int(re.sub(r'\D', '', repo) or 0)
+        self.send_json(repository(owner, number))
+
+    def issues(self, query, token, owner, repo):
+        self.send_page('/repos/%s/%s/issues' % (owner, repo), query,
+                       [issue(owner, repo, number) for number in range(1, 61)])
+
+    def pulls(self, query, token, owner, repo):
+        self.send_page('/repos/%s/%s/pulls' % (owner, repo), query,
+                       [issue(owner, repo, number, pull=True) for number in range(1, 31)])
+
+    def send_page(self, parsed_path, query, items):
+        page = max(1, int(query.get('page', 1)))
+        per_page = max(1, min(100, int(query.get('per_page', 30))))
+        last_page = max(1, -(-len(items) // per_page))
+        headers = {}
+        if last_page > 1:
+            host = self.headers.get('Host', 'localhost')
+            headers['Link'] = (f'<http://{host}{parsed_path}?page={min(page + 1, last_page)}&per_page={per_page}>; rel="next", '
+                               f'<http://{host}{parsed_path}?page={last_page}&per_page={per_page}>; rel="last"')
+        self.send_json(items[(page - 1) * per_page:page * per_page], headers=headers)
+
+    def send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-RateLimit-Limit', '5000')
+        self.send_header('X-RateLimit-Remaining', '4999')
+        self.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+def start(host='127.0.0.1', port=0, latency_ms=0, repositories=45):
+    """Start a FakeGitHub server on a background thread and return it"""
+    server = FakeGitHub((host, port), latency_ms=latency_ms, repositories=repositories)
+    threading.Thread(target=server.serve_forever, name='fake-github', daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--latency-ms', type=float, default=0, help='delay added to every response')
+    parser.add_argument('--repositories', type=int, default=45, help='repositories each user owns')
+    args = parser.parse_args()
+
+    server = FakeGitHub((args.host, args.port), latency_ms=args.latency_ms, repositories=args.repositories)
+    print(f"Fake GitHub API listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+"""
+End-to-end HTTP load test of the API under gunicorn.
+
+Seeds a database with the synthetic data generator, starts the fake GitHub
+API from fake_github.py and boots src.wsgi:app under gunicorn against both.
+--concurrency virtual users then repeat a scripted session for --duration
+seconds: log in, open the dashboard, open a project's task board and their
+own tasks, read and comment on a task, poll notifications and list their
+GitHub repositories when connected. Throughput, error rate and p50/p95/p99
+latency per endpoint are written as JSON to --output.
+
+With --compare, the run is checked against an earlier result and the script
+exits with status 1 when any endpoint's p95 or p99 latency grew, or its
+throughput fell, by more than --tolerance, or its error rate rose.
+
+    python benchmarks/load_test.py --concurrency 32 --duration 120 --output baseline.json
+    python benchmarks/load_test.py --concurrency 32 --duration 120 --compare baseline.json
+    python benchmarks/load_test.py --database-url postgresql://localhost/devsync_load --users 10000 --tasks 1000000
+    python benchmarks/load_test.py --base-url http://staging:8000 --skip-seed --concurrency 64
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+import fake_github
+
+API = '/api/v1'
+DEFAULT_PASSWORD = 'DevSync-Load-Test-1!'
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def seed_database(args, url):
+    """Fill the database with the synthetic data generator"""
+    from src.db.scripts.generate_data import generate_data, parse_args as generator_args
+
+    argv = ['--database-url', url, '--reset', '--users', str(args.users), '--projects', str(args.projects),
+            '--tasks', str(args.tasks), '--seed', str(args.seed), '--password', args.password,
+            '--bcrypt-rounds', str(args.bcrypt_rounds)]
+    started = time.perf_counter()
+    if not generate_data(generator_args(argv)):
+        sys.exit("Seeding the database failed")
+    print(f"Seeded {args.users} users, {args.projects} projects and {args.tasks} tasks "
+          f"in {time.perf_counter() - started:.1f}s")
+
+class Server:
+    """gunicorn serving src.wsgi:app in a child process"""
+
+    def __init__(self, args, database_url, github_url, log_path):
+        self.port = free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        env = dict(os.environ)
+        env.update({
+            'FLASK_ENV': 'production',
+            'DATABASE_URL': database_url,
+            'GITHUB_API_URL': github_url,
+            'BCRYPT_ROUNDS': str(args.bcrypt_rounds),
+            # Every virtual user shares one address, which the global limit would throttle as one client
+            'RATE_LIMIT_GLOBAL_REQUESTS': str(10 ** 9),
+        })
+        env.update(dict(item.split('=', 1) for item in args.env))
+        command = [sys.executable, '-m', 'gunicorn', '--workers', str(args.workers), '--threads', str(args.threads),
+                   '--bind', f'127.0.0.1:{self.port}', '--log-level', 'warning', 'src.wsgi:app']
+        self.log = open(log_path, 'w')
+        self.process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=self.log, stderr=subprocess.STDOUT)
+
+    def wait_until_ready(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                sys.exit(f"gunicorn exited with status {self.process.returncode}; see {self.log.name}")
+            try:
+                if requests.get(f'{self.url}/', timeout=1).status_code == 200:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.25)
+        self.stop()
+        sys.exit(f"gunicorn did not answer within {timeout}s; see {self.log.name}")
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.log.close()
+
+class Recorder:
+    """Collects (endpoint, latency, status) samples from every virtual user"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, latency_ms, status, ok):
+        with self._lock:
+            self.samples[endpoint].append(latency_ms)
+            self.statuses[endpoint][str(status)] += 1
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def summary(self, elapsed):
+        endpoints = {}
+        for endpoint in sorted(self.samples):
+            latencies = self.samples[endpoint]
+            endpoints[endpoint] = summarise(latencies, self.errors[endpoint], elapsed)
+            endpoints[endpoint]['statuses'] = dict(self.statuses[endpoint])
+        everything = [latency for latencies in self.samples.values() for latency in latencies]
+        total = summarise(everything, sum(self.errors.values()), elapsed) if everything else {}
+        return endpoints, total
+
+def summarise(latencies, errors, elapsed):
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'error_rate': round(errors / len(latencies), 4),
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'max_ms': round(max(latencies), 2)
+    }
+
+class VirtualUser:
+    """Replays the scripted session of one signed-in user"""
+
+    def __init__(self, base_url, recorder, rng, users, admins, password, polls, think_time):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.rng = rng
+        self.users = users
+        self.admins = admins
+        self.password = password
+        self.polls = polls
+        self.think_time = think_time
+        self.http = requests.Session()
+
+    def call(self, method, endpoint, path, expected=(200,), **kwargs):
+        """Issue one request, recording it under the endpoint's route template"""
+        started = time.perf_counter()
+        try:
+            response = self.http.request(method, f'{self.base_url}{API}{path}', timeout=30, **kwargs)
+        except requests.RequestException:
+            self.recorder.record(f'{method} {API}{endpoint}', (time.perf_counter() - started) * 1000, 'error', False)
+            return None
+        latency = (time.perf_counter() - started) * 1000
+        ok = response.status_code in expected
+        self.recorder.record(f'{method} {API}{endpoint}', latency, response.status_code, ok)
+        return response if ok else None
+
+    def think(self):
+        if self.think_time:
+            time.sleep(self.rng.uniform(0, 2 * self.think_time))
+
+    def session(self):
+        # Admins see every task, so sessions sign in as the regular users
+        user_id = self.rng.randint(self.admins + 1, self.users)
+        self.http.cookies.clear()
+        response = self.call('POST', '/auth/login', '/auth/login',
+                             json={'email': f'user{user_id}@example.com', 'password': self.password})
+        if response is None:
+            return
+        user = response.json()['user']
+        self.http.headers['Authorization'] = f"Bearer {user['token']}"
+        self.think()
+
+        self.call('GET', '/dashboard', '/dashboard')
+        self.think()
+
+        projects = self.call('GET', '/projects', '/projects')
+        project_list = projects.json().get('projects', []) if projects is not None else []
+        if project_list:
+            project = self.rng.choice(project_list)
+            self.call('GET', '/projects/<project_id>/tasks', f"/projects/{project['id']}/tasks")
+        tasks = self.call('GET', '/tasks', '/tasks')
+        task_list = tasks.json().get('tasks', []) if tasks is not None else []
+        self.think()
+
+        if task_list:
+            task = self.rng.choice(task_list)
+            self.call('GET', '/tasks/<task_id>/comments', f"/tasks/{task['id']}/comments")
+            self.call('POST', '/tasks/<task_id>/comments', f"/tasks/{task['id']}/comments", expected=(200, 201),
+                      json={'content': f'Load test comment from user {user_id}'})
+            self.think()
+
+        for _ in range(self.polls):
+            self.call('GET', '/notifications', '/notifications')
+            self.think()
+
+        if user.get('github_connected'):
+            self.call('GET', '/github/repositories', '/github/repositories')
+
+    def run(self, stop_at):
+        while time.monotonic() < stop_at:
+            self.session()
+
+def run_load(args, base_url):
+    recorder = Recorder()
+    stop_at = time.monotonic() + args.duration
+    admins = args.users // 50
+    threads = []
+    started = time.perf_counter()
+    for index in range(args.concurrency):
+        user = VirtualUser(base_url, recorder, random.Random(f'{args.seed}:{index}'), args.users, admins,
+                           args.password, args.polls, args.think_time)
+        thread = threading.Thread(target=user.run, args=(stop_at,), name=f'virtual-user-{index}', daemon=True)
+        threads.append(thread)
+        thread.start()
+        if args.ramp_up:
+            time.sleep(args.ramp_up / args.concurrency)
+    for thread in threads:
+        thread.join()
+    return recorder, time.perf_counter() - started
+
+def compare(current, baseline, tolerance):
+    """Regressions of the current run against a baseline, as printable strings"""
+    regressions = []
+    for endpoint, before in sorted(baseline['endpoints'].items()):
+        after = current['endpoints'].get(endpoint)
+        if after is None:
+            regressions.append(f"{endpoint}: not exercised in this run")
+            continue
+        for key in ('p95_ms', 'p99_ms'):
+            if after[key] > before[key] * (1 + tolerance):
+                regressions.append(f"{endpoint}: {key} {before[key]:.1f} -> {after[key]:.1f}")
+        if after['throughput_rps'] < before['throughput_rps'] * (1 - tolerance):
+            regressions.append(f"{endpoint}: throughput {before['throughput_rps']:.1f} -> {after['throughput_rps']:.1f} req/s")
+        if after['error_rate'] > before['error_rate'] + 0.01:
+            regressions.append(f"{endpoint}: error rate {before['error_rate']:.2%} -> {after['error_rate']:.2%}")
+    return regressions
+
+def print_report(result, baseline=None):
+    print(f"\n{'endpoint':<42}{'req':>7}{'err':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    rows = list(result['endpoints'].items()) + [('total', result['total'])]
+    for endpoint, stats in rows:
+        print(f"{endpoint:<42}{stats['requests']:>7}{stats['errors']:>6}{stats['throughput_rps']:>9.1f}"
+              f"{stats['p50_ms']:>7.1f}ms{stats['p95_ms']:>7.1f}ms{stats['p99_ms']:>7.1f}ms")
+        before = baseline and (baseline['total'] if endpoint == 'total' else baseline['endpoints'].get(endpoint))
+        if before:
+            print(f"{'  baseline':<42}{before['requests']:>7}{before['errors']:>6}{before['throughput_rps']:>9.1f}"
+                  f"{before['p50_ms']:>7.1f}ms{before['p95_ms']:>7.1f}ms{before['p99_ms']:>7.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='database to seed and serve (default: a temporary SQLite file)')
+    parser.add_argument('--base-url', help='load an already running server instead of booting one')
+    parser.add_argument('--skip-seed', action='store_true', help='reuse the data already in --database-url')
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--projects', type=int, default=100)
+    parser.add_argument('--tasks', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=42, help='seeds both the data and the virtual users')
+    parser.add_argument('--password', default=DEFAULT_PASSWORD)
+    parser.add_argument('--bcrypt-rounds', type=int, default=12, help='cost of the seeded hashes and of the server')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads per worker')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE', help='extra server environment')
+    parser.add_argument('--github-latency-ms', type=float, default=50, help='latency of the fake GitHub API')
+    parser.add_argument('--concurrency', type=int, default=16, help='virtual users')
+    parser.add_argument('--duration', type=float, default=60, help='seconds to run')
+    parser.add_argument('--ramp-up', type=float, default=5, help='seconds over which virtual users start')
+    parser.add_argument('--think-time', type=float, default=0.0, help='mean pause between steps, in seconds')
+    parser.add_argument('--polls', type=int, default=3, help='notification polls per session')
+    parser.add_argument('--output', default='load_test_results.json')
+    parser.add_argument('--compare', help='earlier result to check this run against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative regression')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='devsync-load-')
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'load.db')}"
+    github = server = None
+    if args.base_url:
+        base_url = args.base_url.rstrip('/')
+    else:
+        if not args.skip_seed:
+            seed_database(args, database_url)
+        github = fake_github.start(latency_ms=args.github_latency_ms)
+        server = Server(args, database_url, github.url, os.path.join(workdir, 'gunicorn.log'))
+        server.wait_until_ready()
+        base_url = server.url
+        print(f"gunicorn ({args.workers} workers x {args.threads} threads) on {base_url}, "
+              f"fake GitHub on {github.url}, logs in {workdir}")
+
+    print(f"Running {args.concurrency} virtual users for {args.duration:.0f}s...")
+    try:
+        recorder, elapsed = run_load(args, base_url)
+    finally:
+        if server:
+            server.stop()
+        if github:
+            github.shutdown()
+
+    endpoints, total = recorder.summary(elapsed)
+    if not endpoints:
+        sys.exit("No requests completed")
+    result = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'database': database_url.split(':', 1)[0] if not args.base_url else None,
+            'base_url': args.base_url,
+            'users': args.users, 'projects': args.projects, 'tasks': args.tasks, 'seed': args.seed,
+            'bcrypt_rounds': args.bcrypt_rounds, 'workers': args.workers, 'threads': args.threads,
+            'concurrency': args.concurrency, 'duration_seconds': round(elapsed, 2),
+            'think_time': args.think_time, 'github_latency_ms': args.github_latency_ms,
+            'github_requests': github.requests_served if github else None
+        },
+        'total': total,
+        'endpoints': endpoints
+    }
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    print(f"\nWrote {args.output}")
+
+    if baseline:
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+if __name__ == '__main__':
+    main()
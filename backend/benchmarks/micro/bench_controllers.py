@@ -0,0 +1,9 @@
+"""get_all_tasks querying and serializing 1,000 tasks"""
+from flask_jwt_extended import verify_jwt_in_request
+
+from src.api.controllers.tasks_controller import get_all_tasks
+
+def bench_get_all_tasks_1k(benchmark, seeded_tasks, admin_request):
+    verify_jwt_in_request()
+    response = benchmark(get_all_tasks)
+    assert len(response.get_json()['tasks']) == seeded_tasks
@@ -0,0 +1,18 @@
+"""Encoding a 1,000 task list response with each JSON provider"""
+import pytest
+
+from src.api.middlewares.json_provider import OrjsonProvider, StdlibJSONProvider
+from src.api.serializers import task_serializer
+from src.db.models import Task, db
+
+@pytest.fixture(scope='module')
+def task_rows(app, seeded_tasks):
+    with app.app_context():
+        return task_serializer.select(db.session.query(Task)).all()
+
+@pytest.mark.parametrize('provider_class', [StdlibJSONProvider, OrjsonProvider], ids=['stdlib', 'orjson'])
+def bench_encode_task_list_1k(benchmark, app, task_rows, provider_class):
+    provider = provider_class(app)
+    with app.app_context():
+        response = benchmark(provider.response, {'tasks': task_rows})
+    assert len(provider.loads(response.get_data())['tasks']) == len(task_rows)
@@ -0,0 +1,35 @@
+"""RBAC decorators, rate_limit and get_client_identifier on an authenticated request"""
+from flask_jwt_extended import verify_jwt_in_request
+
+from src.api.middlewares import role_required
+from src.api.middlewares.rate_limiter import get_client_identifier, limiter, rate_limit
+from src.auth.rbac import Role, require_permission
+
+def view():
+    return 'ok'
+
+def bench_require_permission(benchmark, admin_request):
+    verify_jwt_in_request()
+    guarded = require_permission('can_manage_users')(view)
+    assert benchmark(guarded) == 'ok'
+
+def bench_role_required(benchmark, admin_request):
+    # Decodes and verifies the bearer token on every call, as the route does
+    guarded = role_required([Role.ADMIN])(view)
+    assert benchmark(guarded) == 'ok'
+
+def bench_rate_limit(benchmark, admin_request):
+    verify_jwt_in_request()
+    limited = rate_limit(requests_per_window=10 ** 9, window_seconds=60)(view)
+    try:
+        assert benchmark(limited) == 'ok'
+    finally:
+        limiter.reset()
+
+def bench_get_client_identifier_authenticated(benchmark, admin_request):
+    verify_jwt_in_request()
+    assert benchmark(get_client_identifier) == 1
+
+def bench_get_client_identifier_anonymous(benchmark, app):
+    with app.test_request_context('/api/v1/auth/login', environ_base={'REMOTE_ADDR': '203.0.113.9'}):
+        assert benchmark(get_client_identifier) == 'ip:203.0.113.9'
@@ -0,0 +1,12 @@
+"""Model serialization"""
+from datetime import datetime
+
+from src.db.models import Notification
+
+def bench_notification_to_dict(benchmark):
+    notification = Notification(
+        id=1, user_id=2, notification_type='task_assigned', title='Task assigned',
+        message='You have been assigned "Implement the notification feed"', reference_id='42',
+        is_read=True, created_at=datetime(2025, 1, 15, 12, 0), read_at=datetime(2025, 1, 15, 12, 5), task_id=42
+    )
+    assert benchmark(notification.to_dict)['read'] is True
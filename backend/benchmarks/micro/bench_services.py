@@ -0,0 +1,30 @@
+"""GitHubClient response cache lookups and invalidation"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.services.github_client import GitHubClient
+
+@pytest.fixture
+def warm_cache():
+    """10,000 cached GitHub responses, as a busy worker accumulates"""
+    expires = datetime.now() + timedelta(hours=1)
+    for i in range(10000):
+        key = f"GET:{GitHubClient.BASE_API_URL}/repos/octo/repo-{i}:{{}}"
+        GitHubClient._cache[key] = {'id': i, 'name': f'repo-{i}'}
+        GitHubClient._cache_expiry[key] = expires
+    yield
+    GitHubClient._cache.clear()
+    GitHubClient._cache_expiry.clear()
+
+def bench_cache_hit(benchmark, warm_cache):
+    client = GitHubClient(access_token='token')
+    with patch('src.services.github_client.requests.request') as request:
+        result = benchmark(client.get_repository, 'octo', 'repo-5000')
+    assert result['id'] == 5000
+    request.assert_not_called()
+
+def bench_invalidate_cache(benchmark, warm_cache):
+    # Nothing matches, so every round scans the full cache
+    assert benchmark(GitHubClient.invalidate_cache, '/repos/octo/missing') == 0
@@ -0,0 +1,20 @@
+"""validate_task_data on accepted and rejected payloads"""
+from src.api.validators.task_validator import validate_task_data
+
+VALID_TASK = {
+    'title': 'Implement the notification feed',
+    'description': 'Poll for unread notifications and show a badge',
+    'status': 'in_progress',
+    'progress': 40,
+    'priority': 'high',
+    'assignee_id': 7
+}
+
+def bench_validate_task_data_valid(benchmark):
+    assert benchmark(validate_task_data, VALID_TASK) is None
+
+def bench_validate_task_data_invalid(benchmark, app):
+    # Rejections build a JSON response, so they need an application context
+    with app.app_context():
+        _, status = benchmark(validate_task_data, dict(VALID_TASK, status='blocked'))
+    assert status == 400
@@ -0,0 +1,76 @@
+"""
+Per-call cost of the hot pure-Python paths, measured with pytest-benchmark.
+
+Every run is saved under .benchmarks/ with the commit it measured, so a
+change can be compared against earlier commits:
+
+    cd backend
+    python -m pytest benchmarks/micro
+    python -m pytest benchmarks/micro --benchmark-compare --benchmark-compare-fail=mean:15%
+    python -m pytest_benchmark compare --group-by=name --columns=mean,ops
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.db.models import db
+
+@pytest.fixture(scope='session')
+def app():
+    from src.api.middlewares.json_provider import apply_json_provider
+
+    app = Flask(__name__)
+    app.config.update({
+        'TESTING': True,
+        'JWT_SECRET_KEY': 'micro-benchmark-jwt-secret-key-0123456789',
+        'JWT_TOKEN_LOCATION': ['headers'],
+        # Identities are dicts, which newer PyJWT releases refuse in the 'sub' claim
+        'JWT_IDENTITY_CLAIM': 'identity',
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+    })
+    JWTManager(app)
+    apply_json_provider(app)
+    db.init_app(app)
+    return app
+
+@pytest.fixture(scope='session')
+def tokens(app):
+    with app.app_context():
+        return {
+            role: create_access_token(identity={'user_id': user_id}, additional_claims={'role': role})
+            for user_id, role in ((1, 'admin'), (2, 'client'))
+        }
+
+@pytest.fixture
+def admin_request(app, tokens):
+    """A request context carrying an admin's bearer token"""
+    with app.test_request_context('/api/v1/tasks', headers={'Authorization': f"Bearer {tokens['admin']}"}):
+        yield
+
+@pytest.fixture(scope='session')
+def seeded_tasks(app):
+    """One admin owning 1,000 tasks in the in-memory database"""
+    from src.db.models import User, Task
+
+    now = datetime(2025, 1, 15, 12, 0, 0)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, name='Admin', email='admin@example.com', password='x', role='admin'))
+        db.session.add_all([
+            Task(title=f'Task {i}', description=f'Description of task {i}', status=('todo', 'in_progress', 'done')[i % 3],
+                 progress=i % 101, assigned_to=1, created_by=1, deadline=now + timedelta(days=i % 30),
+                 created_at=now - timedelta(days=i % 60), updated_at=now)
+            for i in range(1000)
+        ])
+        db.session.commit()
+    yield 1000
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
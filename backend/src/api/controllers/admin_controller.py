@@ -4,6 +4,7 @@ from flask import jsonify, request
 from ...db.models import db, User, Project, Task
 from ..validators.admin_validator import validate_system_settings, validate_user_role_update
 from ...auth.rbac import Role
+from ...services.slow_query_log import slow_query_log
 
 def get_system_stats():
     """Controller function to get system statistics for admin dashboard"""
@@ -40,6 +41,17 @@ def get_system_stats():
         'tasks': task_stats
     })
 
+def get_slow_queries():
+    """Controller function to list recently captured slow SQL statements"""
+    limit = request.args.get('limit', type=int)
+    
+    return jsonify({
+        'threshold_ms': slow_query_log.threshold_ms,
+        'explain_sample_rate': slow_query_log.explain_sample_rate,
+        'index_usage': slow_query_log.index_usage(),
+        'queries': slow_query_log.entries(limit)
+    })
+
 def get_system_settings():
     """Controller function to get system settings"""
     # This would typically retrieve settings from a database
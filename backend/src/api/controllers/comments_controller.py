@@ -24,7 +24,6 @@ def get_task_comments(task_id):
             'content': comment.content,
             'user_id': comment.user_id,
             'user_name': user.name if user else 'Unknown',
-            'user_avatar': user.avatar if user else None,
             'created_at': comment.created_at.isoformat() if comment.created_at else None,
             'updated_at': comment.updated_at.isoformat() if comment.updated_at else None
         }
@@ -66,7 +65,6 @@ def add_comment(task_id):
             'content': new_comment.content,
             'user_id': user_id,
             'user_name': user.name if user else 'Unknown',
-            'user_avatar': user.avatar if user else None,
             'created_at': new_comment.created_at.isoformat() if new_comment.created_at else None
         }
     }), 201
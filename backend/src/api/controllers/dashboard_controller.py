@@ -2,7 +2,13 @@
 from flask import jsonify
 from flask_jwt_extended import get_jwt_identity, get_jwt
 from ...db.models import db, User, Task, Project  # Changed to relative import
+from ...db.models.models import project_members
 from ...auth.rbac import Role  # Changed to relative import
+from ...auth.identity_cache import identity_cache
+from ..serializers import (
+    task_due_soon_serializer, task_completed_serializer,
+    project_task_due_soon_serializer, project_task_updated_serializer, team_member_serializer
+)
 from datetime import datetime, timedelta
 import traceback
 import logging
@@ -19,6 +25,15 @@ def get_user_tasks(user_id):
         logger.error(f"Error fetching user tasks: {str(e)}")
         return []
 
+def get_user_projects(user_id):
+    """Helper function to get the projects a user is a member of"""
+    try:
+        return Project.query.join(project_members, project_members.c.project_id == Project.id)\
+            .filter(project_members.c.user_id == user_id).all()
+    except Exception as e:
+        logger.error(f"Error fetching user projects: {str(e)}")
+        return []
+
 def get_tasks_due_soon(user_id):
     """Helper function to get tasks due soon for a user"""
     try:
@@ -82,7 +97,7 @@ def get_user_dashboard():
         logger.info(f"Getting dashboard for user ID: {user_id}, role: {user_role}")
         
         # Get basic user info
-        user = User.query.get(user_id)
+        user = identity_cache.get(user_id)
         if not user:
             logger.error(f"User not found: {user_id}")
             return jsonify({'message': 'User not found'}), 404
@@ -97,32 +112,21 @@ def get_user_dashboard():
         completed_tasks = get_recent_completed_tasks(user_id)
         
         # Get projects user is part of
-        user_projects = user.projects.all()  # Assuming a many-to-many relationship exists
+        user_projects = get_user_projects(user_id)
         
         # Format response data
         dashboard_data = {
             'user': {
-                'id': user.id,
-                'name': user.name,
-                'role': user.role
+                'id': user['id'],
+                'name': user['name'],
+                'role': user['role']
             },
             'tasks': {
                 'assigned_count': len(assigned_tasks),
                 'pending_count': len([t for t in assigned_tasks if t.status != 'done']),
                 'completed_count': len([t for t in assigned_tasks if t.status == 'done']),
-                'due_soon': [{
-                    'id': task.id,
-                    'title': task.title,
-                    'deadline': task.deadline.isoformat() if task.deadline else None,
-                    'status': task.status,
-                    'project_id': task.project_id
-                } for task in tasks_due_soon],
-                'recently_completed': [{
-                    'id': task.id,
-                    'title': task.title,
-                    'completed_date': task.updated_at.isoformat() if task.updated_at else None,
-                    'project_id': task.project_id
-                } for task in completed_tasks[:5]]  # Limit to 5 most recent
+                'due_soon': task_due_soon_serializer.dump_many(tasks_due_soon),
+                'recently_completed': task_completed_serializer.dump_many(completed_tasks[:5])  # Limit to 5 most recent
             },
             'projects': [{
                 'id': project.id,
@@ -162,7 +166,7 @@ def get_client_dashboard():
         logger.info(f"Getting client dashboard for user ID: {user_id}, role: {user_role}")
         
         # Get basic user info
-        user = User.query.get(user_id)
+        user = identity_cache.get(user_id)
         if not user:
             logger.error(f"User not found: {user_id}")
             return jsonify({'message': 'User not found'}), 404
@@ -183,18 +187,12 @@ def get_client_dashboard():
         tasks_due_soon = get_tasks_due_soon(user_id)
         
         # Get projects user is part of
-        user_projects = user.projects.all()
+        user_projects = get_user_projects(user_id)
         
         # Format response data
         dashboard_data = {
             'tasks': task_stats,
-            'tasks_due_soon': [{
-                'id': task.id,
-                'title': task.title,
-                'deadline': task.deadline.isoformat() if task.deadline and hasattr(task.deadline, 'isoformat') else None,
-                'status': task.status,
-                'project_id': task.project_id
-            } for task in tasks_due_soon],
+            'tasks_due_soon': task_due_soon_serializer.dump_many(tasks_due_soon),
             'projects': [{
                 'id': project.id,
                 'name': project.name,
@@ -225,7 +223,7 @@ def get_admin_dashboard():
         logger.info(f"Getting admin dashboard for user ID: {user_id}")
         
         # Get basic user info
-        user = User.query.get(user_id)
+        user = identity_cache.get(user_id)
         if not user:
             logger.error(f"User not found: {user_id}")
             return jsonify({'message': 'User not found'}), 404
@@ -309,24 +307,9 @@ def get_project_dashboard(project_id):
                 'completion_percentage': completion_percentage
             },
             'task_stats': task_stats,
-            'tasks_due_soon': [{
-                'id': task.id,
-                'title': task.title,
-                'deadline': task.deadline.isoformat() if task.deadline and hasattr(task.deadline, 'isoformat') else None,
-                'status': task.status,
-                'assigned_to': task.assigned_to
-            } for task in tasks_due_soon],
-            'recently_updated_tasks': [{
-                'id': task.id,
-                'title': task.title,
-                'status': task.status,
-                'updated_at': task.updated_at.isoformat() if task.updated_at else None
-            } for task in recently_updated],
-            'team_members': [{
-                'id': member.id,
-                'name': member.name,
-                'role': member.role
-            } for member in team_members]
+            'tasks_due_soon': project_task_due_soon_serializer.dump_many(tasks_due_soon),
+            'recently_updated_tasks': project_task_updated_serializer.dump_many(recently_updated),
+            'team_members': team_member_serializer.dump_many(team_members)
         }
         
         return jsonify(dashboard_data)
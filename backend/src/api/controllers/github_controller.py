@@ -1,21 +1,29 @@
 """Controller for GitHub integration with DevSync."""
 
 import os
+import json
 import uuid
 import logging
 from datetime import datetime
-from flask import jsonify, request, url_for, current_app, redirect, session
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask import jsonify, request, url_for, current_app, redirect, session, Response, stream_with_context
+from flask_jwt_extended import get_jwt_identity, get_jwt, jwt_required
 
-from ...db.models import db, User, GitHubToken, GitHubRepository, TaskGitHubLink, Task, Notification
-from ...services.github_client import GitHubClient  # Make sure this points to the correct location
-from ..validators.github_validator import validate_github_auth, validate_github_repo_data, validate_task_github_link
+from ...db.models import db, User, GitHubToken, GitHubRepository, TaskGitHubLink, GitHubJob, Task, Notification, Project
+from ...auth.rbac import Role
+from ...services.github_client import GitHubClient, PageFetchError, TruncatedListing  # Make sure this points to the correct location
+from ...services.circuit_breaker import DependencyUnavailableError
+from ...services.github_webhooks import SUPPORTED_EVENTS, event_queue, verify_signature
+from ...services.github_jobs import enqueue_issue_comment
+from ...services.oauth_state_store import oauth_states
+from ..validators.github_validator import (
+    validate_github_auth,
+    validate_github_repo_data,
+    validate_github_webhook_payload,
+    validate_task_github_link
+)
 
 logger = logging.getLogger(__name__)
 
-# In-memory store for OAuth state parameters (in a production app, use Redis or similar)
-oauth_states = {}
-
 def check_github_config():
     """Check GitHub OAuth configuration"""
     config_status = {
@@ -31,17 +39,23 @@ def check_github_config():
         'frontend_url': current_app.config.get('FRONTEND_URL', 'http://localhost:3000')
     })
 
+def get_github_health():
+    """Report the GitHub circuit breaker and bulkhead state"""
+    health = GitHubClient.health()
+    status = 'degraded' if health['circuit']['state'] != 'closed' else 'ok'
+    return jsonify({'status': status, **health})
+
 def initiate_github_auth():
     """Initiate GitHub OAuth flow"""
     # Generate a random state parameter to prevent CSRF
     state = str(uuid.uuid4())
     user_id = get_jwt_identity()['user_id']
     
-    # Store state with user_id (with 10 minute expiry in a real app)
-    oauth_states[state] = {
+    # Store state with user_id until the callback consumes it or it expires
+    oauth_states.put(state, {
         'user_id': user_id,
-        'created_at': datetime.now()
-    }
+        'created_at': datetime.now().isoformat()
+    })
     
     # Check if GitHub OAuth credentials are configured
     if not current_app.config.get('GITHUB_CLIENT_ID') or not current_app.config.get('GITHUB_CLIENT_SECRET'):
@@ -68,12 +82,11 @@ def github_callback():
         return jsonify({'message': 'Missing code or state parameter'}), 400
     
     try:
-        # First try to find the state in our oauth_states dictionary
-        if state in oauth_states:
+        # First try to consume the state from our state store
+        state_data = oauth_states.pop(state)
+        if state_data:
             # This is our internally generated state
-            user_id = oauth_states[state]['user_id']
-            # Clean up used state
-            del oauth_states[state]
+            user_id = state_data['user_id']
         else:
             # This might be a URL-safe base64-encoded state from frontend
             import base64
@@ -156,6 +169,98 @@ def github_callback():
     logger.info(f"Redirecting to: {redirect_url}")
     return redirect(redirect_url)
 
+def _format_repository(repo):
+    """Shape a GitHub repository payload for the API response"""
+    return {
+        'id': repo['id'],
+        'name': repo['name'],
+        'full_name': repo['full_name'],
+        'owner': repo['owner']['login'],
+        'html_url': repo['html_url'],
+        'description': repo['description'],
+        'private': repo['private'],
+        'fork': repo['fork'],
+        'created_at': repo['created_at'],
+        'updated_at': repo['updated_at'],
+        'pushed_at': repo['pushed_at'],
+        'language': repo['language'],
+        'default_branch': repo['default_branch'],
+        'open_issues_count': repo['open_issues_count']
+    }
+
+def _format_issue(issue):
+    """Shape a GitHub issue payload for the API response"""
+    return {
+        'id': issue['id'],
+        'number': issue['number'],
+        'title': issue['title'],
+        'state': issue['state'],
+        'created_at': issue['created_at'],
+        'updated_at': issue['updated_at'],
+        'html_url': issue['html_url'],
+        'body': issue['body'],
+        'user': {
+            'login': issue['user']['login'],
+            'avatar_url': issue['user']['avatar_url'],
+        },
+        'labels': [{'name': label['name'], 'color': label['color']} for label in issue['labels']]
+    }
+
+def _format_pull(pr):
+    """Shape a GitHub pull request payload for the API response"""
+    return {
+        'id': pr['id'],
+        'number': pr['number'],
+        'title': pr['title'],
+        'state': pr['state'],
+        'created_at': pr['created_at'],
+        'updated_at': pr['updated_at'],
+        'html_url': pr['html_url'],
+        'body': pr['body'],
+        'user': {
+            'login': pr['user']['login'],
+            'avatar_url': pr['user']['avatar_url'],
+        },
+        'labels': [{'name': label['name'], 'color': label['color']} for label in pr.get('labels', [])],
+        'merged': pr.get('merged', False),
+        'mergeable': pr.get('mergeable'),
+        'draft': pr.get('draft', False)
+    }
+
+def _wants_all_pages():
+    """Whether the caller asked for every page streamed back as NDJSON"""
+    return str(request.args.get('all_pages', 'false')).lower() in ('1', 'true', 'yes')
+
+def _stream_all_pages(pages, formatter):
+    """
+    Stream formatted items from an iterator of pages as newline-delimited JSON.
+    
+    The 200 status is sent before GitHub has returned every page, so an
+    incomplete listing ends with a final status line instead: {"error": ...}
+    when a page failed, or {"truncated": true, "pages": n, "last_page": m}
+    when the page cap stopped it early.
+    """
+    def generate():
+        try:
+            for page in pages:
+                if isinstance(page, TruncatedListing):
+                    yield json.dumps({'truncated': True, 'pages': page.pages, 'last_page': page.last_page}) + '\n'
+                    continue
+                for item in page:
+                    yield json.dumps(formatter(item)) + '\n'
+        except (PageFetchError, DependencyUnavailableError) as e:
+            logger.warning(f"GitHub listing stopped early: {e}")
+            yield json.dumps({'error': str(e)}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def _page_fetch_options():
+    """Concurrency limits for all-pages listings"""
+    return {
+        'max_in_flight': current_app.config.get('GITHUB_MAX_PAGES_IN_FLIGHT', 4),
+        'max_pages': current_app.config.get('GITHUB_MAX_PAGES', 50)
+    }
+
 def get_github_repositories():
     """Get repositories for the authenticated user"""
     user_id = get_jwt_identity()['user_id']
@@ -168,6 +273,14 @@ def get_github_repositories():
     # Create GitHub client
     github_client = GitHubClient(token.access_token)
     
+    # Stream every page concurrently when requested
+    if _wants_all_pages():
+        pages = github_client.iter_user_repositories(
+            per_page=request.args.get('per_page', 100, type=int),
+            **_page_fetch_options()
+        )
+        return _stream_all_pages(pages, _format_repository)
+    
     # Fetch repositories (with pagination support)
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 30, type=int)
@@ -175,24 +288,7 @@ def get_github_repositories():
     repositories = github_client.get_user_repositories(page=page, per_page=per_page)
     
     # Format repository data
-    formatted_repos = []
-    for repo in repositories:
-        formatted_repos.append({
-            'id': repo['id'],
-            'name': repo['name'],
-            'full_name': repo['full_name'],
-            'owner': repo['owner']['login'],
-            'html_url': repo['html_url'],
-            'description': repo['description'],
-            'private': repo['private'],
-            'fork': repo['fork'],
-            'created_at': repo['created_at'],
-            'updated_at': repo['updated_at'],
-            'pushed_at': repo['pushed_at'],
-            'language': repo['language'],
-            'default_branch': repo['default_branch'],
-            'open_issues_count': repo['open_issues_count']
-        })
+    formatted_repos = [_format_repository(repo) for repo in repositories]
     
     return jsonify({
         'repositories': formatted_repos
@@ -283,6 +379,17 @@ def get_repository_issues(repo_id):
     
     # Fetch issues with query parameters
     state = request.args.get('state', 'open')
+    
+    if _wants_all_pages():
+        pages = github_client.iter_repository_issues(
+            owner=owner,
+            repo=repo_name,
+            state=state,
+            per_page=request.args.get('per_page', 100, type=int),
+            **_page_fetch_options()
+        )
+        return _stream_all_pages(pages, _format_issue)
+    
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 30, type=int)
     
@@ -295,23 +402,7 @@ def get_repository_issues(repo_id):
     )
     
     # Format issue data
-    formatted_issues = []
-    for issue in issues:
-        formatted_issues.append({
-            'id': issue['id'],
-            'number': issue['number'],
-            'title': issue['title'],
-            'state': issue['state'],
-            'created_at': issue['created_at'],
-            'updated_at': issue['updated_at'],
-            'html_url': issue['html_url'],
-            'body': issue['body'],
-            'user': {
-                'login': issue['user']['login'],
-                'avatar_url': issue['user']['avatar_url'],
-            },
-            'labels': [{'name': label['name'], 'color': label['color']} for label in issue['labels']]
-        })
+    formatted_issues = [_format_issue(issue) for issue in issues]
     
     return jsonify({'issues': formatted_issues})
 
@@ -339,6 +430,17 @@ def get_repository_pulls(repo_id):
     
     # Fetch PRs with query parameters
     state = request.args.get('state', 'open')
+    
+    if _wants_all_pages():
+        pages = github_client.iter_repository_pulls(
+            owner=owner,
+            repo=repo_name,
+            state=state,
+            per_page=request.args.get('per_page', 100, type=int),
+            **_page_fetch_options()
+        )
+        return _stream_all_pages(pages, _format_pull)
+    
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 30, type=int)
     
@@ -351,26 +453,7 @@ def get_repository_pulls(repo_id):
     )
     
     # Format PR data
-    formatted_pulls = []
-    for pr in pulls:
-        formatted_pulls.append({
-            'id': pr['id'],
-            'number': pr['number'],
-            'title': pr['title'],
-            'state': pr['state'],
-            'created_at': pr['created_at'],
-            'updated_at': pr['updated_at'],
-            'html_url': pr['html_url'],
-            'body': pr['body'],
-            'user': {
-                'login': pr['user']['login'],
-                'avatar_url': pr['user']['avatar_url'],
-            },
-            'labels': [{'name': label['name'], 'color': label['color']} for label in pr.get('labels', [])],
-            'merged': pr.get('merged', False),
-            'mergeable': pr.get('mergeable'),
-            'draft': pr.get('draft', False)
-        })
+    formatted_pulls = [_format_pull(pr) for pr in pulls]
     
     return jsonify({'pull_requests': formatted_pulls})
 
@@ -398,42 +481,47 @@ def link_task_with_github(task_id):
     
     if existing_link:
         # Update existing link
+        link = existing_link
         if 'issue_number' in data:
-            existing_link.issue_number = data['issue_number']
+            link.issue_number = data['issue_number']
         if 'pull_request_number' in data:
-            existing_link.pull_request_number = data['pull_request_number']
+            link.pull_request_number = data['pull_request_number']
     else:
         # Create new link
-        new_link = TaskGitHubLink(
+        link = TaskGitHubLink(
             task_id=task_id,
             repo_id=data['repo_id'],
             issue_number=data.get('issue_number'),
             pull_request_number=data.get('pull_request_number')
         )
-        db.session.add(new_link)
-    
-    db.session.commit()
+        db.session.add(link)
     
-    # If we have a GitHub token, add a comment to the issue/PR referencing this task
+    # If we have a GitHub token, queue a comment on the issue/PR referencing this task.
+    # The comment is posted in the background so linking does not wait on GitHub.
     token = GitHubToken.query.filter_by(user_id=user_id).first()
-    if token and (data.get('issue_number') or data.get('pull_request_number')):
-        github_client = GitHubClient(token.access_token)
+    comment_number = data.get('issue_number') or data.get('pull_request_number')
+    repo_parts = repo.repo_name.split('/')
+    queued = bool(token and comment_number and len(repo_parts) == 2)
+    if queued:
+        db.session.flush()
+        owner, repo_name = repo_parts
         
-        # Parse repository name
-        repo_parts = repo.repo_name.split('/')
-        if len(repo_parts) == 2:
-            owner, repo_name = repo_parts
-            
-            # Construct comment with link to DevSync task
-            frontend_url = current_app.config.get('FRONTEND_URL', 'http://localhost:3000')
-            comment = f"This issue is linked to DevSync task #{task.id}: {task.title}\n\n"
-            comment += f"[View in DevSync]({frontend_url}/tasks/{task.id})"
-            
-            # Add comment to issue or PR
-            if data.get('issue_number'):
-                github_client.create_issue_comment(owner, repo_name, data['issue_number'], comment)
-            elif data.get('pull_request_number'):
-                github_client.create_issue_comment(owner, repo_name, data['pull_request_number'], comment)
+        # Construct comment with link to DevSync task
+        frontend_url = current_app.config.get('FRONTEND_URL', 'http://localhost:3000')
+        comment = f"This issue is linked to DevSync task #{task.id}: {task.title}\n\n"
+        comment += f"[View in DevSync]({frontend_url}/tasks/{task.id})"
+        
+        enqueue_issue_comment(
+            user_id, link, owner, repo_name, comment_number, comment,
+            max_attempts=current_app.config.get('GITHUB_JOB_MAX_ATTEMPTS', 5)
+        )
+    
+    db.session.commit()
+    
+    # Let the worker post the comment now rather than at its next poll
+    job_worker = current_app.extensions.get('github_jobs') if queued else None
+    if job_worker:
+        job_worker.wake()
     
     return jsonify({
         'message': 'Task linked with GitHub successfully',
@@ -442,7 +530,8 @@ def link_task_with_github(task_id):
             'repo_id': data['repo_id'],
             'repo_name': repo.repo_name,
             'issue_number': data.get('issue_number'),
-            'pull_request_number': data.get('pull_request_number')
+            'pull_request_number': data.get('pull_request_number'),
+            'comment_status': link.comment_status
         }
     })
 
@@ -466,6 +555,7 @@ def get_task_github_links(task_id):
             'repo_url': repo.repo_url if repo else None,
             'issue_number': link.issue_number,
             'pull_request_number': link.pull_request_number,
+            'comment_status': link.comment_status,
             'created_at': link.created_at.isoformat() if link.created_at else None
         })
     
@@ -483,8 +573,98 @@ def delete_task_github_link(task_id, link_id):
     if link.task_id != task_id:
         return jsonify({'message': 'Link does not belong to this task'}), 400
         
+    # Cancel comments still waiting to be posted and detach the job history
+    GitHubJob.query.filter(GitHubJob.link_id == link.id, GitHubJob.status.in_(['pending', 'failed'])).delete(synchronize_session=False)
+    GitHubJob.query.filter_by(link_id=link.id).update({GitHubJob.link_id: None}, synchronize_session=False)
+    
     # Delete the link
     db.session.delete(link)
     db.session.commit()
     
-    return jsonify({'message': 'GitHub link removed from task'})
\ No newline at end of file
+    return jsonify({'message': 'GitHub link removed from task'})
+
+def get_project_github_status(project_id):
+    """Get the current GitHub state of every issue/PR linked to a project's tasks"""
+    user_id = get_jwt_identity()['user_id']
+    user_role = get_jwt().get('role')
+    
+    # Check if project exists
+    project = Project.query.get_or_404(project_id)
+    
+    # Non-admins only see projects they are a member of
+    if user_role != Role.ADMIN.value:
+        user = User.query.get(user_id)
+        if not user or project not in user.projects:
+            return jsonify({'message': 'You do not have access to this project'}), 403
+    
+    # Check if user has a GitHub token
+    token = GitHubToken.query.filter_by(user_id=user_id).first()
+    if not token:
+        return jsonify({'message': 'GitHub account not connected'}), 401
+    
+    links = db.session.query(TaskGitHubLink, GitHubRepository.repo_name)\
+        .join(Task, Task.id == TaskGitHubLink.task_id)\
+        .join(GitHubRepository, GitHubRepository.id == TaskGitHubLink.repo_id)\
+        .filter(Task.project_id == project_id).all()
+    
+    # Collect every linked issue/PR so they resolve in as few queries as possible
+    refs = []
+    for link, repo_full_name in links:
+        repo_parts = repo_full_name.split('/')
+        if len(repo_parts) != 2:
+            continue
+        for number in (link.issue_number, link.pull_request_number):
+            if number:
+                refs.append((repo_parts[0], repo_parts[1], number))
+    
+    github_client = GitHubClient(token.access_token)
+    statuses = github_client.get_issue_statuses(refs) if refs else {}
+    
+    formatted_links = []
+    for link, repo_full_name in links:
+        owner, _, repo_name = repo_full_name.partition('/')
+        formatted_links.append({
+            'id': link.id,
+            'task_id': link.task_id,
+            'repo_id': link.repo_id,
+            'repo_name': repo_full_name,
+            'issue': statuses.get((owner, repo_name, link.issue_number)) if link.issue_number else None,
+            'pull_request': statuses.get((owner, repo_name, link.pull_request_number)) if link.pull_request_number else None
+        })
+    
+    return jsonify({'project_id': project_id, 'links': formatted_links})
+
+def receive_github_webhook():
+    """Verify a GitHub webhook delivery and queue it for batched processing"""
+    secret = current_app.config.get('GITHUB_WEBHOOK_SECRET')
+    if not secret:
+        return jsonify({'message': 'GitHub webhooks are not configured'}), 503
+    
+    # The signature covers the raw body, so verify before parsing JSON
+    if not verify_signature(request.get_data(), request.headers.get('X-Hub-Signature-256'), secret):
+        return jsonify({'message': 'Invalid webhook signature'}), 401
+    
+    event_type = request.headers.get('X-GitHub-Event')
+    if event_type == 'ping':
+        return jsonify({'message': 'pong'})
+    if event_type not in SUPPORTED_EVENTS:
+        return jsonify({'message': f'Event {event_type} ignored'}), 202
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Invalid webhook payload format'}), 400
+    
+    # Push events carry no action, so only the repository can be checked
+    if event_type == 'push':
+        if not isinstance(data.get('repository'), dict) or 'id' not in data['repository']:
+            return jsonify({'message': 'Invalid repository data in webhook payload'}), 400
+    else:
+        validation_result = validate_github_webhook_payload(data)
+        if validation_result:
+            return validation_result
+    
+    if not event_queue.put(event_type, request.headers.get('X-GitHub-Delivery'), data):
+        logger.warning(f"Webhook queue full, rejecting {event_type} delivery")
+        return jsonify({'message': 'Webhook queue is full'}), 503
+    
+    return jsonify({'message': 'Webhook accepted'}), 202
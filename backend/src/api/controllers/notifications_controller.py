@@ -4,26 +4,21 @@ from flask import jsonify, request
 from flask_jwt_extended import get_jwt_identity
 from ...db.models import db, Notification, User  # Changed to relative import
 from ..validators.notification_validator import validate_notification_data  # Changed to relative import
+from ..serializers import notification_serializer
 
 def get_user_notifications():
     """Controller function to get all notifications for the current user"""
     user_id = get_jwt_identity()['user_id']
     
     # Get notifications for this user, order by created_at desc (newest first)
-    notifications = Notification.query.filter_by(user_id=user_id)\
-        .order_by(Notification.created_at.desc()).all()
-    
-    notifications_data = [{
-        'id': notification.id,
-        'content': notification.content,
-        'is_read': notification.is_read,
-        'task_id': notification.task_id,
-        'created_at': notification.created_at.isoformat() if notification.created_at else None
-    } for notification in notifications]
+    notifications = notification_serializer.select(
+        Notification.query.filter_by(user_id=user_id).order_by(Notification.created_at.desc())
+    ).all()
     
+    # Rows go to the JSON provider as they are, in the shape of Notification.to_dict()
     return jsonify({
-        'notifications': notifications_data,
-        'unread_count': len([n for n in notifications if not n.is_read])
+        'notifications': notifications,
+        'unread_count': sum(1 for notification in notifications if not notification.read)
     })
 
 def create_notification():
@@ -5,6 +5,7 @@ from flask_jwt_extended import get_jwt_identity, get_jwt
 from ...db.models import db, Project, Task, User  # Changed to relative import
 from ...auth.rbac import Role  # Changed to relative import
 from ..validators.project_validator import validate_project_data  # Changed to relative import
+from ..serializers import task_serializer
 
 def get_all_projects():
     """Controller function to get all projects visible to the user"""
@@ -184,19 +185,6 @@ def get_project_tasks(project_id):
             return jsonify({'message': 'You do not have access to this project'}), 403
     
     # Get tasks for this project
-    tasks = Task.query.filter_by(project_id=project_id).all()
-    
-    tasks_data = [{
-        'id': task.id,
-        'title': task.title,
-        'description': task.description,
-        'status': task.status,
-        'progress': task.progress,
-        'assigned_to': task.assigned_to,
-        'created_by': task.created_by,
-        'deadline': task.deadline.isoformat() if task.deadline else None,
-        'created_at': task.created_at.isoformat() if task.created_at else None,
-        'updated_at': task.updated_at.isoformat() if task.updated_at else None
-    } for task in tasks]
-    
-    return jsonify({'tasks': tasks_data})
+    tasks = task_serializer.select(Task.query.filter_by(project_id=project_id)).all()
+    
+    return jsonify({'tasks': tasks})
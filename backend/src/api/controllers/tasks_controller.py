@@ -5,6 +5,7 @@ from flask_jwt_extended import get_jwt_identity, get_jwt
 from ...db.models import db, Task, User  # Changed to relative import
 from ...auth.rbac import Role  # Changed to relative import
 from ..validators.task_validator import validate_task_data  # Changed to relative import
+from ..serializers import task_serializer
 
 def get_all_tasks():
     """Controller function to get all tasks based on user role and filters"""
@@ -31,28 +32,15 @@ def get_all_tasks():
     # Apply role-based filtering
     if user_role == Role.ADMIN.value:
         # Admins (Project Managers) can see all tasks
-        tasks = query.all()
+        tasks = task_serializer.select(query).all()
     else:
         # Clients (Team Members) can only see tasks assigned to them or created by them
-        tasks = query.filter(
+        tasks = task_serializer.select(query.filter(
             (Task.assigned_to == user_id) | (Task.created_by == user_id)
-        ).all()
-    
-    # Convert tasks to JSON response
-    tasks_data = [{
-        'id': task.id,
-        'title': task.title,
-        'description': task.description,
-        'status': task.status,
-        'progress': task.progress,
-        'assigned_to': task.assigned_to,
-        'created_by': task.created_by,
-        'deadline': task.deadline.isoformat() if task.deadline else None,
-        'created_at': task.created_at.isoformat() if task.created_at else None,
-        'updated_at': task.updated_at.isoformat() if task.updated_at else None
-    } for task in tasks]
-    
-    return jsonify({'tasks': tasks_data})
+        )).all()
+    
+    # Rows of the listed columns go to the JSON provider as they are, without loading Task objects
+    return jsonify({'tasks': tasks})
 
 def get_task_by_id(task_id):
     """Controller function to get a single task"""
@@ -68,18 +56,7 @@ def get_task_by_id(task_id):
         return jsonify({'message': 'You do not have permission to view this task'}), 403
     
     # Format task data
-    task_data = {
-        'id': task.id,
-        'title': task.title,
-        'description': task.description,
-        'status': task.status,
-        'progress': task.progress,
-        'assigned_to': task.assigned_to,
-        'created_by': task.created_by,
-        'deadline': task.deadline.isoformat() if task.deadline else None,
-        'created_at': task.created_at.isoformat() if task.created_at else None,
-        'updated_at': task.updated_at.isoformat() if task.updated_at else None
-    }
+    task_data = task_serializer.dump(task)
     
     # Get user details for assigned_to and created_by
     if task.assigned_to:
@@ -5,38 +5,19 @@ from flask_jwt_extended import get_jwt_identity
 from ...db.models import db, User  # Changed to relative import
 from ...auth.helpers import hash_password, verify_password  # Changed to relative import
 from ..validators.user_validator import validate_user_data, validate_profile_update  # Changed to relative import
+from ..serializers import user_serializer
 
 def get_all_users():
     """Controller function to get all users"""
-    users = User.query.all()
+    users = user_serializer.select(User.query).all()
     
-    users_data = [{
-        'id': user.id,
-        'name': user.name,
-        'email': user.email,
-        'role': user.role,
-        'github_username': user.github_username,
-        'avatar': user.avatar,
-        'created_at': user.created_at.isoformat() if user.created_at else None
-    } for user in users]
-    
-    return jsonify({'users': users_data})
+    return jsonify({'users': users})
 
 def get_user_by_id(user_id):
     """Controller function to get a specific user"""
     user = User.query.get_or_404(user_id)
     
-    user_data = {
-        'id': user.id,
-        'name': user.name,
-        'email': user.email,
-        'role': user.role,
-        'github_username': user.github_username,
-        'avatar': user.avatar,
-        'created_at': user.created_at.isoformat() if user.created_at else None
-    }
-    
-    return jsonify({'user': user_data})
+    return jsonify({'user': user_serializer.dump(user)})
 
 def update_user(user_id):
     """Controller function to update a user (admin only)"""
@@ -64,8 +45,6 @@ def update_user(user_id):
         user.password = hash_password(data['password'])
     if 'github_username' in data:
         user.github_username = data['github_username']
-    if 'avatar' in data:
-        user.avatar = data['avatar']
     
     db.session.commit()
     
@@ -93,17 +72,7 @@ def get_current_user_profile():
     user_id = get_jwt_identity()['user_id']
     user = User.query.get_or_404(user_id)
     
-    user_data = {
-        'id': user.id,
-        'name': user.name,
-        'email': user.email,
-        'role': user.role,
-        'github_username': user.github_username,
-        'avatar': user.avatar,
-        'created_at': user.created_at.isoformat() if user.created_at else None
-    }
-    
-    return jsonify({'user': user_data})
+    return jsonify({'user': user_serializer.dump(user)})
 
 def update_current_user_profile():
     """Controller function to update the current user's profile"""
@@ -128,8 +97,6 @@ def update_current_user_profile():
         user.email = data['email']
     if 'github_username' in data:
         user.github_username = data['github_username']
-    if 'avatar' in data:
-        user.avatar = data['avatar']
     if 'current_password' in data and 'new_password' in data:
         # Verify current password
         if not verify_password(data['current_password'], user.password):
@@ -9,7 +9,12 @@ from ...auth.rbac import Role  # Changed to relative import
 from .request_logger import log_request, apply_request_logger
 from .error_handler import APIError, register_error_handlers
 from .api_usage_logger import log_api_usage, apply_api_usage_logger
-from .rate_limiter import rate_limit, apply_global_rate_limit
+from .rate_limiter import rate_limit, apply_global_rate_limit, init_rate_limiter
+from .load_shedder import apply_load_shedding
+from .metrics import apply_metrics
+from .query_stats import apply_query_stats
+from .read_replica import read_only, apply_read_replica_routing
+from .json_provider import apply_json_provider
 from .validation_middleware import validate_json, validate_schema, validate_params
 
 def admin_required():
@@ -40,14 +45,34 @@ def role_required(allowed_roles):
 
 def setup_middlewares(app):
     """Initialise and register all middlewares with the Flask app"""
+    # Serialize responses with orjson when it is installed
+    apply_json_provider(app)
+    
     # Register error handlers
     register_error_handlers(app)
     
+    # Collect request metrics first so rejected requests are counted too
+    apply_metrics(app)
+    
     # Apply request logging
     apply_request_logger(app)
     
+    # Add SQL statistics to the request log (after_request hooks run in reverse order)
+    apply_query_stats(app)
+    
+    # Serve read-only requests from the replica, keeping recent writers on the primary
+    apply_read_replica_routing(app)
+    
     # Apply API usage tracking
     apply_api_usage_logger(app)
     
     # Apply global rate limiting
-    apply_global_rate_limit(app, requests_per_window=300, window_seconds=60)
+    init_rate_limiter(app)
+    apply_global_rate_limit(
+        app,
+        requests_per_window=app.config.get('RATE_LIMIT_GLOBAL_REQUESTS', 300),
+        window_seconds=app.config.get('RATE_LIMIT_GLOBAL_WINDOW', 60)
+    )
+    
+    # Shed low-priority routes when this worker is saturated
+    apply_load_shedding(app)
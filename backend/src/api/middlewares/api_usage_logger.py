@@ -54,39 +54,16 @@ def log_api_usage():
     return decorator
 
 def apply_api_usage_logger(app):
-    """Apply API usage logging middleware to all routes"""
-    @app.before_request
-    def before_request():
-        g.request_start_time = time.time()
-    
+    """Apply API usage counting middleware to all routes"""
     @app.after_request
     def after_request(response):
-        # Skip logging for certain paths
+        # Skip certain paths
         if request.path.startswith('/static') or request.path == '/favicon.ico':
             return response
-            
-        duration = time.time() - g.get('request_start_time', time.time())
-        endpoint = request.endpoint
-        method = request.method
-        status_code = response.status_code
-        
-        # Get user ID if authenticated
-        user_id = None
-        try:
-            user_id = get_jwt_identity()['user_id'] if get_jwt_identity() else None
-        except:
-            pass
         
-        # Update usage statistics
+        # Update usage statistics; the request itself is logged once by apply_request_logger
         with api_usage_lock:
-            api_usage_stats[endpoint][method] += 1
-        
-        # Log usage information
-        logger.info(
-            f"API usage: {endpoint} [{method}] - "
-            f"Path: {request.path} - Status: {status_code} - "
-            f"Duration: {duration:.4f}s - User: {user_id}"
-        )
+            api_usage_stats[request.endpoint][request.method] += 1
         
         return response
 
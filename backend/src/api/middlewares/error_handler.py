@@ -4,6 +4,8 @@ import traceback
 import logging
 from flask import jsonify, current_app
 
+from ...services.circuit_breaker import DependencyUnavailableError
+
 # Configure logger
 logger = logging.getLogger('api.errors')
 
@@ -43,6 +45,19 @@ def handle_validation_error(error):
         'errors': error.messages
     }), 400
 
+def handle_dependency_unavailable(error):
+    """Handler for calls refused by a circuit breaker or bulkhead"""
+    logger.warning(f"Dependency unavailable: {str(error)}")
+    response = jsonify({
+        'status': 'error',
+        'message': f'{error.dependency} is temporarily unavailable, please try again later',
+        'error': error.reason
+    })
+    response.status_code = 503
+    if error.retry_after:
+        response.headers['Retry-After'] = str(max(1, int(round(error.retry_after))))
+    return response
+
 def handle_generic_error(error):
     """Handler for all other unhandled exceptions"""
     # Log the full traceback for debugging
@@ -67,6 +82,7 @@ def register_error_handlers(app):
     """Register all error handlers with the Flask app"""
     app.register_error_handler(APIError, handle_api_error)
     app.register_error_handler(404, handle_404_error)
+    app.register_error_handler(DependencyUnavailableError, handle_dependency_unavailable)
     app.register_error_handler(Exception, handle_generic_error)
     
     # Register additional error handlers as needed
@@ -0,0 +1,177 @@
+"""Middleware to shed low-priority requests when the worker is saturated"""
+
+import logging
+import math
+import threading
+import time
+from fnmatch import fnmatchcase
+from flask import request, jsonify, g
+
+logger = logging.getLogger(__name__)
+
+CRITICAL = 'critical'
+NORMAL = 'normal'
+LOW = 'low'
+
+class LoadShedder:
+    """
+    Admission control based on in-flight requests and recent latency.
+
+    Requests are classified by matching "METHOD /path" against the critical
+    and low-priority route patterns. Critical routes are always admitted.
+    Low-priority routes are refused once the worker is half busy, once their
+    own concurrency cap is reached, or while protected traffic is slower than
+    the latency target. Normal routes are refused only at max_in_flight.
+    """
+
+    # Latency samples older than this no longer count as evidence of overload
+    latency_window = 10
+    # Weight of the newest sample in the moving latency averages
+    smoothing = 0.2
+
+    def __init__(self, max_in_flight=64, low_priority_share=0.5, low_priority_concurrency=4,
+                 latency_target=1.0, critical_routes=(), low_priority_routes=(), clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.configure(max_in_flight, low_priority_share, low_priority_concurrency,
+                       latency_target, critical_routes, low_priority_routes)
+
+    def configure(self, max_in_flight, low_priority_share, low_priority_concurrency,
+                  latency_target, critical_routes, low_priority_routes):
+        with self._lock:
+            self.max_in_flight = max_in_flight
+            self.low_priority_limit = max(1, int(max_in_flight * low_priority_share))
+            self.low_priority_concurrency = low_priority_concurrency
+            self.latency_target = latency_target
+            self.critical_routes = list(critical_routes)
+            self.low_priority_routes = list(low_priority_routes)
+            self._priorities = {}
+            self.in_flight = 0
+            self.shed = 0
+            self._endpoints = {}
+            self._latency = 0.0
+            self._latency_updated = None
+
+    def classify(self, method, path):
+        """Priority for a request, cached per method and path"""
+        key = f"{method} {path}"
+        priority = self._priorities.get(key)
+        if priority is None:
+            if any(fnmatchcase(key, pattern) for pattern in self.critical_routes):
+                priority = CRITICAL
+            elif any(fnmatchcase(key, pattern) for pattern in self.low_priority_routes):
+                priority = LOW
+            else:
+                priority = NORMAL
+            if len(self._priorities) < 10000:
+                self._priorities[key] = priority
+        return priority
+
+    def _endpoint(self, endpoint):
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = {'in_flight': 0, 'latency': 0.0, 'completed': 0, 'shed': 0}
+        return stats
+
+    def _overloaded(self, now):
+        return (self._latency_updated is not None
+                and now - self._latency_updated < self.latency_window
+                and self._latency > self.latency_target)
+
+    def admit(self, endpoint, priority):
+        """Reserve an in-flight slot, returning (admitted, retry_after)"""
+        now = self._clock()
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            if priority == LOW:
+                refused = (self.in_flight >= self.low_priority_limit
+                           or stats['in_flight'] >= self.low_priority_concurrency
+                           or self._overloaded(now))
+            elif priority == NORMAL:
+                refused = self.in_flight >= self.max_in_flight
+            else:
+                refused = False
+
+            if refused:
+                self.shed += 1
+                stats['shed'] += 1
+                return False, max(1, min(30, math.ceil(max(self._latency, stats['latency']))))
+
+            self.in_flight += 1
+            stats['in_flight'] += 1
+        return True, 0
+
+    def release(self, endpoint, priority, duration):
+        """Free the slot taken by admit and record how long the request took"""
+        now = self._clock()
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            self.in_flight -= 1
+            stats['in_flight'] -= 1
+            stats['completed'] += 1
+            stats['latency'] += self.smoothing * (duration - stats['latency'])
+
+            # Judge overload by the traffic being protected, so slow low-priority
+            # routes cannot keep themselves shed
+            if priority != LOW:
+                if self._latency_updated is None or now - self._latency_updated >= self.latency_window:
+                    self._latency = duration
+                else:
+                    self._latency += self.smoothing * (duration - self._latency)
+                self._latency_updated = now
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'shed': self.shed,
+                'latency': round(self._latency, 4),
+                'overloaded': self._overloaded(self._clock()),
+                'endpoints': {endpoint: dict(stats) for endpoint, stats in self._endpoints.items()}
+            }
+
+load_shedder = LoadShedder()
+
+def apply_load_shedding(app):
+    """Apply adaptive load shedding to all routes"""
+    load_shedder.configure(
+        app.config.get('LOAD_SHED_MAX_IN_FLIGHT', 64),
+        app.config.get('LOAD_SHED_LOW_PRIORITY_SHARE', 0.5),
+        app.config.get('LOAD_SHED_LOW_PRIORITY_CONCURRENCY', 4),
+        app.config.get('LOAD_SHED_LATENCY_TARGET', 1.0),
+        app.config.get('LOAD_SHED_CRITICAL_ROUTES', []),
+        app.config.get('LOAD_SHED_LOW_PRIORITY_ROUTES', [])
+    )
+    app.extensions['load_shedder'] = load_shedder
+
+    if not app.config.get('LOAD_SHED_ENABLED', True):
+        return
+
+    @app.before_request
+    def check_load():
+        # Skip load shedding for certain paths
+        if request.path.startswith('/static') or request.path == '/favicon.ico':
+            return None
+
+        endpoint = request.endpoint or 'unknown'
+        priority = load_shedder.classify(request.method, request.path)
+        admitted, retry_after = load_shedder.admit(endpoint, priority)
+        if not admitted:
+            logger.warning(f"Shedding {priority} priority request: {request.method} {request.path}")
+            resp = jsonify({
+                'status': 'error',
+                'message': 'Server is busy. Please try again later.'
+            })
+            resp.headers['Retry-After'] = str(retry_after)
+            return resp, 503
+
+        g.load_shed_slot = (endpoint, priority, time.monotonic())
+
+    @app.teardown_request
+    def release_slot(exc):
+        # Runs even when the view raised, so the slot is never leaked
+        slot = g.pop('load_shed_slot', None)
+        if slot:
+            endpoint, priority, started = slot
+            load_shedder.release(endpoint, priority, time.monotonic() - started)
@@ -0,0 +1,320 @@
+"""Middleware to collect per-route request metrics and expose them for Prometheus"""
+
+import atexit
+import json
+import logging
+import math
+import os
+import threading
+import time
+from flask import request, g, Response
+
+from .query_stats import current_query_stats
+
+logger = logging.getLogger(__name__)
+
+# Log-spaced latency buckets from 0.5ms to about 95s, each 1.5x the last
+LATENCY_BUCKETS = tuple(round(0.0005 * 1.5 ** i, 6) for i in range(31))
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+QUANTILES = (0.5, 0.95, 0.99)
+
+def histogram_quantile(quantile, buckets, counts):
+    """Estimate a quantile from per-bucket counts (last count is the +Inf bucket)"""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = quantile * total
+    cumulative = 0
+    for index, count in enumerate(counts):
+        if cumulative + count >= rank and count:
+            if index == len(buckets):
+                return buckets[-1]
+            lower = buckets[index - 1] if index else 0
+            return lower + (buckets[index] - lower) * (rank - cumulative) / count
+        cumulative += count
+    return buckets[-1]
+
+def _bucket_index(buckets, value):
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            return index
+    return len(buckets)
+
+def _label_text(names, values):
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return ','.join(pairs)
+
+def _format_value(value):
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+
+class MetricsRegistry:
+    """
+    Request metrics for this worker, optionally shared through a directory.
+
+    Each worker keeps counters and fixed-bucket histograms in memory. When
+    multiproc_dir is set it also writes a snapshot of them to its own file
+    there at most once per flush_interval, and collect() merges every
+    worker's file so /metrics reports the whole server. In-flight gauges are
+    only summed over workers that are still alive.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.multiproc_dir = None
+        self.flush_interval = 1.0
+        self._last_flush = 0.0
+        self.reset()
+
+    def configure(self, multiproc_dir=None, flush_interval=1.0):
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = flush_interval
+        if multiproc_dir:
+            os.makedirs(multiproc_dir, exist_ok=True)
+
+    def reset(self):
+        with self._lock:
+            self._requests = {}
+            self._latency = {}
+            self._queries = {}
+            self._in_flight = {}
+            self._pool_wait = {}
+            self._pool_timeouts = {}
+
+    def track_in_flight(self, route, delta):
+        with self._lock:
+            self._in_flight[route] = self._in_flight.get(route, 0) + delta
+
+    def observe_request(self, route, method, status, duration, queries):
+        """Record a finished request"""
+        key = (route, method)
+        with self._lock:
+            status_key = (route, method, str(status))
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+
+            latency = self._latency.get(key)
+            if latency is None:
+                latency = self._latency[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0]
+            latency[0][_bucket_index(LATENCY_BUCKETS, duration)] += 1
+            latency[1] += duration
+
+            query_counts = self._queries.get(key)
+            if query_counts is None:
+                query_counts = self._queries[key] = [[0] * (len(QUERY_BUCKETS) + 1), 0]
+            query_counts[0][_bucket_index(QUERY_BUCKETS, queries)] += 1
+            query_counts[1] += queries
+
+    def observe_pool_checkout(self, pool, wait, timed_out=False):
+        """Record how long a database connection checkout waited"""
+        key = (pool,)
+        with self._lock:
+            histogram = self._pool_wait.get(key)
+            if histogram is None:
+                histogram = self._pool_wait[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0]
+            histogram[0][_bucket_index(LATENCY_BUCKETS, wait)] += 1
+            histogram[1] += wait
+            if timed_out:
+                self._pool_timeouts[key] = self._pool_timeouts.get(key, 0) + 1
+
+    def snapshot(self):
+        """This worker's metrics in a JSON-serialisable form"""
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'requests': [[list(key), value] for key, value in self._requests.items()],
+                'latency': [[list(key), list(counts), total] for key, (counts, total) in self._latency.items()],
+                'queries': [[list(key), list(counts), total] for key, (counts, total) in self._queries.items()],
+                'in_flight': [[route, value] for route, value in self._in_flight.items()],
+                'pool_wait': [[list(key), list(counts), total] for key, (counts, total) in self._pool_wait.items()],
+                'pool_timeouts': [[list(key), value] for key, value in self._pool_timeouts.items()]
+            }
+
+    def flush(self):
+        """Write this worker's snapshot to the shared directory"""
+        if not self.multiproc_dir:
+            return
+        path = os.path.join(self.multiproc_dir, f'metrics_{os.getpid()}.json')
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        # Readers never see a half-written file
+        os.replace(temp_path, path)
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self):
+        if self.multiproc_dir and time.monotonic() - self._last_flush >= self.flush_interval:
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning(f"Could not write metrics snapshot: {str(e)}")
+
+    def _snapshots(self):
+        if not self.multiproc_dir:
+            return [self.snapshot()]
+
+        self.flush()
+        snapshots = []
+        for name in os.listdir(self.multiproc_dir):
+            if not (name.startswith('metrics_') and name.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, name)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    @staticmethod
+    def _pid_alive(pid):
+        if pid == os.getpid():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def collect(self):
+        """Merge the metrics of every worker"""
+        requests, latency, queries, in_flight = {}, {}, {}, {}
+        pool_wait, pool_timeouts = {}, {}
+
+        def merge_histogram(target, key, counts, total):
+            merged = target.setdefault(key, [[0] * len(counts), 0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+
+        for snapshot in self._snapshots():
+            for key, value in snapshot['requests']:
+                requests[tuple(key)] = requests.get(tuple(key), 0) + value
+            for key, counts, total in snapshot['latency']:
+                merge_histogram(latency, tuple(key), counts, total)
+            for key, counts, total in snapshot['queries']:
+                merge_histogram(queries, tuple(key), counts, total)
+            for key, counts, total in snapshot.get('pool_wait', []):
+                merge_histogram(pool_wait, tuple(key), counts, total)
+            for key, value in snapshot.get('pool_timeouts', []):
+                pool_timeouts[tuple(key)] = pool_timeouts.get(tuple(key), 0) + value
+            if self._pid_alive(snapshot['pid']):
+                for route, value in snapshot['in_flight']:
+                    in_flight[route] = in_flight.get(route, 0) + value
+
+        return {'requests': requests, 'latency': latency, 'queries': queries, 'in_flight': in_flight,
+                'pool_wait': pool_wait, 'pool_timeouts': pool_timeouts}
+
+    def render(self):
+        """Prometheus text exposition of the merged metrics"""
+        metrics = self.collect()
+        lines = []
+
+        lines.append('# HELP http_requests_total Requests handled, by route, method and status')
+        lines.append('# TYPE http_requests_total counter')
+        for key, value in sorted(metrics['requests'].items()):
+            lines.append(f"http_requests_total{{{_label_text(('route', 'method', 'status'), key)}}} {value}")
+
+        lines.append('# HELP http_requests_in_flight Requests currently being served, by route')
+        lines.append('# TYPE http_requests_in_flight gauge')
+        for route, value in sorted(metrics['in_flight'].items()):
+            lines.append(f"http_requests_in_flight{{{_label_text(('route',), (route,))}}} {value}")
+
+        self._render_histogram(lines, 'http_request_duration_seconds', 'Request latency in seconds',
+                               LATENCY_BUCKETS, metrics['latency'])
+        self._render_histogram(lines, 'db_queries_per_request', 'Database queries issued per request',
+                               QUERY_BUCKETS, metrics['queries'])
+        self._render_histogram(lines, 'db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled database connection',
+                               LATENCY_BUCKETS, metrics['pool_wait'], ('pool',))
+
+        lines.append('# HELP db_pool_checkout_timeouts_total Connection checkouts that gave up waiting for the pool')
+        lines.append('# TYPE db_pool_checkout_timeouts_total counter')
+        for key, value in sorted(metrics['pool_timeouts'].items()):
+            lines.append(f"db_pool_checkout_timeouts_total{{{_label_text(('pool',), key)}}} {value}")
+
+        lines.append('# HELP http_request_duration_quantile_seconds Latency quantiles estimated from the histogram')
+        lines.append('# TYPE http_request_duration_quantile_seconds gauge')
+        for key, (counts, _) in sorted(metrics['latency'].items()):
+            for quantile in QUANTILES:
+                value = histogram_quantile(quantile, LATENCY_BUCKETS, counts)
+                labels = _label_text(('route', 'method', 'quantile'), key + (str(quantile),))
+                lines.append(f"http_request_duration_quantile_seconds{{{labels}}} {value:.6f}")
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_histogram(lines, name, help_text, buckets, histograms, label_names=('route', 'method')):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for key, (counts, total) in sorted(histograms.items()):
+            labels = _label_text(label_names, key)
+            cumulative = 0
+            for bound, count in zip(buckets + (float('inf'),), counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{_format_value(float(bound))}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {_format_value(float(total))}')
+            lines.append(f'{name}_count{{{labels}}} {cumulative}')
+
+metrics = MetricsRegistry()
+
+def _route():
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+def apply_metrics(app):
+    """Collect request metrics for all routes and serve them on /metrics"""
+    metrics.configure(
+        app.config.get('METRICS_MULTIPROC_DIR'),
+        app.config.get('METRICS_FLUSH_INTERVAL', 1.0)
+    )
+    if metrics.multiproc_dir:
+        atexit.register(metrics.flush)
+    app.extensions['metrics'] = metrics
+
+    @app.before_request
+    def start_metrics():
+        # Skip metrics for certain paths
+        if request.path.startswith('/static') or request.path == '/favicon.ico':
+            return None
+
+        g.metrics_started = time.perf_counter()
+        g.metrics_route = _route()
+        metrics.track_in_flight(g.metrics_route, 1)
+
+    @app.after_request
+    def record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def finish_metrics(exc):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        route = g.pop('metrics_route')
+        stats = current_query_stats()
+        metrics.track_in_flight(route, -1)
+        metrics.observe_request(
+            route,
+            request.method,
+            g.pop('metrics_status', 500),
+            time.perf_counter() - started,
+            stats.count if stats else 0
+        )
+        metrics.maybe_flush()
+
+    # Without a token, metrics are only served in development and testing or when made public explicitly
+    token = app.config.get('METRICS_AUTH_TOKEN')
+    public = app.config.get('METRICS_PUBLIC', False) or app.debug or app.testing
+    if not token and not public:
+        logger.warning("/metrics is disabled: set METRICS_AUTH_TOKEN, or METRICS_PUBLIC=True to serve it without one")
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        if not token and not public:
+            return Response('Forbidden\n', status=403, mimetype='text/plain')
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,122 @@
+"""Middleware to record per-request SQL statistics and flag N+1 query patterns"""
+
+import logging
+import re
+import time
+from collections import Counter
+from flask import request, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ...services.slow_query_log import slow_query_log
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement):
+    """Reduce a statement to its shape, so queries differing only in values compare equal"""
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('(?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+class NPlusOneError(AssertionError):
+    """Raised in CI mode when a request repeats the same statement shape too often"""
+
+class QueryStats:
+    """Statements executed while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+        self.shapes = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.total_time += duration
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold):
+        """Statement shapes executed at least threshold times, most frequent first"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+def current_query_stats():
+    """Stats for the request being served, or None outside a request"""
+    if not has_request_context():
+        return None
+    stats = g.get('query_stats')
+    if stats is None:
+        stats = g.query_stats = QueryStats()
+    return stats if isinstance(stats, QueryStats) else None
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info['query_start_time'].pop()
+    stats = current_query_stats()
+    if stats is not None:
+        stats.record(statement, duration)
+    slow_query_log.observe(conn, statement, parameters, duration, executemany)
+
+@event.listens_for(Engine, 'handle_error')
+def _discard_timer(exception_context):
+    # after_cursor_execute does not run for failed statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('query_start_time'):
+        conn.info['query_start_time'].pop()
+
+def apply_query_stats(app):
+    """
+    Report SQL statistics for every request.
+
+    The statement count, total DB time and slowest statement go into the
+    structured request log, and into a Server-Timing header when
+    QUERY_STATS_SERVER_TIMING is set (on by default in debug). Statement
+    shapes repeated N_PLUS_ONE_THRESHOLD or more times are logged as likely
+    N+1 queries, or raise NPlusOneError when N_PLUS_ONE_RAISE is set, so a
+    CI run fails on them.
+    """
+    server_timing = app.config.get('QUERY_STATS_SERVER_TIMING', app.debug)
+    threshold = app.config.get('N_PLUS_ONE_THRESHOLD', 5)
+    raise_on_n_plus_one = app.config.get('N_PLUS_ONE_RAISE', False)
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.get('query_stats')
+        if not isinstance(stats, QueryStats) or not stats.count:
+            return response
+
+        fields = g.setdefault('request_log_fields', {})
+        fields.update({
+            'db_queries': stats.count,
+            'db_time_ms': round(stats.total_time * 1000, 2),
+            'db_slowest_ms': round(stats.slowest_time * 1000, 2),
+            'db_slowest_statement': _WHITESPACE.sub(' ', stats.slowest_statement)[:200]
+        })
+
+        if server_timing:
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={stats.total_time * 1000:.2f};desc="{stats.count} queries"'
+            )
+
+        repeated = stats.repeated_shapes(threshold)
+        if repeated:
+            fields['n_plus_one'] = [{'statement': shape[:200], 'count': count} for shape, count in repeated]
+            message = '; '.join(f"{count}x {shape[:120]}" for shape, count in repeated)
+            if raise_on_n_plus_one:
+                raise NPlusOneError(f"Repeated queries in {request.method} {request.path}: {message}")
+            logger.warning(f"Possible N+1 queries: {message}")
+        return response
@@ -0,0 +1,256 @@
+"""
+Storage backends for the sliding-window rate limiter.
+
+Every backend keeps, per key, the request count for the current fixed window
+and the one before it, and answers hit(key, limit, window_seconds) with
+(allowed, retry_after) in a single atomic step. The in-process backend is the
+default; the SQLite and Redis backends share counts between gunicorn workers,
+and survive restarts, so a client gets the configured limit rather than one
+limit per worker.
+"""
+import logging
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+def slide_window(stored_window, current, previous, window):
+    """Roll stored counts forward to window, returning (current, previous)"""
+    if stored_window == window:
+        return current, previous
+    return 0, (current if stored_window == window - 1 else 0)
+
+def retry_after(previous, current, limit, elapsed, window_seconds):
+    """Seconds until a rejected key would next be allowed a request"""
+    if current >= limit or previous == 0:
+        # Only the next window can free capacity
+        wait = (1 - elapsed) * window_seconds
+    else:
+        # Wait until enough of the previous window has slid out of view
+        wait = (1 - (limit - current) / previous - elapsed) * window_seconds
+    # Round first so float noise does not add a whole second
+    return max(1, math.ceil(round(wait, 6)))
+
+class MemoryRateLimitStorage:
+    """
+    Counts held in this process with O(1) state per key.
+
+    Keys are spread over lock stripes so unrelated clients do not contend, and
+    each stripe evicts its least recently used keys beyond max_keys.
+    """
+
+    def __init__(self, max_keys=100000, stripes=64, clock=time.time):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._stripes = [(threading.Lock(), OrderedDict()) for _ in range(stripes)]
+        self._keys_per_stripe = max(1, math.ceil(max_keys / stripes))
+
+    def __len__(self):
+        return sum(len(entries) for _, entries in self._stripes)
+
+    def _stripe(self, key):
+        # crc32 rather than hash() so a key maps to the same stripe in every process
+        return self._stripes[zlib.crc32(key.encode('utf-8')) % len(self._stripes)]
+
+    def hit(self, key, limit, window_seconds):
+        now = self._clock()
+        window = int(now // window_seconds)
+        elapsed = (now % window_seconds) / window_seconds
+        lock, entries = self._stripe(key)
+
+        with lock:
+            # Entries idle for two windows hold no state worth keeping
+            while entries:
+                oldest = next(iter(entries.values()))
+                if oldest[3] > now:
+                    break
+                entries.popitem(last=False)
+
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = [window, 0, 0, 0]
+            else:
+                entries.move_to_end(key)
+                entry[1], entry[2] = slide_window(entry[0], entry[1], entry[2], window)
+                entry[0] = window
+
+            current, previous = entry[1], entry[2]
+            if previous * (1 - elapsed) + current >= limit:
+                return False, retry_after(previous, current, limit, elapsed, window_seconds)
+
+            entry[1] = current + 1
+            entry[3] = (window + 2) * window_seconds
+            while len(entries) > self._keys_per_stripe:
+                entries.popitem(last=False)
+        return True, 0
+
+    def reset(self):
+        for lock, entries in self._stripes:
+            with lock:
+                entries.clear()
+
+class SQLiteRateLimitStorage:
+    """Counts in a SQLite file shared by every worker on the host"""
+
+    # Expired rows are swept once every this many hits
+    purge_every = 1000
+
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self._clock = clock
+        self._local = threading.local()
+        self._hits = 0
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                window INTEGER NOT NULL,
+                current INTEGER NOT NULL,
+                previous INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_rate_limits_expires_at ON rate_limits (expires_at);
+        """)
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        row = self._connection().execute(
+            'SELECT COUNT(*) FROM rate_limits WHERE expires_at > ?', (self._clock(),)
+        ).fetchone()
+        return row[0]
+
+    def hit(self, key, limit, window_seconds):
+        now = self._clock()
+        window = int(now // window_seconds)
+        elapsed = (now % window_seconds) / window_seconds
+        conn = self._connection()
+
+        # BEGIN IMMEDIATE takes the write lock up front, so the read and the
+        # write below cannot interleave with another worker's
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT window, current, previous FROM rate_limits WHERE key = ?', (key,)
+            ).fetchone()
+            current, previous = slide_window(*row, window) if row else (0, 0)
+
+            allowed = previous * (1 - elapsed) + current < limit
+            if allowed:
+                current += 1
+            conn.execute(
+                'INSERT INTO rate_limits (key, window, current, previous, expires_at) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET window = excluded.window, current = excluded.current, '
+                'previous = excluded.previous, expires_at = excluded.expires_at',
+                (key, window, current, previous, (window + 2) * window_seconds)
+            )
+
+            self._hits += 1
+            if self._hits % self.purge_every == 0:
+                conn.execute('DELETE FROM rate_limits WHERE expires_at <= ?', (now,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        if not allowed:
+            return False, retry_after(previous, current, limit, elapsed, window_seconds)
+        return True, 0
+
+    def reset(self):
+        self._connection().execute('DELETE FROM rate_limits')
+
+class RedisRateLimitStorage:
+    """Counts in Redis, shared by every worker that can reach the server"""
+
+    # Slide the key's window and count the hit if allowed, in one round trip
+    HIT_SCRIPT = """
+        local window_seconds = tonumber(ARGV[2])
+        local now = tonumber(ARGV[1])
+        local window = math.floor(now / window_seconds)
+        local elapsed = (now % window_seconds) / window_seconds
+        local limit = tonumber(ARGV[3])
+
+        local stored = redis.call('HMGET', KEYS[1], 'window', 'current', 'previous')
+        local stored_window = tonumber(stored[1])
+        local current = tonumber(stored[2]) or 0
+        local previous = tonumber(stored[3]) or 0
+        if stored_window ~= window then
+            if stored_window == window - 1 then
+                previous = current
+            else
+                previous = 0
+            end
+            current = 0
+        end
+
+        local allowed = 0
+        if previous * (1 - elapsed) + current < limit then
+            allowed = 1
+            current = current + 1
+        end
+        redis.call('HSET', KEYS[1], 'window', window, 'current', current, 'previous', previous)
+        redis.call('EXPIREAT', KEYS[1], (window + 2) * window_seconds)
+        return {allowed, current, previous}
+    """
+
+    def __init__(self, url=None, client=None, prefix='devsync:rate_limit:', clock=time.time):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("The redis package is required for RATE_LIMIT_STORAGE=redis")
+            client = redis.Redis.from_url(url)
+
+        self.client = client
+        self.prefix = prefix
+        self._clock = clock
+        self._hit = client.register_script(self.HIT_SCRIPT)
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}*"))
+
+    def hit(self, key, limit, window_seconds):
+        now = self._clock()
+        allowed, current, previous = self._hit(
+            keys=[f"{self.prefix}{key}"],
+            args=[repr(now), window_seconds, limit]
+        )
+        if allowed:
+            return True, 0
+        elapsed = (now % window_seconds) / window_seconds
+        return False, retry_after(int(previous), int(current), limit, elapsed, window_seconds)
+
+    def reset(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+def create_rate_limit_storage(config):
+    """Build the storage backend selected by RATE_LIMIT_STORAGE"""
+    storage = config.get('RATE_LIMIT_STORAGE', 'memory')
+
+    if storage == 'sqlite':
+        path = config.get('RATE_LIMIT_SQLITE_PATH') or os.path.join(tempfile.gettempdir(), 'devsync_rate_limits.db')
+        return SQLiteRateLimitStorage(path)
+    if storage == 'redis':
+        return RedisRateLimitStorage(url=config.get('REDIS_URL'))
+    if storage != 'memory':
+        raise ValueError(f"Unknown RATE_LIMIT_STORAGE: {storage}")
+    return MemoryRateLimitStorage(
+        max_keys=config.get('RATE_LIMIT_MAX_KEYS', 100000),
+        stripes=config.get('RATE_LIMIT_LOCK_STRIPES', 64)
+    )
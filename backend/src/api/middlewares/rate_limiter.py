@@ -1,16 +1,42 @@
 """Middleware to implement rate limiting for API requests"""
 
-import time
+import logging
 from functools import wraps
 from flask import request, jsonify, g
 from flask_jwt_extended import get_jwt_identity
-import threading
-from collections import defaultdict
 
-# In-memory storage for rate limiting (for a real app, use Redis)
-request_counts = defaultdict(lambda: defaultdict(int))
-request_timestamps = defaultdict(lambda: defaultdict(list))
-rate_limit_lock = threading.Lock()
+from .rate_limit_storage import MemoryRateLimitStorage, create_rate_limit_storage
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """Sliding-window rate limiter whose storage is chosen from app config by init_app"""
+
+    def __init__(self, storage=None):
+        self.storage = storage or MemoryRateLimitStorage()
+
+    def init_app(self, app):
+        self.storage = create_rate_limit_storage(app.config)
+        app.extensions['rate_limiter'] = self
+        logger.info(f"Rate limits stored in {type(self.storage).__name__}")
+
+    def hit(self, key, limit, window_seconds):
+        """Count a request for key, returning (allowed, retry_after)"""
+        try:
+            return self.storage.hit(key, limit, window_seconds)
+        except Exception as e:
+            # A storage outage should not take the API down with it
+            logger.warning(f"Rate limit storage unavailable, allowing request: {str(e)}")
+            return True, 0
+
+    def reset(self):
+        self.storage.reset()
+
+limiter = RateLimiter()
+
+def init_rate_limiter(app):
+    """Select rate limit storage from app config"""
+    limiter.init_app(app)
 
 def get_client_identifier():
     """Get a unique identifier for the client making the request"""
@@ -29,15 +55,13 @@ def get_client_identifier():
     
     return user_id
 
-def clean_old_requests(client_id, endpoint, window_seconds):
-    """Remove requests older than the rate limit window"""
-    current_time = time.time()
-    with rate_limit_lock:
-        request_timestamps[client_id][endpoint] = [
-            ts for ts in request_timestamps[client_id][endpoint]
-            if current_time - ts < window_seconds
-        ]
-        request_counts[client_id][endpoint] = len(request_timestamps[client_id][endpoint])
+def _rate_limited_response(message, retry_after):
+    resp = jsonify({
+        'status': 'error',
+        'message': message
+    })
+    resp.headers['Retry-After'] = str(retry_after)
+    return resp, 429
 
 def rate_limit(requests_per_window=100, window_seconds=60, by_endpoint=True):
     """
@@ -53,23 +77,12 @@ def rate_limit(requests_per_window=100, window_seconds=60, by_endpoint=True):
         def decorated_function(*args, **kwargs):
             client_id = get_client_identifier()
             endpoint = request.endpoint if by_endpoint else 'global'
-            
-            # Clean old requests outside the window
-            clean_old_requests(client_id, endpoint, window_seconds)
-            
+
             # Check if rate limit exceeded
-            with rate_limit_lock:
-                if request_counts[client_id][endpoint] >= requests_per_window:
-                    return jsonify({
-                        'status': 'error',
-                        'message': 'Rate limit exceeded. Please try again later.'
-                    }), 429
-                
-                # Add current request timestamp
-                current_time = time.time()
-                request_timestamps[client_id][endpoint].append(current_time)
-                request_counts[client_id][endpoint] += 1
-            
+            allowed, retry_after = limiter.hit(f"{endpoint}:{client_id}", requests_per_window, window_seconds)
+            if not allowed:
+                return _rate_limited_response('Rate limit exceeded. Please try again later.', retry_after)
+
             # Execute the request handler
             return f(*args, **kwargs)
         return decorated_function
@@ -82,22 +95,10 @@ def apply_global_rate_limit(app, requests_per_window=300, window_seconds=60):
         # Skip rate limiting for certain paths
         if request.path.startswith('/static') or request.path == '/favicon.ico':
             return None
-            
+
         client_id = get_client_identifier()
-        endpoint = 'global'
-        
-        # Clean old requests outside the window
-        clean_old_requests(client_id, endpoint, window_seconds)
-        
+
         # Check if rate limit exceeded
-        with rate_limit_lock:
-            if request_counts[client_id][endpoint] >= requests_per_window:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Global rate limit exceeded. Please try again later.'
-                }), 429
-            
-            # Add current request timestamp
-            current_time = time.time()
-            request_timestamps[client_id][endpoint].append(current_time)
-            request_counts[client_id][endpoint] += 1
+        allowed, retry_after = limiter.hit(f"global:{client_id}", requests_per_window, window_seconds)
+        if not allowed:
+            return _rate_limited_response('Global rate limit exceeded. Please try again later.', retry_after)
@@ -0,0 +1,61 @@
+"""Middleware to serve read-only requests from the database replica"""
+
+import time
+from flask import request, g
+
+# Clients that wrote recently carry this cookie and keep reading from the primary
+STICKY_COOKIE = 'db_primary_until'
+READ_ONLY_METHODS = ('GET', 'HEAD')
+
+def read_only(enabled=True):
+    """
+    Decorator to mark whether a route may be served from the replica.
+
+    GET and HEAD routes are read-only by default; use read_only() on other
+    routes that never write, and read_only(False) on GET routes that do.
+    """
+    def decorator(f):
+        # Decorators using functools.wraps carry the mark out to the registered view
+        f.read_only = enabled
+        return f
+    return decorator
+
+def _sticky(now):
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > now
+    except ValueError:
+        return False
+
+def apply_read_replica_routing(app):
+    """
+    Route read-only requests to the replica bind, when one is configured.
+
+    After a request writes to the primary the client gets a cookie keeping
+    it on the primary for REPLICA_STICKY_SECONDS, so it reads its own writes
+    even while the replica lags behind.
+    """
+    if not app.config.get('SQLALCHEMY_BINDS', {}).get('replica'):
+        return
+    sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', 5)
+
+    @app.before_request
+    def choose_database():
+        view = app.view_functions.get(request.endpoint)
+        marked = getattr(view, 'read_only', None)
+        use_replica = marked if marked is not None else request.method in READ_ONLY_METHODS
+        g.db_use_replica = use_replica and not _sticky(time.time())
+
+    @app.after_request
+    def keep_writer_on_primary(response):
+        if g.get('db_wrote_primary'):
+            response.set_cookie(
+                STICKY_COOKIE,
+                f'{time.time() + sticky_seconds:.3f}',
+                max_age=int(sticky_seconds) + 1,
+                httponly=True,
+                secure=request.is_secure,
+                samesite='Lax'
+            )
+        if g.get('db_use_replica'):
+            g.setdefault('request_log_fields', {})['db_replica'] = True
+        return response
@@ -1,13 +1,96 @@
 """Middleware to log incoming API requests"""
 
-import time
+import atexit
+import json
 import logging
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
 from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
 from flask import request, g
+from flask_jwt_extended import get_jwt_identity
 
 # Configure logger
 logger = logging.getLogger('api.requests')
 
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, merging any structured fields"""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of blocking or raising"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class AsyncRequestLog:
+    """
+    Hands request log records to a background thread.
+
+    The request thread only puts the record on a bounded queue; a
+    QueueListener thread formats it as JSON and writes it out, so slow log
+    I/O never adds to request latency. Records are dropped, and counted, if
+    the queue fills up.
+    """
+
+    def __init__(self):
+        self.handler = None
+        self.listener = None
+        self._target = None
+        self._lock = threading.Lock()
+
+    def start(self, target_logger, output_handler=None, queue_size=10000):
+        with self._lock:
+            if self.listener:
+                return
+            output_handler = output_handler or logging.StreamHandler()
+            output_handler.setFormatter(JSONFormatter())
+            self.handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+            self.listener = QueueListener(self.handler.queue, output_handler, respect_handler_level=True)
+            target_logger.addHandler(self.handler)
+            target_logger.propagate = False
+            self._target = target_logger
+            self.listener.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        with self._lock:
+            if not self.listener:
+                return
+            # Drains records already queued before the thread exits
+            self.listener.stop()
+            self._target.removeHandler(self.handler)
+            self._target.propagate = True
+            self.listener = None
+
+    @property
+    def dropped(self):
+        return self.handler.dropped if self.handler else 0
+
+# One background writer per worker process
+request_log = AsyncRequestLog()
+
 def log_request():
     """Decorator to log request information"""
     def decorator(f):
@@ -42,18 +125,56 @@ def log_request():
         return decorated_function
     return decorator
 
+def _current_user_id():
+    try:
+        identity = get_jwt_identity()
+        return identity.get('user_id') if isinstance(identity, dict) else identity
+    except Exception:
+        return None
+
 def apply_request_logger(app):
-    """Apply request logging middleware to all routes"""
+    """
+    Log one structured record per request.
+
+    Successful responses are sampled at REQUEST_LOG_SAMPLE_RATE; errors
+    (status >= 400) and requests slower than REQUEST_LOG_SLOW_MS are always
+    logged. Other middlewares can add fields to the record through
+    g.request_log_fields.
+    """
+    sample_rate = app.config.get('REQUEST_LOG_SAMPLE_RATE', 1.0)
+    slow_ms = app.config.get('REQUEST_LOG_SLOW_MS', 1000)
+    if app.config.get('REQUEST_LOG_ASYNC', True) and not app.config.get('TESTING'):
+        request_log.start(logger, queue_size=app.config.get('REQUEST_LOG_QUEUE_SIZE', 10000))
+
     @app.before_request
     def before_request():
         g.request_start_time = time.time()
-        logger.info(f"Request started: {request.method} {request.path} from {request.remote_addr}")
-    
+
     @app.after_request
     def after_request(response):
-        duration = time.time() - g.get('request_start_time', time.time())
-        logger.info(
-            f"Request completed: {request.method} {request.path} - "
-            f"Status: {response.status_code} - Duration: {duration:.4f}s"
-        )
+        # Skip logging for certain paths
+        if request.path.startswith('/static') or request.path == '/favicon.ico':
+            return response
+
+        duration_ms = (time.time() - g.get('request_start_time', time.time())) * 1000
+        status_code = response.status_code
+        slow = duration_ms >= slow_ms
+        if status_code < 400 and not slow and random.random() >= sample_rate:
+            return response
+
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'route': request.url_rule.rule if request.url_rule else None,
+            'status': status_code,
+            'duration_ms': round(duration_ms, 2),
+            'user_id': _current_user_id(),
+            'remote_addr': request.remote_addr,
+            'slow': slow,
+            'sample_rate': 1.0 if status_code >= 400 or slow else sample_rate
+        }
+        fields.update(g.get('request_log_fields', {}))
+
+        level = logging.ERROR if status_code >= 500 else logging.WARNING if status_code >= 400 or slow else logging.INFO
+        logger.log(level, f"{request.method} {request.path} {status_code}", extra={'fields': fields})
         return response
@@ -4,6 +4,7 @@ from flask import request
 from flask_jwt_extended import jwt_required
 from ..controllers.admin_controller import (
     get_system_stats,
+    get_slow_queries,
     get_system_settings,
     update_system_settings,
     update_user_role
@@ -23,6 +24,14 @@ def register_routes(bp):
         """Route to get system statistics"""
         return get_system_stats()
     
+    @bp.route('/admin/slow-queries', methods=['GET'])
+    @jwt_required()
+    @admin_required()
+    @rate_limit(requests_per_window=20, window_seconds=60)
+    def slow_queries():
+        """Route to get recently captured slow SQL statements"""
+        return get_slow_queries()
+    
     @bp.route('/admin/settings', methods=['GET'])
     @jwt_required()
     @admin_required()
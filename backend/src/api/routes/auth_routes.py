@@ -3,7 +3,7 @@
 from flask import request
 from flask_jwt_extended import jwt_required
 # Import the actual authentication logic from auth folder
-from ...auth.auth import login, register_user, refresh_token, logout_user, get_token  # Added get_token
+from ...auth.auth import login, register_user, refresh_token, logout_user, get_token, get_current_user  # Added get_token
 from ..middlewares.validation_middleware import validate_json  # Changed to relative import
 from ..validators.auth_validator import validate_login_data, validate_registration_data  # Changed to relative import
 
@@ -46,8 +46,7 @@ def register_routes(bp):
     @jwt_required()
     def me():
         """Route to get current authenticated user"""
-        from ..controllers.users_controller import get_current_user_profile  # Changed to relative import
-        return get_current_user_profile()
+        return get_current_user()
         
     @bp.route('/auth/token', methods=['POST'])
     @validate_json()
@@ -1,5 +1,6 @@
 """GitHub integration API routes"""
 
+import logging
 from flask import request, jsonify, current_app, redirect
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..controllers.github_controller import (
@@ -12,14 +13,19 @@ from ..controllers.github_controller import (
     link_task_with_github,
     get_task_github_links,
     delete_task_github_link,
-    check_github_config
+    check_github_config,
+    receive_github_webhook,
+    get_project_github_status,
+    get_github_health
 )
 from ..middlewares.validation_middleware import validate_json
-from ..middlewares import role_required
+from ..middlewares import role_required, read_only
 from ...auth.rbac import Role
 from ...db.models import db, User, GitHubToken
 from ...services.github_client import GitHubClient
 
+logger = logging.getLogger(__name__)
+
 def register_routes(bp):
     """Register all GitHub integration routes with the provided Blueprint"""
     
@@ -35,23 +41,24 @@ def register_routes(bp):
         return initiate_github_auth()
     
     @bp.route('/github/callback', methods=['GET', 'POST'])
+    @read_only(False)
     def github_oauth_callback():
         """Route to handle GitHub OAuth callback"""
         # For GET requests (coming from GitHub redirect)
         if request.method == 'GET':
             code = request.args.get('code')
             state = request.args.get('state')
-            print(f"GitHub callback GET request received with code: {code[:10]}... and state: {state[:10]}...")
+            logger.debug(f"GitHub callback GET request received with code: {code[:10]}... and state: {state[:10]}...")
         # For POST requests (from frontend)
         else:
             data = request.get_json() or {}
             code = data.get('code')
             state = data.get('state')
-            print(f"GitHub callback POST request received with code: {code[:10] if code else 'None'}... and state: {state[:10] if state else 'None'}...")
+            logger.debug(f"GitHub callback POST request received with code: {code[:10] if code else 'None'}... and state: {state[:10] if state else 'None'}...")
         
         if not code or not state:
             error_msg = 'Missing required parameters'
-            print(f"Error in GitHub callback: {error_msg}")
+            logger.warning(f"Error in GitHub callback: {error_msg}")
             return jsonify({'error': error_msg}), 400
             
         try:
@@ -62,56 +69,56 @@ def register_routes(bp):
             try:
                 decoded_state = json.loads(base64.b64decode(state).decode('utf-8'))
                 user_id = decoded_state.get('userId')
-                print(f"Decoded state successfully. User ID: {user_id}")
+                logger.debug(f"Decoded state successfully. User ID: {user_id}")
             except Exception as e:
-                print(f"Error decoding state: {str(e)}")
+                logger.warning(f"Error decoding state: {str(e)}")
                 return jsonify({'error': 'Invalid state parameter format'}), 400
             
             if not user_id:
-                print("User ID not found in state")
+                logger.debug("User ID not found in state")
                 return jsonify({'error': 'Invalid state parameter - missing user ID'}), 400
             
             # Exchange the code for an access token
-            print(f"Exchanging code for token...")
+            logger.debug(f"Exchanging code for token...")
             token_data = GitHubClient.exchange_code_for_token(code)
             
             if not token_data or 'access_token' not in token_data:
-                print("Failed to obtain access token")
+                logger.debug("Failed to obtain access token")
                 return jsonify({'error': 'Failed to obtain access token'}), 400
             
-            print(f"Token obtained successfully")
+            logger.debug(f"Token obtained successfully")
             
             # Create GitHub client with new token
             github_client = GitHubClient(token_data['access_token'])
             
             # Fetch user profile to get GitHub username
-            print("Fetching GitHub user profile")
+            logger.debug("Fetching GitHub user profile")
             github_profile = github_client.get_user_profile()
             
             if not github_profile:
-                print("Failed to fetch GitHub profile")
+                logger.debug("Failed to fetch GitHub profile")
                 return jsonify({'error': 'Failed to fetch GitHub profile'}), 400
             
-            print(f"GitHub profile fetched: {github_profile.get('login')}")
+            logger.debug(f"GitHub profile fetched: {github_profile.get('login')}")
             
             # Find the user
             user = User.query.get(user_id)
             if not user:
-                print(f"User with ID {user_id} not found")
+                logger.debug(f"User with ID {user_id} not found")
                 return jsonify({'error': 'User not found'}), 404
             
-            print(f"Found user: {user.email}")
+            logger.debug(f"Found user: {user.email}")
             
             # Check if user already has a GitHub token
             existing_token = GitHubToken.query.filter_by(user_id=user_id).first()
             
             if existing_token:
-                print("Updating existing GitHub token")
+                logger.debug("Updating existing GitHub token")
                 existing_token.access_token = token_data['access_token']
                 existing_token.scope = token_data.get('scope', '')
                 existing_token.token_type = token_data.get('token_type', 'bearer')
             else:
-                print("Creating new GitHub token record")
+                logger.debug("Creating new GitHub token record")
                 # Create a new token record
                 github_token = GitHubToken(
                     user_id=user_id,
@@ -123,12 +130,12 @@ def register_routes(bp):
             
             # Update user's GitHub username if available
             if github_profile and 'login' in github_profile:
-                print(f"Updating user's GitHub username to {github_profile['login']}")
+                logger.debug(f"Updating user's GitHub username to {github_profile['login']}")
                 user.github_username = github_profile['login']
                 user.github_connected = True
             
             db.session.commit()
-            print("Database updated successfully")
+            logger.debug("Database updated successfully")
             
             # For GET requests (GitHub redirect), redirect back to frontend
             if request.method == 'GET':
@@ -138,7 +145,7 @@ def register_routes(bp):
                                f"&github_username={github_profile.get('login')}"
                                f"&user_id={user_id}")
                 
-                print(f"Redirecting to: {redirect_url}")
+                logger.debug(f"Redirecting to: {redirect_url}")
                 return redirect(redirect_url)
             # For POST requests (from frontend), return JSON response
             else:
@@ -150,7 +157,6 @@ def register_routes(bp):
         
         except Exception as e:
             db.session.rollback()
-            print(f"Error processing GitHub callback: {str(e)}")
             current_app.logger.error(f"Error processing GitHub callback: {str(e)}")
             
             # Depending on request type, respond accordingly
@@ -208,7 +214,24 @@ def register_routes(bp):
         """Route to delete a GitHub link from a task"""
         return delete_task_github_link(task_id, link_id)
     
+    @bp.route('/projects/<int:project_id>/github-status', methods=['GET'])
+    @jwt_required()
+    def project_github_status(project_id):
+        """Route to get the GitHub state of all issues/PRs linked to a project"""
+        return get_project_github_status(project_id)
+    
+    @bp.route('/github/health', methods=['GET'])
+    def github_health():
+        """Route to report GitHub circuit breaker state (no authentication)"""
+        return get_github_health()
+    
+    @bp.route('/github/webhook', methods=['POST'])
+    def github_webhook():
+        """Route to receive GitHub webhook deliveries (authenticated by signature)"""
+        return receive_github_webhook()
+    
     @bp.route('/github/exchange', methods=['GET'])
+    @read_only(False)
     def exchange_github_code():
         """Route to exchange GitHub OAuth code for token without authentication"""
         code = request.args.get('code')
@@ -307,7 +330,7 @@ def register_routes(bp):
         if not client_id:
             return jsonify({'error': 'GitHub OAuth configuration is incomplete'}), 500
         
-        oauth_url = f"https://github.com/login/oauth/authorize?client_id={client_id}&redirect_uri={redirect_uri}&scope=user:email&state={state}"
+        oauth_url = f"{GitHubClient.AUTH_URL}?client_id={client_id}&redirect_uri={redirect_uri}&scope=user:email&state={state}"
         
         # Return the URL instead of redirecting
         return {'authorization_url': oauth_url}, 200
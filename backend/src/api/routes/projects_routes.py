@@ -12,8 +12,6 @@ from ..controllers.projects_controller import (
 )
 from ..middlewares.validation_middleware import validate_json, validate_params
 from ..middlewares import role_required
-from ..middlewares.api_usage_logger import log_api_usage
-from ..middlewares.request_logger import log_request
 from ...auth.rbac import Role
 
 def register_routes(bp):
@@ -21,8 +19,6 @@ def register_routes(bp):
     
     @bp.route('/projects', methods=['GET'])
     @jwt_required()
-    @log_api_usage()
-    @log_request()
     def projects_list():
         """Route to get all projects visible to user"""
         return get_all_projects()
@@ -31,15 +27,12 @@ def register_routes(bp):
     @jwt_required()
     @role_required([Role.ADMIN])
     @validate_json()
-    @log_api_usage()
-    @log_request()
     def create_project_route():
         """Route to create a new project"""
         return create_project()
     
     @bp.route('/projects/<int:project_id>', methods=['GET'])
     @jwt_required()
-    @log_api_usage()
     def get_project(project_id):
         """Route to get a specific project"""
         return get_project_by_id(project_id)
@@ -48,7 +41,6 @@ def register_routes(bp):
     @jwt_required()
     @role_required([Role.ADMIN])
     @validate_json()
-    @log_api_usage()
     def update_project_route(project_id):
         """Route to update a project"""
         return update_project(project_id)
@@ -56,14 +48,12 @@ def register_routes(bp):
     @bp.route('/projects/<int:project_id>', methods=['DELETE'])
     @jwt_required()
     @role_required([Role.ADMIN])
-    @log_api_usage()
     def delete_project_route(project_id):
         """Route to delete a project"""
         return delete_project(project_id)
     
     @bp.route('/projects/<int:project_id>/tasks', methods=['GET'])
     @jwt_required()
-    @log_api_usage()
     def project_tasks(project_id):
         """Route to get all tasks for a project"""
         return get_project_tasks(project_id)
@@ -0,0 +1,113 @@
+"""
+Response shapes for the API's models, declared once and compiled.
+
+Each shape lists the model attributes a response carries, optionally under
+a different key. Registering it builds, a single time, an attribute getter
+that reads every field of an ORM object in one call and the labelled column
+list that selects exactly those fields, so a controller gets both the
+minimal query projection and a fast serializer from one declaration.
+"""
+from operator import attrgetter
+
+from sqlalchemy import Date, DateTime
+
+from ..db.models import Task, User, Notification
+
+_serializers = {}
+
+class Serializer:
+    """
+    A compiled response shape for one model.
+
+    dump() turns an ORM object into the response dict, with dates as
+    ISO 8601 strings. select() narrows a query to the shape's columns;
+    its rows are keyed by response key and encoded by the app's JSON
+    provider without loading ORM objects.
+    """
+
+    def __init__(self, model, fields):
+        fields = [(field, field) if isinstance(field, str) else field for field in fields]
+        attributes = [getattr(model, attribute) for _, attribute in fields]
+
+        self.model = model
+        self.keys = tuple(key for key, _ in fields)
+        self.columns = tuple(
+            attribute.label(key) if key != attribute.key else attribute
+            for (key, _), attribute in zip(fields, attributes)
+        )
+
+        getter = attrgetter(*(attribute for _, attribute in fields))
+        # attrgetter returns a bare value rather than a tuple for a single field
+        self._values = getter if len(fields) > 1 else lambda obj: (getter(obj),)
+        self._dates = tuple(
+            index for index, attribute in enumerate(attributes)
+            if isinstance(attribute.type, (Date, DateTime))
+        )
+
+    def dump(self, obj):
+        """Serialize one ORM object"""
+        values = self._values(obj)
+        if self._dates:
+            values = list(values)
+            for index in self._dates:
+                if values[index] is not None:
+                    values[index] = values[index].isoformat()
+        return dict(zip(self.keys, values))
+
+    def dump_many(self, objs):
+        """Serialize a list of ORM objects"""
+        return [self.dump(obj) for obj in objs]
+
+    def select(self, query):
+        """Narrow a query to the shape's columns"""
+        return query.with_entities(*self.columns)
+
+def register_serializer(name, model, *fields):
+    """
+    Compile and register a response shape.
+
+    Fields are attribute names, or (key, attribute) pairs for a field
+    returned under another key.
+    """
+    if name in _serializers:
+        raise ValueError(f"Serializer '{name}' is already registered")
+    _serializers[name] = Serializer(model, fields)
+    return _serializers[name]
+
+def get_serializer(name):
+    """Look up a registered response shape by name"""
+    return _serializers[name]
+
+task_serializer = register_serializer(
+    'task', Task,
+    'id', 'title', 'description', 'status', 'progress',
+    'assigned_to', 'created_by', 'deadline', 'created_at', 'updated_at'
+)
+
+# Dashboard task summaries
+task_due_soon_serializer = register_serializer(
+    'task_due_soon', Task, 'id', 'title', 'deadline', 'status', 'project_id'
+)
+task_completed_serializer = register_serializer(
+    'task_completed', Task, 'id', 'title', ('completed_date', 'updated_at'), 'project_id'
+)
+project_task_due_soon_serializer = register_serializer(
+    'project_task_due_soon', Task, 'id', 'title', 'deadline', 'status', 'assigned_to'
+)
+project_task_updated_serializer = register_serializer(
+    'project_task_updated', Task, 'id', 'title', 'status', 'updated_at'
+)
+
+user_serializer = register_serializer(
+    'user', User, 'id', 'name', 'email', 'role', 'github_username', 'created_at'
+)
+team_member_serializer = register_serializer(
+    'team_member', User, 'id', 'name', 'role'
+)
+
+# Matches Notification.to_dict()
+notification_serializer = register_serializer(
+    'notification', Notification,
+    'id', 'user_id', ('type', 'notification_type'), 'title', 'message', 'reference_id',
+    ('read', 'is_read'), 'created_at', 'read_at'
+)
@@ -1,5 +1,6 @@
 # This file is the entry point for the Flask application.
 
+import logging
 import os
 import sys
 from dotenv import load_dotenv
@@ -15,15 +16,33 @@ sys.path.insert(0, backend_dir)
 if __name__ == '__main__':
     from src.db.models import db
     from src.config.config import get_config
+    from src.db.connection_pool import engine_options, database_binds
     from src.api import init_app as init_api
     from src.api.middlewares import setup_middlewares
+    from src.api.middlewares.metrics import metrics
     from src.socketio_server import init_socketio
+    from src.services.github_webhooks import init_webhook_processing
+    from src.services.github_jobs import init_github_job_processing
+    from src.services.github_client import GitHubClient
+    from src.services.oauth_state_store import oauth_states
+    from src.auth.helpers import init_password_hashing
+    from src.auth.identity_cache import identity_cache
+    from src.services.slow_query_log import slow_query_log
 else:
     from .db.models import db
     from .config.config import get_config
+    from .db.connection_pool import engine_options, database_binds
     from .api import init_app as init_api
     from .api.middlewares import setup_middlewares
+    from .api.middlewares.metrics import metrics
     from .socketio_server import init_socketio
+    from .services.github_webhooks import init_webhook_processing
+    from .services.github_jobs import init_github_job_processing
+    from .services.github_client import GitHubClient
+    from .services.oauth_state_store import oauth_states
+    from .auth.helpers import init_password_hashing
+    from .auth.identity_cache import identity_cache
+    from .services.slow_query_log import slow_query_log
 
 from datetime import timedelta
 from flask import Flask, request, jsonify, make_response, send_file
@@ -34,11 +53,13 @@ from flask_cors import CORS
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 def log_routes(app):
-    """Print all registered routes for debugging"""
-    print("\nRegistered Routes:")
+    """Log all registered routes for debugging"""
+    logger.debug("Registered Routes:")
     for rule in app.url_map.iter_rules():
-        print(f"Route: {rule.rule}, Methods: {rule.methods}")
+        logger.debug(f"Route: {rule.rule}, Methods: {rule.methods}")
 
 def create_app(config_class=None):
     app = Flask(__name__)
@@ -91,6 +112,13 @@ def create_app(config_class=None):
     if config_class:
         app.config.update(config_class)
     
+    # Size the connection pool for this worker unless options were given,
+    # exporting checkout waits with the request metrics
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(
+        app.config, on_checkout_wait=metrics.observe_pool_checkout))
+    app.config.setdefault('SQLALCHEMY_BINDS', database_binds(
+        app.config, on_checkout_wait=metrics.observe_pool_checkout))
+    
     # Initialize extensions
     db.init_app(app)
     migrate = Migrate(app, db)
@@ -168,6 +196,9 @@ def create_app(config_class=None):
         '/api/v1/github/callback',
         '/api/v1/github/exchange',
         '/api/v1/github/connect',
+        '/api/v1/github/webhook',
+        '/api/v1/github/health',
+        '/metrics',
         '/api/docs',
         '/api/swagger.yaml'
     ]
@@ -175,15 +206,10 @@ def create_app(config_class=None):
     # Middleware to remove Flask-JWT auth requirements for public routes
     @app.before_request
     def handle_auth_exemptions():
-        endpoint = request.endpoint
         path = request.path
         
-        # Debug logging for route access
-        print(f"Request to path: {path}, endpoint: {endpoint}")
-        
         # Skip JWT verification for OPTIONS requests and public routes
         if request.method == 'OPTIONS' or any(path.startswith(route) for route in public_routes):
-            print(f"Skipping auth for: {path}")
             return None
     
     # Initialize API routes (including auth routes)
@@ -196,6 +222,24 @@ def create_app(config_class=None):
     with app.app_context():
         log_routes(app)
     
+    # Run bcrypt in a bounded pool at the configured cost factor
+    init_password_hashing(app)
+    identity_cache.init_app(app)
+    
+    # Keep recent slow statements for /admin/slow-queries
+    slow_query_log.init_app(app)
+    
+    # Store OAuth states where every worker can consume them
+    oauth_states.init_app(app)
+    
+    # Guard outbound GitHub calls with a circuit breaker and bulkhead
+    GitHubClient.configure_endpoints(app.config)
+    GitHubClient.configure_resilience(app.config)
+    
+    # Start applying queued GitHub webhook events
+    init_webhook_processing(app)
+    init_github_job_processing(app)
+    
     # Initialize Socket.IO
     socketio = init_socketio(app)
     
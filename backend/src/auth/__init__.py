@@ -1,11 +1,13 @@
 """Authentication package initialization"""
 
-from .helpers import hash_password, verify_password, generate_tokens
+from .helpers import hash_password, verify_password, rehash_password_if_needed, init_password_hashing, generate_tokens
 from .rbac import Role, require_role, require_permission
 
 __all__ = [
     'hash_password',
     'verify_password',
+    'rehash_password_if_needed',
+    'init_password_hashing',
     'generate_tokens',
     'Role',
     'require_role',
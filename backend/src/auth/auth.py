@@ -1,5 +1,6 @@
 # This file contains the routes for user authentication
 
+import logging
 from flask import Blueprint, request, jsonify, make_response, current_app
 from flask_jwt_extended import (
     jwt_required, get_jwt_identity, get_jwt, 
@@ -9,7 +10,11 @@ from flask_jwt_extended import (
 from sqlalchemy.exc import IntegrityError
 
 from ..db.models import db, User  # Fix import path
-from .helpers import hash_password, verify_password, generate_tokens
+from .helpers import hash_password, verify_password, rehash_password_if_needed, generate_tokens
+from .identity_cache import identity_cache, identity_from_user, github_connected_expression
+from ..services.circuit_breaker import DependencyUnavailableError
+
+logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -71,40 +76,46 @@ def login():
     if not all(k in data for k in ['email', 'password']):
         return jsonify({'message': 'Missing email or password'}), 400
     
-    # Find user by email
-    print(f"Attempting to login user: {data['email']}")
-    user = User.query.filter_by(email=data['email']).first()
+    # Find user by email, with their GitHub connection status in the same query
+    logger.info(f"Attempting to login user: {data['email']}")
+    row = db.session.query(User, github_connected_expression().label('github_connected'))\
+        .filter(User.email == data['email']).first()
+    user, github_connected = (row[0], bool(row[1])) if row else (None, False)
     
     # Check if user exists and password is correct
     if not user:
-        print(f"User not found: {data['email']}")
+        logger.info(f"User not found: {data['email']}")
         return jsonify({'message': 'Invalid email or password'}), 401
         
     if not verify_password(data['password'], user.password):
-        print(f"Invalid password for user: {data['email']}")
+        logger.info(f"Invalid password for user: {data['email']}")
         return jsonify({'message': 'Invalid email or password'}), 401
     
+    # Capture the identity before any commit expires the loaded row
+    identity = identity_from_user(user, github_connected)
+    
+    # Upgrade the stored hash if the bcrypt cost factor has changed
+    if rehash_password_if_needed(user, data['password']):
+        db.session.commit()
+    
     # Generate tokens
-    tokens = generate_tokens(user.id, {'role': user.role})
-    print(f"Login successful for user: {user.email}, role: {user.role}")
+    tokens = generate_tokens(identity['id'], {'role': identity['role']})
+    logger.info(f"Login successful for user: {identity['email']}, role: {identity['role']}")
     
-    # Check for GitHub connection
-    from ..db.models.models import GitHubToken
-    github_token = GitHubToken.query.filter_by(user_id=user.id).first()
-    github_connected = github_token is not None
-    github_username = user.github_username
+    # Warm the identity cache for the requests that follow a login
+    identity_cache.set(identity)
     
     # Create response
     resp = jsonify({
         'message': 'Login successful',
         'user': {
-            'id': user.id,
-            'name': user.name,
-            'email': user.email,
-            'role': user.role,
+            'id': identity['id'],
+            'name': identity['name'],
+            'email': identity['email'],
+            'role': identity['role'],
             'token': tokens['access_token'],  # Include token in response
-            'github_connected': github_connected,
-            'github_username': github_username
+            'github_connected': identity['github_connected'],
+            'github_username': identity['github_username']
         }
     })
     
@@ -145,20 +156,17 @@ def logout():
 @jwt_required()
 def me():
     """Get current user information"""
+    return get_current_user()
+
+def get_current_user():
+    """Function to get the current user's identity from the per-worker identity cache"""
     current_user = get_jwt_identity()
     
-    user = User.query.get(current_user['user_id'])
-    if not user:
+    identity = identity_cache.get(current_user['user_id'])
+    if not identity:
         return jsonify({'message': 'User not found'}), 404
     
-    return jsonify({
-        'user': {
-            'id': user.id,
-            'name': user.name,
-            'email': user.email,
-            'role': user.role
-        }
-    })
+    return jsonify({'user': identity})
 
 def register_user():
     """Function to register a new user"""
@@ -175,8 +183,8 @@ def register_user():
     
     # Create new user
     try:
-        # Print debug information
-        print(f"Attempting to register user: {data['email']} with role: {data['role']}")
+        # Log debug information
+        logger.info(f"Attempting to register user: {data['email']} with role: {data['role']}")
         
         new_user = User(
             name=data['name'],
@@ -209,10 +217,14 @@ def register_user():
         
         return resp, 201
     
+    except DependencyUnavailableError:
+        # Password hashing is saturated; let the error handler answer 503
+        db.session.rollback()
+        raise
     except Exception as e:
         # Enhanced error handling to catch all exceptions
         db.session.rollback()
-        print(f"Registration error: {str(e)}")
+        logger.error(f"Registration error: {str(e)}")
         return jsonify({'message': f'An error occurred while registering the user: {str(e)}'}), 500
 
 def refresh_token():
@@ -258,6 +270,10 @@ def get_token():
     if not verify_password(data['password'], user.password):
         return jsonify({'message': 'Invalid email or password'}), 401
     
+    # Upgrade the stored hash if the bcrypt cost factor has changed
+    if rehash_password_if_needed(user, data['password']):
+        db.session.commit()
+    
     # Generate tokens
     tokens = generate_tokens(user.id, {'role': user.role})
     
@@ -1,17 +1,100 @@
 # Authentication helper functions
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 from flask_jwt_extended import create_access_token, create_refresh_token
 
+from ..services.circuit_breaker import DependencyUnavailableError
+
+logger = logging.getLogger(__name__)
+
+class PasswordHashPool:
+    """
+    Bounded pool that runs bcrypt off the request thread.
+
+    At most max_workers hashes run at once and at most max_queue more may wait;
+    anything beyond that is refused straight away so a login storm sheds load
+    with a 503 instead of piling up behind the CPU.
+    """
+
+    def __init__(self, max_workers=4, max_queue=32):
+        self._executor = None
+        self._lock = threading.Lock()
+        self.configure(max_workers, max_queue)
+
+    def configure(self, max_workers, max_queue):
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown(wait=False)
+            self.max_workers = max_workers
+            self.max_queue = max_queue
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bcrypt')
+            self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+            self.rejected = 0
+
+    def run(self, func, *args):
+        """Run func in the pool and wait for its result"""
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise DependencyUnavailableError('Authentication', 'too many concurrent password checks', retry_after=1)
+
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return future.result()
+
+password_pool = PasswordHashPool()
+
+# bcrypt cost factor for new hashes; existing hashes at another cost are upgraded on login
+bcrypt_rounds = 12
+
+def init_password_hashing(app):
+    """Configure the bcrypt cost factor and hashing pool from app config"""
+    global bcrypt_rounds
+    bcrypt_rounds = app.config.get('BCRYPT_ROUNDS', bcrypt_rounds)
+    password_pool.configure(
+        app.config.get('PASSWORD_HASH_WORKERS', 4),
+        app.config.get('PASSWORD_HASH_QUEUE_SIZE', 32)
+    )
+
+def _hash(password, rounds):
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+def _check(password, hashed_password):
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
 def hash_password(password):
     """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    return password_pool.run(_hash, password, bcrypt_rounds)
 
 def verify_password(password, hashed_password):
     """Verify that a password matches a hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    return password_pool.run(_check, password, hashed_password)
+
+def password_needs_rehash(hashed_password):
+    """Whether a hash was made with a different cost factor than the current one"""
+    try:
+        return int(hashed_password.split('$')[2]) != bcrypt_rounds
+    except (AttributeError, IndexError, ValueError):
+        return False
+
+def rehash_password_if_needed(user, password):
+    """Upgrade a user's stored hash after a successful login. Returns True if changed."""
+    if not password_needs_rehash(user.password):
+        return False
+
+    user.password = hash_password(password)
+    logger.info(f"Rehashed password for user {user.id} at cost {bcrypt_rounds}")
+    return True
 
 def generate_tokens(user_id, additional_claims=None):
     """Generate access and refresh tokens for a user"""
@@ -0,0 +1,111 @@
+"""
+Short-lived per-worker cache of user identity fields.
+
+Hot paths such as /auth/me, the dashboards and Socket.IO handlers only need a
+user's role, name and GitHub flags, so they read them from here instead of
+loading the User row on every call. Entries are dropped whenever this worker
+commits a change to the user or their GitHub token; other workers pick up
+changes when their entry's TTL runs out.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..db.models import db, User, GitHubToken
+
+def github_connected_expression():
+    """EXISTS subquery that is true when the user has a stored GitHub token"""
+    return db.session.query(GitHubToken.id).filter(GitHubToken.user_id == User.id).exists()
+
+def identity_from_user(user, github_connected):
+    """Build the cached identity for a User row"""
+    return {
+        'id': user.id,
+        'name': user.name,
+        'email': user.email,
+        'role': user.role,
+        'github_username': user.github_username,
+        'github_connected': bool(github_connected),
+        'created_at': user.created_at.isoformat() if user.created_at else None
+    }
+
+def load_identity(user_id):
+    """Load a user's identity with a single query"""
+    row = db.session.query(User, github_connected_expression().label('github_connected'))\
+        .filter(User.id == user_id).first()
+    if row is None:
+        return None
+    return identity_from_user(row[0], row[1])
+
+class IdentityCache:
+    """LRU cache of user_id -> identity dict with a TTL"""
+
+    def __init__(self, ttl=30, max_size=10000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('IDENTITY_CACHE_TTL', self.ttl)
+        self.max_size = app.config.get('IDENTITY_CACHE_MAX_SIZE', self.max_size)
+        self.clear()
+
+    def get(self, user_id):
+        """Return a copy of the user's identity, loading it on a miss. None if the user does not exist."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                return dict(entry[1])
+
+        identity = load_identity(user_id)
+        if identity is not None:
+            self.set(identity)
+        return dict(identity) if identity else None
+
+    def set(self, identity):
+        """Store an identity that was loaded elsewhere, e.g. during login"""
+        with self._lock:
+            self._entries[identity['id']] = (self._clock() + self.ttl, dict(identity))
+            self._entries.move_to_end(identity['id'])
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+identity_cache = IdentityCache()
+
+def _pending_invalidations(session):
+    return session.info.setdefault('identity_invalidations', set())
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    _pending_invalidations(Session.object_session(target)).add(target.id)
+
+@event.listens_for(GitHubToken, 'after_insert')
+@event.listens_for(GitHubToken, 'after_delete')
+def _github_token_changed(mapper, connection, target):
+    _pending_invalidations(Session.object_session(target)).add(target.user_id)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    # Drop entries only once the change is visible, so a concurrent miss cannot re-cache old values
+    for user_id in session.info.pop('identity_invalidations', ()):
+        identity_cache.invalidate(user_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back(session):
+    session.info.pop('identity_invalidations', None)
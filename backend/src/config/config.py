@@ -18,6 +18,20 @@ class Config:
             SQLALCHEMY_DATABASE_URI = SQLALCHEMY_DATABASE_URI.replace('postgresql://', 'postgresql+psycopg2cffi://', 1)
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    # Connection pool per worker; 0 sizes it from the gunicorn thread count
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 0))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 5))
+    DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', 0))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True') == 'True'
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))
+    
+    # Read replica for read-only requests; clients that just wrote stay on the primary
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL', '')
+    REPLICA_STICKY_SECONDS = float(os.getenv('REPLICA_STICKY_SECONDS', 5))
+    
     SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-secret-key')
     
     # JWT Configuration
@@ -25,18 +39,121 @@ class Config:
     JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', 30))
     
+    # Password hashing: bcrypt cost factor and the bounded pool it runs in
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 32))
+    
+    # Per-worker cache of user identity fields (role, name, GitHub flags)
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', 30))
+    IDENTITY_CACHE_MAX_SIZE = int(os.getenv('IDENTITY_CACHE_MAX_SIZE', 10000))
+    
     # GitHub OAuth Configuration
     GITHUB_CLIENT_ID = os.getenv('GITHUB_CLIENT_ID', '')
     GITHUB_CLIENT_SECRET = os.getenv('GITHUB_CLIENT_SECRET', '')
     GITHUB_REDIRECT_URI = os.getenv('GITHUB_REDIRECT_URI', '')
+    
+    # GitHub hosts; point these at a stand-in server for load tests
+    GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+    GITHUB_OAUTH_URL = os.getenv('GITHUB_OAUTH_URL', 'https://github.com/login/oauth')
+    
+    # GitHub OAuth state storage (memory, sqlite or redis)
+    OAUTH_STATE_BACKEND = os.getenv('OAUTH_STATE_BACKEND', 'memory')
+    OAUTH_STATE_TTL = int(os.getenv('OAUTH_STATE_TTL', 600))
+    OAUTH_STATE_MAX_SIZE = int(os.getenv('OAUTH_STATE_MAX_SIZE', 10000))
+    OAUTH_STATE_SQLITE_PATH = os.getenv('OAUTH_STATE_SQLITE_PATH', '')
+    
+    # Shared Redis server for cross-worker state
+    REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    
+    # GitHub webhook configuration
+    GITHUB_WEBHOOK_SECRET = os.getenv('GITHUB_WEBHOOK_SECRET', '')
+    GITHUB_WEBHOOK_BATCH_SIZE = int(os.getenv('GITHUB_WEBHOOK_BATCH_SIZE', 50))
+    GITHUB_WEBHOOK_FLUSH_INTERVAL = float(os.getenv('GITHUB_WEBHOOK_FLUSH_INTERVAL', 2))
+    GITHUB_WEBHOOK_QUEUE_SIZE = int(os.getenv('GITHUB_WEBHOOK_QUEUE_SIZE', 10000))
+    
+    # Concurrency limits for all-pages GitHub listings
+    GITHUB_MAX_PAGES_IN_FLIGHT = int(os.getenv('GITHUB_MAX_PAGES_IN_FLIGHT', 4))
+    GITHUB_MAX_PAGES = int(os.getenv('GITHUB_MAX_PAGES', 50))
+    
+    # Background delivery of outbound GitHub writes
+    GITHUB_JOB_POLL_INTERVAL = float(os.getenv('GITHUB_JOB_POLL_INTERVAL', 5))
+    GITHUB_JOB_BATCH_SIZE = int(os.getenv('GITHUB_JOB_BATCH_SIZE', 20))
+    GITHUB_JOB_MAX_ATTEMPTS = int(os.getenv('GITHUB_JOB_MAX_ATTEMPTS', 5))
+    GITHUB_JOB_RETRY_BACKOFF = float(os.getenv('GITHUB_JOB_RETRY_BACKOFF', 30))
+    GITHUB_JOB_LEASE_SECONDS = int(os.getenv('GITHUB_JOB_LEASE_SECONDS', 300))
+    
+    # Circuit breaker, bulkhead and timeout for outbound GitHub calls
+    GITHUB_BREAKER_FAILURE_RATE = float(os.getenv('GITHUB_BREAKER_FAILURE_RATE', 0.5))
+    GITHUB_BREAKER_SLOW_CALL_SECONDS = float(os.getenv('GITHUB_BREAKER_SLOW_CALL_SECONDS', 5))
+    GITHUB_BREAKER_WINDOW_SIZE = int(os.getenv('GITHUB_BREAKER_WINDOW_SIZE', 20))
+    GITHUB_BREAKER_MINIMUM_CALLS = int(os.getenv('GITHUB_BREAKER_MINIMUM_CALLS', 10))
+    GITHUB_BREAKER_OPEN_SECONDS = float(os.getenv('GITHUB_BREAKER_OPEN_SECONDS', 30))
+    GITHUB_MAX_CONCURRENT_REQUESTS = int(os.getenv('GITHUB_MAX_CONCURRENT_REQUESTS', 10))
+    GITHUB_BULKHEAD_MAX_WAIT = float(os.getenv('GITHUB_BULKHEAD_MAX_WAIT', 0.5))
+    GITHUB_REQUEST_TIMEOUT = float(os.getenv('GITHUB_REQUEST_TIMEOUT', 10))
+    
+    # Rate limiter storage: memory (per worker), sqlite (per host) or redis (shared)
+    RATE_LIMIT_STORAGE = os.getenv('RATE_LIMIT_STORAGE', 'memory')
+    RATE_LIMIT_SQLITE_PATH = os.getenv('RATE_LIMIT_SQLITE_PATH')
+    RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', 100000))
+    RATE_LIMIT_LOCK_STRIPES = int(os.getenv('RATE_LIMIT_LOCK_STRIPES', 64))
+    RATE_LIMIT_GLOBAL_REQUESTS = int(os.getenv('RATE_LIMIT_GLOBAL_REQUESTS', 300))
+    RATE_LIMIT_GLOBAL_WINDOW = int(os.getenv('RATE_LIMIT_GLOBAL_WINDOW', 60))
+    
+    # Adaptive load shedding; routes are "METHOD /path" glob patterns
+    LOAD_SHED_ENABLED = os.getenv('LOAD_SHED_ENABLED', 'True') == 'True'
+    LOAD_SHED_MAX_IN_FLIGHT = int(os.getenv('LOAD_SHED_MAX_IN_FLIGHT', 64))
+    LOAD_SHED_LOW_PRIORITY_SHARE = float(os.getenv('LOAD_SHED_LOW_PRIORITY_SHARE', 0.5))
+    LOAD_SHED_LOW_PRIORITY_CONCURRENCY = int(os.getenv('LOAD_SHED_LOW_PRIORITY_CONCURRENCY', 4))
+    LOAD_SHED_LATENCY_TARGET = float(os.getenv('LOAD_SHED_LATENCY_TARGET', 1.0))
+    LOAD_SHED_CRITICAL_ROUTES = [route.strip() for route in os.getenv(
+        'LOAD_SHED_CRITICAL_ROUTES',
+        '* /api/v1/auth/*,POST /api/v1/tasks*,PUT /api/v1/tasks/*,DELETE /api/v1/tasks/*,'
+        'POST /api/v1/projects/*/tasks,POST /api/v1/github/webhook,GET /api/v1/github/health'
+    ).split(',') if route.strip()]
+    LOAD_SHED_LOW_PRIORITY_ROUTES = [route.strip() for route in os.getenv(
+        'LOAD_SHED_LOW_PRIORITY_ROUTES',
+        'GET /api/v1/admin/stats,GET /api/v1/admin/slow-queries,GET /api/v1/github/repositories*,'
+        'GET /api/v1/projects/*/github-status,GET */export*'
+    ).split(',') if route.strip()]
+    
+    # JSON encoder for responses: auto (orjson when installed), orjson or stdlib
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'auto')
+    
+    # Request metrics; set a multiprocess directory to aggregate gunicorn workers
+    METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR') or os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 1.0))
+    METRICS_AUTH_TOKEN = os.getenv('METRICS_AUTH_TOKEN')
+    # Serve /metrics without a token outside development and testing
+    METRICS_PUBLIC = os.getenv('METRICS_PUBLIC', 'False') == 'True'
+    
+    # One JSON log record per request, written from a background thread
+    REQUEST_LOG_SAMPLE_RATE = float(os.getenv('REQUEST_LOG_SAMPLE_RATE', 1.0))
+    REQUEST_LOG_SLOW_MS = float(os.getenv('REQUEST_LOG_SLOW_MS', 1000))
+    REQUEST_LOG_ASYNC = os.getenv('REQUEST_LOG_ASYNC', 'True') == 'True'
+    REQUEST_LOG_QUEUE_SIZE = int(os.getenv('REQUEST_LOG_QUEUE_SIZE', 10000))
+    
+    # Per-request SQL statistics; N+1 patterns fail the request in CI
+    QUERY_STATS_SERVER_TIMING = os.getenv('QUERY_STATS_SERVER_TIMING', 'False') == 'True'
+    N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', 5))
+    N_PLUS_ONE_RAISE = os.getenv('N_PLUS_ONE_RAISE', os.getenv('CI', 'false')).lower() in ('1', 'true')
+    
+    # Slow statements kept for /admin/slow-queries, with sampled EXPLAIN on PostgreSQL
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+    SLOW_QUERY_LOG_SIZE = int(os.getenv('SLOW_QUERY_LOG_SIZE', 100))
+    SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', 'True') == 'True'
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.1))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    QUERY_STATS_SERVER_TIMING = os.getenv('QUERY_STATS_SERVER_TIMING', 'True') == 'True'
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
+    REQUEST_LOG_SAMPLE_RATE = float(os.getenv('REQUEST_LOG_SAMPLE_RATE', 0.1))
 
 class TestingConfig(Config):
     """Testing configuration"""
@@ -0,0 +1,140 @@
+"""
+Pooled database connections for the application.
+
+The SQLAlchemy engine keeps a pool of connections per worker process. Its
+options are built here from the app config and sized from how gunicorn runs
+the app, so the workers together stay within what the database allows.
+"""
+
+import os
+import shlex
+import time
+from contextlib import contextmanager
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from .db_connection import db
+from .routing_session import REPLICA_BIND_KEY
+
+# Threads outside the request workers that also use the database
+# (webhook processing and GitHub job delivery)
+BACKGROUND_CONNECTIONS = 2
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that reports how long each checkout waited for a connection.
+
+    on_checkout_wait is called as on_checkout_wait(pool_name, seconds,
+    timed_out=False) after every checkout, including ones that time out.
+    create_engine passes it through from the engine options.
+    """
+
+    def __init__(self, creator, on_checkout_wait=None, **kw):
+        super().__init__(creator, **kw)
+        self._on_checkout_wait = on_checkout_wait
+
+    def recreate(self):
+        pool = super().recreate()
+        pool._on_checkout_wait = self._on_checkout_wait
+        return pool
+
+    def _do_get(self):
+        if self._on_checkout_wait is None:
+            return super()._do_get()
+
+        started = time.perf_counter()
+        pool = self._orig_logging_name or 'primary'
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self._on_checkout_wait(pool, time.perf_counter() - started, timed_out=True)
+            raise
+        self._on_checkout_wait(pool, time.perf_counter() - started)
+        return connection
+
+def gunicorn_concurrency(environ=None):
+    """
+    Number of (workers, threads) the app is served with.
+
+    Read from GUNICORN_CMD_ARGS, then WEB_CONCURRENCY (which gunicorn also
+    honours) and GUNICORN_THREADS. Defaults to a single thread.
+    """
+    environ = os.environ if environ is None else environ
+    args = shlex.split(environ.get('GUNICORN_CMD_ARGS', ''))
+
+    def from_args(*flags):
+        for index, arg in enumerate(args):
+            for flag in flags:
+                if arg == flag and index + 1 < len(args):
+                    return args[index + 1]
+                if arg.startswith(f'{flag}='):
+                    return arg.split('=', 1)[1]
+        return None
+
+    workers = int(from_args('-w', '--workers') or environ.get('WEB_CONCURRENCY') or 1)
+    threads = int(from_args('--threads') or environ.get('GUNICORN_THREADS') or 1)
+    return max(1, workers), max(1, threads)
+
+def engine_options(config, environ=None, uri=None, pool_name='primary', on_checkout_wait=None):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for the configured database, or for uri.
+
+    Unless DB_POOL_SIZE is set, each worker keeps one connection per request
+    thread plus one per background thread. When DB_MAX_CONNECTIONS is set it
+    is split evenly between workers, capping both the pool and its overflow.
+    SQLite keeps Flask-SQLAlchemy's defaults. on_checkout_wait is handed
+    to TimedQueuePool.
+    """
+    uri = uri or config.get('SQLALCHEMY_DATABASE_URI') or ''
+    if not uri or uri.startswith('sqlite'):
+        return {}
+
+    workers, threads = gunicorn_concurrency(environ)
+    pool_size = config.get('DB_POOL_SIZE') or threads + BACKGROUND_CONNECTIONS
+    max_overflow = config.get('DB_MAX_OVERFLOW', 5)
+    max_connections = config.get('DB_MAX_CONNECTIONS')
+    if max_connections:
+        per_worker = max(1, max_connections // workers)
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+
+    options = {
+        'poolclass': TimedQueuePool,
+        'pool_logging_name': pool_name,
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 10),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True)
+    }
+    if on_checkout_wait is not None:
+        options['on_checkout_wait'] = on_checkout_wait
+    statement_timeout = config.get('DB_STATEMENT_TIMEOUT_MS')
+    if statement_timeout and uri.startswith('postgres'):
+        options['connect_args'] = {'options': f'-c statement_timeout={int(statement_timeout)}'}
+    return options
+
+def database_binds(config, environ=None, on_checkout_wait=None):
+    """SQLALCHEMY_BINDS adding the read replica when DATABASE_REPLICA_URL is set"""
+    replica_url = config.get('DATABASE_REPLICA_URL')
+    if not replica_url:
+        return {}
+    options = engine_options(config, environ, uri=replica_url, pool_name=REPLICA_BIND_KEY,
+                             on_checkout_wait=on_checkout_wait)
+    return {REPLICA_BIND_KEY: dict(options, url=replica_url)}
+
+@contextmanager
+def get_db_connection(engine=None):
+    """
+    Borrow a pooled connection for raw SQL.
+
+    The connection runs in a transaction that is committed when the block
+    exits normally and rolled back if it raises, and is then returned to the
+    pool. Uses the Flask-SQLAlchemy engine unless one is given.
+
+    Usage:
+        with get_db_connection() as conn:
+            conn.execute(text("SELECT 1"))
+    """
+    with (engine or db.engine).begin() as conn:
+        yield conn
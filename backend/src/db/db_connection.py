@@ -3,9 +3,10 @@ Database connection module that provides the SQLAlchemy database instance
 """
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import declarative_base  # Updated import path
+from .routing_session import RoutingSession
 
 # Create a single SQLAlchemy instance to be used across the application
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Create a base class for declarative class definitions
 Base = declarative_base()
@@ -0,0 +1,174 @@
+"""
+Online, idempotent index management.
+
+The indexes the application needs are declared once, on the models'
+__table_args__. IndexManager compares them with the indexes that exist in the
+database and only creates the missing ones, using CREATE INDEX CONCURRENTLY
+on PostgreSQL so the tables stay writable while they build. Indexes are
+identified by name, so changing an index's definition means giving it a new
+name; the old one then shows up as undeclared and can be dropped.
+"""
+import logging
+import re
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
+
+logger = logging.getLogger(__name__)
+
+_CREATE_INDEX = re.compile(r"^CREATE (UNIQUE )?INDEX ")
+
+EXISTING_INDEXES_SQL = """
+    SELECT
+        pi.tablename,
+        pi.indexname,
+        ix.indisvalid,
+        c.conname IS NOT NULL AS backs_constraint
+    FROM pg_indexes pi
+    JOIN pg_class i ON i.relname = pi.indexname
+    JOIN pg_namespace n ON n.oid = i.relnamespace AND n.nspname = pi.schemaname
+    JOIN pg_index ix ON ix.indexrelid = i.oid
+    LEFT JOIN pg_constraint c ON c.conindid = i.oid
+    WHERE pi.schemaname = current_schema()
+"""
+
+INDEX_USAGE_SQL = """
+    SELECT
+        s.relname AS table_name,
+        s.indexrelname AS index_name,
+        s.idx_scan,
+        s.idx_tup_read,
+        s.idx_tup_fetch,
+        pg_relation_size(s.indexrelid) AS size_bytes,
+        pg_size_pretty(pg_relation_size(s.indexrelid)) AS size
+    FROM pg_stat_user_indexes s
+    WHERE s.schemaname = current_schema()
+    ORDER BY pg_relation_size(s.indexrelid) DESC
+"""
+
+class IndexManager:
+    """Brings the database's indexes in line with those declared on the models"""
+
+    def __init__(self, metadata):
+        self.metadata = metadata
+
+    def declared(self):
+        """Declared indexes by name"""
+        return {
+            index.name: index
+            for table in self.metadata.sorted_tables
+            for index in table.indexes
+        }
+
+    def existing(self, conn):
+        """
+        Indexes in the database by name, as dicts with table and valid keys.
+
+        Indexes backing primary key and unique constraints are left out, since
+        they belong to the constraint rather than to this manager.
+        """
+        if conn.dialect.name == 'postgresql':
+            return {
+                row.indexname: {'table': row.tablename, 'valid': row.indisvalid}
+                for row in conn.execute(text(EXISTING_INDEXES_SQL))
+                if not row.backs_constraint
+            }
+
+        inspector = inspect(conn)
+        existing = {}
+        for table in inspector.get_table_names():
+            for index in inspector.get_indexes(table):
+                existing[index['name']] = {'table': table, 'valid': True}
+        return existing
+
+    def diff(self, conn):
+        """
+        Compare declared and existing indexes.
+
+        Returns a dict of index names: missing (declared but absent), invalid
+        (left behind by a failed concurrent build) and undeclared (present
+        but no longer declared).
+        """
+        declared = self.declared()
+        existing = self.existing(conn)
+        return {
+            'missing': sorted(name for name in declared if name not in existing),
+            'invalid': sorted(name for name in declared if name in existing and not existing[name]['valid']),
+            'undeclared': sorted(name for name in existing if name not in declared)
+        }
+
+    def create_statement(self, index, conn):
+        sql = str(CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect)).strip()
+        if conn.dialect.name == 'postgresql':
+            sql = _CREATE_INDEX.sub(lambda match: f"CREATE {match.group(1) or ''}INDEX CONCURRENTLY ", sql)
+        return sql
+
+    def sync(self, engine):
+        """
+        Create missing indexes and rebuild invalid ones, returning their names.
+
+        An index that fails to build is logged and skipped. CONCURRENTLY cannot run inside a transaction, so the statements run on
+        a connection of their own in autocommit mode.
+        """
+        declared = self.declared()
+        created = []
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            plan = self.diff(conn)
+            for name in plan['invalid']:
+                logger.warning(f"Rebuilding invalid index {name}")
+                conn.execute(text(self._drop_statement(name, conn)))
+
+            for name in plan['invalid'] + plan['missing']:
+                try:
+                    conn.execute(text(self.create_statement(declared[name], conn)))
+                except Exception as e:
+                    logger.error(f"Error creating index {name}: {e}")
+                    continue
+                logger.info(f"Created index {name} on {declared[name].table.name}")
+                created.append(name)
+
+        if not created:
+            logger.info("All declared indexes exist")
+        return created
+
+    def drop_unused(self, engine, dry_run=False):
+        """
+        Drop undeclared indexes that have never been scanned.
+
+        Undeclared indexes that queries still use are kept and logged, so an
+        index is not removed until whatever uses it has been dealt with.
+        Returns the names of the dropped (or, with dry_run, droppable) indexes.
+        """
+        dropped = []
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            scans = {row['index_name']: row['idx_scan'] for row in self.usage(conn)}
+            for name in self.diff(conn)['undeclared']:
+                if scans.get(name):
+                    logger.warning(f"Keeping undeclared index {name}: scanned {scans[name]} times")
+                    continue
+                if not dry_run:
+                    conn.execute(text(self._drop_statement(name, conn)))
+                    logger.info(f"Dropped unused index {name}")
+                dropped.append(name)
+        return dropped
+
+    def usage(self, conn):
+        """
+        Size and scan counts for each index from pg_stat_user_indexes.
+
+        Scan counts are cumulative since statistics were last reset. Returns an
+        empty list on databases without these statistics.
+        """
+        if conn.dialect.name != 'postgresql':
+            return []
+        declared = self.declared()
+        return [
+            dict(row._mapping, declared=row.index_name in declared)
+            for row in conn.execute(text(INDEX_USAGE_SQL))
+        ]
+
+    @staticmethod
+    def _drop_statement(name, conn):
+        quoted = conn.dialect.identifier_preparer.quote(name)
+        if conn.dialect.name == 'postgresql':
+            return f"DROP INDEX CONCURRENTLY IF EXISTS {quoted}"
+        return f"DROP INDEX IF EXISTS {quoted}"
@@ -7,7 +7,7 @@ Import and expose all models for easy access.
 from ..db_connection import db
 
 # Import models to make them available when importing the package
-from .models import User, Task, Project, Comment, GitHubToken, GitHubRepository, TaskGitHubLink, Notification
+from .models import User, Task, Project, Comment, GitHubToken, GitHubRepository, TaskGitHubLink, GitHubJob, Notification
 
 # Export all models for easy importing
 __all__ = [
@@ -19,5 +19,6 @@ __all__ = [
     'Notification',
     'GitHubToken',
     'GitHubRepository',
-    'TaskGitHubLink'
+    'TaskGitHubLink',
+    'GitHubJob'
 ]
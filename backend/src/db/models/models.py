@@ -54,17 +54,25 @@ class Task(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'))
     
-    # Fix __table_args__ format
+    # Indexes follow the task query shapes rather than single columns; the
+    # partial ones only cover open tasks, which are all the deadline views read.
+    # SQLite gets them as full indexes, since it binds 'done' as a parameter and
+    # could not prove the partial predicate
     __table_args__ = (
-        Index('idx_tasks_assigned_to', 'assigned_to'),
-        Index('idx_tasks_created_at', 'created_at'),
-        Index('idx_tasks_created_by', 'created_by'),
-        Index('idx_tasks_deadline', 'deadline'),
-        Index('idx_tasks_deadline_status', 'deadline', 'status'),
-        Index('idx_tasks_progress', 'progress'),
-        Index('idx_tasks_status', 'status'),
-        Index('idx_tasks_status_assigned', 'status', 'assigned_to'),
-        Index('idx_tasks_updated_at', 'updated_at'),
+        # Project task lists, optionally by status (also covers project_id alone)
+        Index('idx_tasks_project_status', project_id, status),
+        # Recent activity: project_id = ? ORDER BY updated_at DESC LIMIT 5
+        Index('idx_tasks_project_updated', project_id, updated_at.desc()),
+        # Upcoming deadlines per project
+        Index('idx_tasks_open_project_deadline', project_id, deadline,
+              postgresql_where=(status != 'done')),
+        # Tasks per assignee, optionally by status, and recently completed ones
+        Index('idx_tasks_assignee_status_updated', assigned_to, status, updated_at),
+        # Upcoming deadlines per assignee
+        Index('idx_tasks_open_assignee_deadline', assigned_to, deadline,
+              postgresql_where=(status != 'done')),
+        # With the assignee index, serves the assigned_to = ? OR created_by = ? visibility filter
+        Index('idx_tasks_created_by', created_by),
     )
     
     # Relationships
@@ -84,6 +92,10 @@ class GitHubToken(db.Model):
     refresh_token = db.Column(db.String(255))
     token_expires_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_github_tokens_user_id', 'user_id'),
+    )
 
     def __repr__(self):
         return f'<GitHubToken {self.id} for User {self.user_id}>'
@@ -96,6 +108,10 @@ class GitHubRepository(db.Model):
     repo_url = db.Column(db.String(255), nullable=False)
     github_id = db.Column(db.Integer)
     
+    __table_args__ = (
+        Index('idx_github_repositories_name', 'repo_name'),
+    )
+    
     # Relationships
     task_links = db.relationship('TaskGitHubLink', backref='repository', lazy=True)
 
@@ -110,11 +126,50 @@ class TaskGitHubLink(db.Model):
     repo_id = db.Column(db.Integer, db.ForeignKey('github_repositories.id'), nullable=False)
     issue_number = db.Column(db.Integer)
     pull_request_number = db.Column(db.Integer)
+    # Issue/PR state mirrored from GitHub webhooks (open, closed, merged)
+    issue_state = db.Column(db.String(20))
+    pull_request_state = db.Column(db.String(20))
+    github_updated_at = db.Column(db.DateTime)
+    # Delivery of the DevSync backlink comment (pending, posted, failed)
+    comment_status = db.Column(db.String(20))
+    comment_id = db.Column(db.BigInteger)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_task_github_links_repo_id', 'repo_id'),
+        Index('idx_task_github_links_task_id', 'task_id'),
+    )
 
     def __repr__(self):
         return f'<TaskGitHubLink task:{self.task_id} repo:{self.repo_id}>'
 
+class GitHubJob(db.Model):
+    """Durable queue entry for an outbound GitHub write"""
+    __tablename__ = 'github_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)  # issue_comment
+    # Enqueueing the same key twice yields one job and at most one GitHub write
+    idempotency_key = db.Column(db.String(255), unique=True, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    link_id = db.Column(db.Integer, db.ForeignKey('task_github_links.id'))
+    payload = db.Column(db.Text, nullable=False)  # JSON arguments for the job
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, succeeded, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    locked_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_github_jobs_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f'<GitHubJob {self.id} {self.job_type} {self.status}>'
+
 class Comment(db.Model):
     __tablename__ = 'comments'
     
@@ -123,6 +178,12 @@ class Comment(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_comments_created_at', 'created_at'),
+        Index('idx_comments_task_id', 'task_id'),
+        Index('idx_comments_user_id', 'user_id'),
+    )
 
     def __repr__(self):
         return f'<Comment {self.id} on Task {self.task_id}>'
@@ -0,0 +1,35 @@
+"""
+Session that sends read-only requests to a database replica.
+
+When a 'replica' bind is configured and the current request has been marked
+for replica reads (see api/middlewares/read_replica.py), queries against the
+default bind run on the replica. Flushes and INSERT/UPDATE/DELETE statements
+always go to the primary, and mark the request as having written so the
+client can be kept on the primary until the replica has caught up.
+"""
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+REPLICA_BIND_KEY = 'replica'
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session routing reads between the primary and a replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or not has_request_context():
+            return engine
+
+        engines = self._db.engines
+        if engine is not engines.get(None):
+            # Models with their own bind key are never routed
+            return engine
+
+        if self._flushing or isinstance(clause, UpdateBase):
+            g.db_wrote_primary = True
+            return engine
+
+        if g.get('db_use_replica'):
+            return engines.get(REPLICA_BIND_KEY, engine)
+        return engine
@@ -0,0 +1,73 @@
+"""
+Idempotent table and column additions for databases created by an earlier release.
+
+setup_database only runs create_all() against an empty database, so tables
+and columns added to the models afterwards never reach a deployed one.
+SchemaManager compares the declared tables and columns with those in the
+database, creates the missing tables and adds the missing columns with
+ALTER TABLE ... ADD COLUMN. Only additive changes are made: a column that
+is NOT NULL without a server default cannot be added to a populated table
+and is reported instead, and nothing is ever dropped or altered.
+"""
+import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+logger = logging.getLogger(__name__)
+
+class SchemaManager:
+    """Adds the declared tables and columns that a database lacks"""
+
+    def __init__(self, metadata):
+        self.metadata = metadata
+
+    def missing_tables(self, conn):
+        """Declared tables that the database lacks, in dependency order"""
+        tables = set(inspect(conn).get_table_names())
+        return [table for table in self.metadata.sorted_tables if table.name not in tables]
+
+    def missing_columns(self, conn):
+        """Declared columns of existing tables that the database lacks"""
+        inspector = inspect(conn)
+        tables = set(inspector.get_table_names())
+        missing = []
+        for table in self.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            missing.extend(column for column in table.columns if column.name not in existing)
+        return missing
+
+    def add_column_statement(self, column, conn):
+        preparer = conn.dialect.identifier_preparer
+        definition = str(CreateColumn(column).compile(dialect=conn.dialect)).strip()
+        return f"ALTER TABLE {preparer.format_table(column.table)} ADD COLUMN {definition}"
+
+    def sync(self, engine):
+        """
+        Create the missing tables and add the missing columns, returning
+        their names as table or table.column.
+
+        A column that cannot be added is logged and skipped.
+        """
+        added = []
+        with engine.begin() as conn:
+            tables = self.missing_tables(conn)
+            if tables:
+                self.metadata.create_all(conn, tables=tables)
+                for table in tables:
+                    logger.info(f"Created table {table.name}")
+                added.extend(table.name for table in tables)
+
+            for column in self.missing_columns(conn):
+                name = f"{column.table.name}.{column.name}"
+                if not column.nullable and column.server_default is None:
+                    logger.error(f"Cannot add column {name}: it is NOT NULL without a server default")
+                    continue
+                conn.execute(text(self.add_column_statement(column, conn)))
+                logger.info(f"Added column {name}")
+                added.append(name)
+
+        if not added:
+            logger.info("All declared tables and columns exist")
+        return added
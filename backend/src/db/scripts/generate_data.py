@@ -0,0 +1,406 @@
+"""
+Synthetic data generator for load and performance testing.
+
+Bulk-loads users, projects and memberships, tasks, comments, notifications
+and GitHub repositories, tokens and task links in chunks, using COPY on
+PostgreSQL and executemany elsewhere. The same seed and reference date
+always produce the same data. Declared indices are dropped before loading
+and rebuilt afterwards, so millions of rows load at COPY speed.
+
+Every user shares one known password, and user N logs in as
+userN@example.com; the lowest ids are admins.
+
+Usage:
+    python generate_data.py --users 1000 --projects 200 --tasks 50000
+    python generate_data.py --tasks 1000000 --seed 7 --reset
+    python generate_data.py --database-url sqlite:////tmp/devsync_load.db --reset
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import logging
+import random
+import time
+from array import array
+from bisect import bisect
+from datetime import date, datetime, timedelta
+from itertools import accumulate, islice
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from flask import Flask
+from sqlalchemy import func, select, text
+from src.config.config import get_config
+from src.auth.helpers import _hash
+from src.db.models import db
+from src.db.models.models import (
+    User, Project, Task, Comment, Notification, GitHubToken, GitHubRepository, TaskGitHubLink, project_members
+)
+from src.db.index_manager import IndexManager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PASSWORD = 'DevSync-Load-Test-1!'
+
+FIRST_NAMES = ['Ada', 'Alan', 'Barbara', 'Claude', 'Dennis', 'Edsger', 'Frances', 'Grace', 'Guido', 'Hedy',
+               'Ivan', 'John', 'Ken', 'Linus', 'Margaret', 'Niklaus', 'Radia', 'Shafi', 'Tim', 'Yukihiro']
+LAST_NAMES = ['Allen', 'Backus', 'Cerf', 'Dijkstra', 'Engelbart', 'Floyd', 'Goldwasser', 'Hamilton', 'Hopper',
+              'Kay', 'Knuth', 'Lamport', 'Liskov', 'McCarthy', 'Perlman', 'Ritchie', 'Thompson', 'Torvalds']
+TASK_VERBS = ['Implement', 'Fix', 'Refactor', 'Document', 'Test', 'Review', 'Design', 'Migrate', 'Optimise']
+TASK_SUBJECTS = ['login flow', 'dashboard widgets', 'task board', 'notification feed', 'GitHub sync',
+                 'comment threads', 'project settings', 'search', 'rate limiting', 'export to CSV']
+
+# Weighted distributions, as (value, weight)
+PROJECT_STATUSES = [('active', 80), ('completed', 15), ('archived', 5)]
+TASK_STATUSES = [('done', 50), ('todo', 20), ('in_progress', 20), ('review', 10)]
+NOTIFICATION_TYPES = [('task_assigned', 35), ('task_updated', 30), ('comment_added', 25), ('user_mentioned', 10)]
+GITHUB_STATES = [('open', 40), ('closed', 40), ('merged', 20)]
+
+def weighted(choices):
+    """Values and cumulative weights for rng.choices"""
+    return [value for value, _ in choices], list(accumulate(weight for _, weight in choices))
+
+class BulkWriter:
+    """Writes rows to a table in chunks, with COPY on PostgreSQL and executemany elsewhere"""
+
+    def __init__(self, conn, chunk_size=10000):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.copy = conn.dialect.name == 'postgresql'
+
+    def write(self, table, rows):
+        """Write an iterable of row dicts, returning how many were written"""
+        columns = [column.name for column in table.columns]
+        rows = iter(rows)
+        written = 0
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            if self.copy:
+                self._copy(table, columns, chunk)
+            else:
+                self.conn.execute(table.insert(), chunk)
+            self.conn.commit()
+            written += len(chunk)
+        logger.info(f"Wrote {written} rows to {table.name}")
+        return written
+
+    def _copy(self, table, columns, chunk):
+        buffer = io.StringIO()
+        # csv writes None as an empty string, so NULLs get an explicit marker
+        writer = csv.writer(buffer)
+        for row in chunk:
+            writer.writerow(['\\N' if row.get(column) is None else row[column] for column in columns])
+        buffer.seek(0)
+        cursor = self.conn.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+class DataGenerator:
+    """Deterministic synthetic DevSync data at a chosen scale"""
+
+    def __init__(self, users=1000, projects=200, tasks=50000, comments_per_task=2.0,
+                 notifications_per_user=20, github_ratio=0.3, seed=42, reference_date=None,
+                 password=DEFAULT_PASSWORD, bcrypt_rounds=12):
+        self.users = users
+        self.projects = projects
+        self.tasks = tasks
+        self.comments_per_task = comments_per_task
+        self.notifications_per_user = notifications_per_user
+        self.github_ratio = github_ratio
+        self.seed = seed
+        reference_date = reference_date or date.today()
+        self.now = datetime(reference_date.year, reference_date.month, reference_date.day, 12)
+        self.password = password
+        self.bcrypt_rounds = bcrypt_rounds
+        self.admins = max(1, users // 50)
+        # Filled in while generating, so later tables can refer to earlier rows
+        self.members = {}
+        self.task_projects = array('I')
+        self.github_projects = {}
+
+    def rng(self, table):
+        """Independent random stream per table, so changing one count leaves the others alone"""
+        return random.Random(f"{self.seed}:{table}")
+
+    def _timestamp(self, rng, max_days_ago):
+        return self.now - timedelta(seconds=rng.randint(0, max_days_ago * 86400))
+
+    def user_rows(self):
+        rng = self.rng('users')
+        # Hashing once keeps millions of users cheap; the cost matches BCRYPT_ROUNDS so logins never rehash
+        password_hash = _hash(self.password, self.bcrypt_rounds)
+        for user_id in range(1, self.users + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield {
+                'id': user_id,
+                'name': f'{first} {last}',
+                'email': f'user{user_id}@example.com',
+                'password': password_hash,
+                'role': 'admin' if user_id <= self.admins else 'client',
+                'github_username': f'{first.lower()}-{last.lower()}-{user_id}' if rng.random() < 0.4 else None,
+                'created_at': self._timestamp(rng, 730)
+            }
+
+    def project_rows(self):
+        rng = self.rng('projects')
+        statuses, weights = weighted(PROJECT_STATUSES)
+        for project_id in range(1, self.projects + 1):
+            has_repo = rng.random() < self.github_ratio
+            created_at = self._timestamp(rng, 540)
+            yield {
+                'id': project_id,
+                'name': f'Project {project_id}',
+                'description': f'Synthetic project {project_id}',
+                'status': rng.choices(statuses, cum_weights=weights)[0],
+                'github_repo': f'https://github.com/devsync-load/project-{project_id}' if has_repo else None,
+                'created_by': rng.randint(1, self.admins),
+                'created_at': created_at,
+                'updated_at': created_at + timedelta(days=rng.randint(0, 30))
+            }
+            if has_repo:
+                self.github_projects[project_id] = len(self.github_projects) + 1
+
+    def membership_rows(self):
+        rng = self.rng('project_members')
+        for project_id in range(1, self.projects + 1):
+            size = min(self.users, rng.randint(3, 12))
+            members = sorted(rng.sample(range(1, self.users + 1), size))
+            self.members[project_id] = members
+            for user_id in members:
+                yield {'project_id': project_id, 'user_id': user_id}
+
+    def task_rows(self):
+        rng = self.rng('tasks')
+        statuses, weights = weighted(TASK_STATUSES)
+        # A few large projects and a long tail of small ones
+        project_weights = list(accumulate(1 / rank for rank in range(1, self.projects + 1)))
+        project_order = list(range(1, self.projects + 1))
+        rng.shuffle(project_order)
+
+        for task_id in range(1, self.tasks + 1):
+            project_id = project_order[bisect(project_weights, rng.random() * project_weights[-1])]
+            self.task_projects.append(project_id)
+            status = rng.choices(statuses, cum_weights=weights)[0]
+            created_at = self._timestamp(rng, 365)
+            updated_at = min(self.now, created_at + timedelta(hours=rng.randint(0, 24 * 60)))
+            if status == 'done':
+                deadline = created_at + timedelta(days=rng.randint(1, 45))
+            else:
+                # Open work is mostly due soon, with some already overdue
+                deadline = self.now + timedelta(hours=int(rng.gauss(24 * 10, 24 * 14)))
+            progress = {'done': 100, 'todo': 0, 'review': rng.randint(80, 100)}.get(status, rng.randint(10, 90))
+            yield {
+                'id': task_id,
+                'title': f'{rng.choice(TASK_VERBS)} {rng.choice(TASK_SUBJECTS)} #{task_id}',
+                'description': f'Synthetic task {task_id}',
+                'status': status,
+                'progress': progress,
+                'assigned_to': rng.choice(self.members[project_id]) if rng.random() < 0.9 else None,
+                'created_by': rng.choice(self.members[project_id]),
+                'deadline': deadline,
+                'created_at': created_at,
+                'updated_at': updated_at,
+                'project_id': project_id
+            }
+
+    def comment_rows(self):
+        rng = self.rng('comments')
+        for comment_id in range(1, int(self.tasks * self.comments_per_task) + 1):
+            task_id = rng.randint(1, self.tasks)
+            yield {
+                'id': comment_id,
+                'task_id': task_id,
+                'user_id': rng.choice(self.members[self.task_projects[task_id - 1]]),
+                'content': f'Synthetic comment {comment_id}',
+                'created_at': self._timestamp(rng, 180)
+            }
+
+    def notification_rows(self):
+        rng = self.rng('notifications')
+        types, weights = weighted(NOTIFICATION_TYPES)
+        for notification_id in range(1, int(self.users * self.notifications_per_user) + 1):
+            task_id = rng.randint(1, self.tasks) if self.tasks else None
+            created_at = self._timestamp(rng, 60)
+            is_read = rng.random() < 0.7
+            yield {
+                'id': notification_id,
+                'user_id': rng.randint(1, self.users),
+                'notification_type': rng.choices(types, cum_weights=weights)[0],
+                'title': 'Task update',
+                'message': f'Synthetic notification {notification_id}',
+                'reference_id': str(task_id) if task_id else None,
+                'is_read': is_read,
+                'created_at': created_at,
+                'read_at': created_at + timedelta(minutes=rng.randint(1, 600)) if is_read else None,
+                'task_id': task_id
+            }
+
+    def repository_rows(self):
+        for project_id, repo_id in self.github_projects.items():
+            yield {
+                'id': repo_id,
+                'repo_name': f'devsync-load/project-{project_id}',
+                'repo_url': f'https://github.com/devsync-load/project-{project_id}',
+                'github_id': 100000 + repo_id
+            }
+
+    def token_rows(self):
+        rng = self.rng('github_tokens')
+        token_id = 0
+        for user_id in range(1, self.users + 1):
+            if rng.random() < 0.4:
+                token_id += 1
+                yield {
+                    'id': token_id,
+                    'user_id': user_id,
+                    'access_token': f'gho_synthetic_{user_id:08d}',
+                    'refresh_token': None,
+                    'token_expires_at': None,
+                    'created_at': self._timestamp(rng, 365)
+                }
+
+    def link_rows(self):
+        rng = self.rng('task_github_links')
+        states, weights = weighted(GITHUB_STATES)
+        link_id = 0
+        for task_id, project_id in enumerate(self.task_projects, start=1):
+            repo_id = self.github_projects.get(project_id)
+            if repo_id is None or rng.random() >= 0.2:
+                continue
+            link_id += 1
+            is_pull = rng.random() < 0.5
+            yield {
+                'id': link_id,
+                'task_id': task_id,
+                'repo_id': repo_id,
+                'issue_number': None if is_pull else rng.randint(1, 5000),
+                'pull_request_number': rng.randint(1, 5000) if is_pull else None,
+                'issue_state': None if is_pull else rng.choices(states, cum_weights=weights)[0],
+                'pull_request_state': rng.choices(states, cum_weights=weights)[0] if is_pull else None,
+                'github_updated_at': self._timestamp(rng, 90),
+                'comment_status': 'posted',
+                'comment_id': None,
+                'created_at': self._timestamp(rng, 180)
+            }
+
+    def generate(self, engine, chunk_size=10000):
+        """Load every table in foreign key order, returning the row count of each"""
+        plan = [
+            (User.__table__, self.user_rows),
+            (Project.__table__, self.project_rows),
+            (project_members, self.membership_rows),
+            (Task.__table__, self.task_rows),
+            (Comment.__table__, self.comment_rows),
+            (Notification.__table__, self.notification_rows),
+            (GitHubRepository.__table__, self.repository_rows),
+            (GitHubToken.__table__, self.token_rows),
+            (TaskGitHubLink.__table__, self.link_rows),
+        ]
+        counts = {}
+        with engine.connect() as conn:
+            writer = BulkWriter(conn, chunk_size)
+            for table, rows in plan:
+                started = time.perf_counter()
+                counts[table.name] = writer.write(table, rows())
+                logger.info(f"{table.name}: {time.perf_counter() - started:.1f}s")
+        return counts
+
+def drop_declared_indices(engine):
+    """Drop the declared indices so rows load without index maintenance"""
+    with engine.begin() as conn:
+        for name in IndexManager(db.metadata).declared():
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+def reset_sequences(engine, tables):
+    """Move PostgreSQL id sequences past the explicitly inserted ids"""
+    if engine.dialect.name != 'postgresql':
+        return
+    with engine.begin() as conn:
+        for table in tables:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+            ))
+
+def generate_data(args):
+    """Create the schema if needed, load the synthetic data and rebuild indices"""
+    try:
+        app = Flask(__name__)
+        app.config.from_object(get_config())
+        if args.database_url:
+            app.config['SQLALCHEMY_DATABASE_URI'] = args.database_url
+        db.init_app(app)
+
+        with app.app_context():
+            if args.reset:
+                logger.info("Dropping existing tables...")
+                db.drop_all()
+            db.create_all()
+
+            with db.engine.connect() as conn:
+                if conn.execute(select(func.count()).select_from(User.__table__)).scalar():
+                    logger.error("Database already holds users; rerun with --reset to replace them")
+                    return False
+
+            drop_declared_indices(db.engine)
+            generator = DataGenerator(
+                users=args.users,
+                projects=args.projects,
+                tasks=args.tasks,
+                comments_per_task=args.comments_per_task,
+                notifications_per_user=args.notifications_per_user,
+                github_ratio=args.github_ratio,
+                seed=args.seed,
+                reference_date=args.reference_date,
+                password=args.password,
+                bcrypt_rounds=args.bcrypt_rounds or app.config.get('BCRYPT_ROUNDS', 12)
+            )
+            started = time.perf_counter()
+            counts = generator.generate(db.engine, chunk_size=args.chunk_size)
+            reset_sequences(db.engine, [table for table in counts if table != 'project_members'])
+
+            logger.info("Rebuilding indices...")
+            IndexManager(db.metadata).sync(db.engine)
+            with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                conn.execute(text("ANALYZE"))
+
+            logger.info(f"Generated {sum(counts.values())} rows in {time.perf_counter() - started:.1f}s")
+            logger.info(f"Log in as user1@example.com (admin) to user{args.users}@example.com "
+                        f"with password {args.password!r}")
+        return True
+    except Exception as e:
+        logger.error(f"Error generating data: {e}")
+        return False
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-generate synthetic DevSync data")
+    parser.add_argument('--database-url', help="database to fill (default: DATABASE_URL)")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--tasks', type=int, default=50000)
+    parser.add_argument('--comments-per-task', type=float, default=2.0)
+    parser.add_argument('--notifications-per-user', type=float, default=20)
+    parser.add_argument('--github-ratio', type=float, default=0.3, help="share of projects with a GitHub repository")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reference-date', type=date.fromisoformat,
+                        help="date deadlines and timestamps are relative to, YYYY-MM-DD (default: today)")
+    parser.add_argument('--password', default=DEFAULT_PASSWORD, help="password shared by every user")
+    parser.add_argument('--bcrypt-rounds', type=int, help="cost of the shared hash (default: BCRYPT_ROUNDS)")
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--reset', action='store_true', help="drop and recreate all tables first")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    if not generate_data(parse_args()):
+        sys.exit(1)
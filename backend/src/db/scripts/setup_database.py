@@ -1,6 +1,12 @@
 """
-Database setup script with comprehensive index creation and error handling.
+Database setup script with online index management and error handling.
+
+Usage:
+    python setup_database.py                          # create tables, missing columns and indices
+    python setup_database.py --report                 # also report index sizes and usage
+    python setup_database.py --drop-unused [--dry-run]  # also drop unscanned undeclared indices
 """
+import argparse
 import os
 import sys
 import logging
@@ -13,30 +19,15 @@ from flask import Flask
 from src.config.config import get_config
 from src.db.models import db
 from src.db.models.models import *
+from src.db.index_manager import IndexManager
+from src.db.schema_manager import SchemaManager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_index_safely(conn, index_name, table, columns):
-    """Create an index with proper error handling"""
-    try:
-        # Format columns for the SQL statement
-        col_str = ", ".join(columns) if isinstance(columns, list) else columns
-        
-        # First drop the index if it exists
-        conn.execute(text(f"DROP INDEX IF EXISTS {index_name};"))
-        
-        # Create index
-        conn.execute(text(f"CREATE INDEX {index_name} ON {table} ({col_str});"))
-        logger.info(f"Created index {index_name} on {table}({col_str})")
-        return True
-    except Exception as e:
-        logger.error(f"Error creating index {index_name}: {e}")
-        return False
-
 def setup_database():
-    """Create all database tables and indices in one go"""
+    """Create all database tables, missing columns and indices in one go"""
     try:
         # Create a Flask app context
         app = Flask(__name__)
@@ -55,81 +46,16 @@ def setup_database():
             else:
                 logger.info(f"Existing tables found: {', '.join(tables)}")
             
-            # Initialize read_column to None before the conditional block
-            read_column = None
+            # Add the tables and columns that models gained after the tables were created
+            added = SchemaManager(db.metadata).sync(db.engine)
+            logger.info(f"Added {len(added)} tables and columns")
+            
+            # Create only the declared indexes that are missing, without locking writes
+            index_manager = IndexManager(db.metadata)
+            created = index_manager.sync(db.engine)
+            logger.info(f"Created {len(created)} indices")
             
-            # Create indices manually - drop and recreate all indices
             with db.engine.connect() as conn:
-                # Check Notification table structure
-                if 'notifications' in tables:
-                    columns = [col['name'] for col in inspector.get_columns('notifications')]
-                    logger.info(f"Notification table columns: {columns}")
-                    
-                    # Check read vs is_read column
-                    read_column = 'is_read' if 'is_read' in columns else ('read' if 'read' in columns else None)
-                    if read_column:
-                        logger.info(f"Using '{read_column}' column for notification read status")
-                    else:
-                        logger.warning("Neither 'read' nor 'is_read' column exists in notifications table")
-                
-                # Explicitly commit before creating indices
-                conn.commit()
-                
-                # Create indices for each table
-                indices_created = 0
-                
-                # Users indices
-                if create_index_safely(conn, "idx_users_email", "users", "email"):
-                    indices_created += 1
-                if create_index_safely(conn, "idx_users_role", "users", "role"):
-                    indices_created += 1
-                
-                # Tasks indices
-                task_indices = [
-                    ("idx_tasks_assigned_to", "assigned_to"),
-                    ("idx_tasks_created_at", "created_at"),
-                    ("idx_tasks_created_by", "created_by"),
-                    ("idx_tasks_deadline", "deadline"),
-                    ("idx_tasks_deadline_status", ["deadline", "status"]),
-                    ("idx_tasks_progress", "progress"),
-                    ("idx_tasks_status", "status"),
-                    ("idx_tasks_status_assigned", ["status", "assigned_to"]),
-                    ("idx_tasks_updated_at", "updated_at")
-                ]
-                for idx_name, columns in task_indices:
-                    if create_index_safely(conn, idx_name, "tasks", columns):
-                        indices_created += 1
-                
-                # Notifications indices
-                if create_index_safely(conn, "idx_notifications_created_at", "notifications", "created_at"):
-                    indices_created += 1
-                if read_column and create_index_safely(conn, f"idx_notifications_{read_column}", "notifications", read_column):
-                    indices_created += 1
-                if create_index_safely(conn, "idx_notifications_task_id", "notifications", "task_id"):
-                    indices_created += 1
-                if create_index_safely(conn, "idx_notifications_user_id", "notifications", "user_id"):
-                    indices_created += 1
-                
-                # Comments indices
-                comment_indices = [
-                    ("idx_comments_created_at", "created_at"),
-                    ("idx_comments_task_id", "task_id"),
-                    ("idx_comments_user_id", "user_id")
-                ]
-                for idx_name, columns in comment_indices:
-                    if create_index_safely(conn, idx_name, "comments", columns):
-                        indices_created += 1
-                
-                # Other tables indices
-                if create_index_safely(conn, "idx_github_repositories_name", "github_repositories", "repo_name"):
-                    indices_created += 1
-                if create_index_safely(conn, "idx_github_tokens_user_id", "github_tokens", "user_id"):
-                    indices_created += 1
-                if create_index_safely(conn, "idx_task_github_links_repo_id", "task_github_links", "repo_id"):
-                    indices_created += 1
-                if create_index_safely(conn, "idx_task_github_links_task_id", "task_github_links", "task_id"):
-                    indices_created += 1
-                
                 # Add unique constraint for github_repositories with proper error handling
                 try:
                     # First check if it already exists
@@ -167,7 +93,6 @@ def setup_database():
                 
                 # Commit all changes
                 conn.commit()
-                logger.info(f"Created {indices_created} indices successfully")
             
             logger.info("Database setup completed")
             return True
@@ -176,66 +101,61 @@ def setup_database():
         logger.error(f"Error setting up database: {e}")
         return False
 
-def verify_database_indices():
-    """More reliable database indices verification using direct SQL query"""
+def verify_database_indices(report=False):
+    """Compare the database's indices with the declared ones, optionally reporting their usage"""
     try:
         app = Flask(__name__)
         app.config.from_object(get_config())
         db.init_app(app)
         
         with app.app_context():
-            # Check which tables exist
-            inspector = inspect(db.engine)
-            tables = inspector.get_table_names()
-            logger.info(f"Found tables: {', '.join(tables)}")
-            
-            # Use direct SQL to check indices which is more reliable
+            index_manager = IndexManager(db.metadata)
             with db.engine.connect() as conn:
-                result = conn.execute(text("""
-                    SELECT
-                        t.relname AS table_name,
-                        i.relname AS index_name
-                    FROM
-                        pg_class t,
-                        pg_class i,
-                        pg_index ix
-                    WHERE
-                        t.oid = ix.indrelid
-                        AND i.oid = ix.indexrelid
-                        AND t.relkind = 'r'
-                        AND t.relname NOT LIKE 'pg_%'
-                        AND t.relname NOT LIKE 'sql_%'
-                    ORDER BY
-                        t.relname,
-                        i.relname;
-                """))
-                
-                # Group indices by table
-                indices_by_table = {}
-                for row in result:
-                    table = row[0]  # table name
-                    index = row[1]  # index name
-                    
-                    if table not in indices_by_table:
-                        indices_by_table[table] = []
-                    
-                    indices_by_table[table].append(index)
-                
-                # Print indices by table
-                for table in sorted(indices_by_table.keys()):
-                    logger.info(f"Indices for {table}: {indices_by_table[table]}")
+                plan = index_manager.diff(conn)
+                for name in plan['missing']:
+                    logger.warning(f"Declared index {name} is missing")
+                for name in plan['invalid']:
+                    logger.warning(f"Index {name} is invalid and will be rebuilt")
+                for name in plan['undeclared']:
+                    logger.info(f"Index {name} is not declared on any model")
                 
-                # Check for tables without indices
-                for table in tables:
-                    if table not in indices_by_table and table not in ['alembic_version', 'project_members']:
-                        logger.warning(f"No indices found for {table}")
+                if report:
+                    for row in index_manager.usage(conn):
+                        logger.info(
+                            f"{row['table_name']}.{row['index_name']}: {row['size']}, "
+                            f"{row['idx_scan']} scans, {row['idx_tup_read']} tuples read"
+                            f"{'' if row['declared'] else ' (undeclared)'}"
+                        )
         
-        return True
+        return not plan['missing'] and not plan['invalid']
     except Exception as e:
         logger.error(f"Error verifying database: {e}")
         return False
 
+def drop_unused_indices(dry_run=False):
+    """Drop undeclared indices that have never been scanned"""
+    try:
+        app = Flask(__name__)
+        app.config.from_object(get_config())
+        db.init_app(app)
+        
+        with app.app_context():
+            dropped = IndexManager(db.metadata).drop_unused(db.engine, dry_run=dry_run)
+            logger.info(f"{'Would drop' if dry_run else 'Dropped'} {len(dropped)} unused indices: {', '.join(dropped) or 'none'}")
+        return True
+    except Exception as e:
+        logger.error(f"Error dropping unused indices: {e}")
+        return False
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create tables and missing indices")
+    parser.add_argument('--report', action='store_true', help="report index sizes and usage from pg_stat_user_indexes")
+    parser.add_argument('--drop-unused', action='store_true', help="drop undeclared indices that have never been scanned")
+    parser.add_argument('--dry-run', action='store_true', help="with --drop-unused, only list what would be dropped")
+    args = parser.parse_args()
+    
     if setup_database():
         logger.info("Database setup completed successfully!")
-        verify_database_indices()
\ No newline at end of file
+        if args.drop_unused:
+            drop_unused_indices(dry_run=args.dry_run)
+        verify_database_indices(report=args.report)
@@ -0,0 +1,185 @@
+"""
+Circuit breaker and bulkhead for outbound calls to external dependencies.
+
+The breaker tracks the outcome of recent calls and stops sending traffic to a
+dependency that is failing or too slow, so callers fail fast instead of tying
+up worker threads. The bulkhead caps how many calls to the dependency may be
+in flight at once, so a slow dependency cannot occupy every worker thread.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+class DependencyUnavailableError(Exception):
+    """Raised when a call is refused because its dependency is unhealthy or saturated"""
+    def __init__(self, dependency, reason, retry_after=None):
+        super().__init__(f"{dependency} is unavailable: {reason}")
+        self.dependency = dependency
+        self.reason = reason
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker over a rolling window of calls.
+
+    A call counts as failed if it raised, returned a server error, or took
+    longer than slow_call_threshold seconds. Once at least minimum_calls are
+    in the window and the failed share reaches failure_rate_threshold, the
+    circuit opens for open_seconds. It then lets half_open_max_calls trial
+    calls through: if they all succeed the circuit closes, otherwise it opens
+    again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_rate_threshold=0.5, slow_call_threshold=5.0, window_size=20,
+                 minimum_calls=10, open_seconds=30.0, half_open_max_calls=1, clock=time.monotonic):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._trial_calls = 0
+        self._trial_successes = 0
+        self._times_opened = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        # An open circuit becomes half-open once its cool-down has elapsed
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state):
+        logger.warning(f"Circuit '{self.name}' {self._state} -> {state}")
+        self._state = state
+        self._trial_calls = 0
+        self._trial_successes = 0
+        if state == self.OPEN:
+            self._opened_at = self._clock()
+            self._times_opened += 1
+        elif state == self.CLOSED:
+            self._outcomes.clear()
+
+    def retry_after(self):
+        """Seconds until an open circuit will admit a trial call"""
+        with self._lock:
+            if self._current_state() != self.OPEN:
+                return 0
+            return max(0.0, self.open_seconds - (self._clock() - self._opened_at))
+
+    def allow_request(self):
+        """Whether a call may go ahead. Every permitted call must be recorded."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                return True
+            return False
+
+    def record_success(self, duration=0.0):
+        if duration > self.slow_call_threshold:
+            self.record_failure(duration)
+            return
+
+        with self._lock:
+            if self._current_state() == self.HALF_OPEN:
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_max_calls:
+                    self._transition(self.CLOSED)
+                return
+            self._outcomes.append(True)
+
+    def record_failure(self, duration=0.0):
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN:
+                self._transition(self.OPEN)
+                return
+            if state == self.OPEN:
+                return
+
+            self._outcomes.append(False)
+            calls = len(self._outcomes)
+            failures = calls - sum(self._outcomes)
+            if calls >= self.minimum_calls and failures / calls >= self.failure_rate_threshold:
+                self._transition(self.OPEN)
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._outcomes.clear()
+            self._opened_at = None
+            self._trial_calls = 0
+            self._trial_successes = 0
+
+    def snapshot(self):
+        """Current breaker state for health reporting"""
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._outcomes)
+            failures = calls - sum(self._outcomes)
+            return {
+                'state': state,
+                'window_calls': calls,
+                'window_failures': failures,
+                'failure_rate': round(failures / calls, 3) if calls else 0.0,
+                'times_opened': self._times_opened,
+                'retry_after': round(max(0.0, self.open_seconds - (self._clock() - self._opened_at)), 1)
+                if state == self.OPEN else 0
+            }
+
+class Bulkhead:
+    """Bounded pool of concurrent calls to a dependency"""
+
+    def __init__(self, name, max_concurrent=10, max_wait=0.5):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._rejected = 0
+
+    @contextmanager
+    def acquire(self):
+        """Hold a slot for the duration of a call, or raise if none frees up within max_wait"""
+        if not self._semaphore.acquire(timeout=self.max_wait):
+            with self._lock:
+                self._rejected += 1
+            raise DependencyUnavailableError(self.name, 'too many concurrent requests', retry_after=1)
+
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._semaphore.release()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'in_use': self._in_use,
+                'rejected': self._rejected
+            }
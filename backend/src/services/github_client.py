@@ -8,24 +8,63 @@ import time
 import json
 import base64
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from urllib.parse import urlparse, parse_qs
 from flask import current_app, g, request, redirect
 
+from .circuit_breaker import CircuitBreaker, Bulkhead, DependencyUnavailableError
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class PageFetchError(Exception):
+    """Raised by iter_pages when a page of a listing could not be fetched"""
+    def __init__(self, page, reason):
+        super().__init__(f"GitHub page {page} could not be fetched: {reason}")
+        self.page = page
+        self.reason = reason
+
+class TruncatedListing:
+    """Yielded last by iter_pages when max_pages stopped it before GitHub's last page"""
+    def __init__(self, pages, last_page):
+        self.pages = pages
+        self.last_page = last_page
+
 class GitHubClient:
     """Client for the GitHub API with rate limit handling"""
     
     BASE_API_URL = "https://api.github.com"
+    GRAPHQL_URL = "https://api.github.com/graphql"
     AUTH_URL = "https://github.com/login/oauth/authorize"
     TOKEN_URL = "https://github.com/login/oauth/access_token"
     
+    # GitHub limits how many nodes a single GraphQL query may resolve
+    GRAPHQL_BATCH_SIZE = 100
+    
+    # Fields resolved for every issue or pull request in a status query
+    LINK_STATUS_FRAGMENT = """
+fragment LinkStatus on IssueOrPullRequest {
+  __typename
+  ... on Issue { number title state url }
+  ... on PullRequest {
+    number title state merged url
+    commits(last: 1) { nodes { commit { statusCheckRollup { state } } } }
+  }
+}"""
+    
     # Cache storage
     _cache = {}
     _cache_expiry = {}
     
+    # Shared by every client so GitHub's health is tracked process-wide
+    breaker = CircuitBreaker('github')
+    bulkhead = Bulkhead('github')
+    # Seconds to wait for GitHub to connect or respond before failing the call
+    timeout = 10.0
+    
     def __init__(self, access_token=None):
         self.access_token = access_token
         self.remaining_rate_limit = None
@@ -118,7 +157,8 @@ class GitHubClient:
         
         logger.info("Making POST request to GitHub for token exchange...")
         try:
-            response = requests.post(
+            response = GitHubClient()._send(
+                'POST',
                 GitHubClient.TOKEN_URL,
                 data=data,
                 headers=headers
@@ -156,6 +196,51 @@ class GitHubClient:
             logger.error(f"Exception during token exchange request: {str(e)}")
             return None
     
+    @classmethod
+    def invalidate_cache(cls, url_fragment):
+        """Drop cached responses whose URL contains the given fragment"""
+        stale_keys = [key for key in list(cls._cache) if url_fragment in key]
+        for key in stale_keys:
+            cls._cache.pop(key, None)
+            cls._cache_expiry.pop(key, None)
+        return len(stale_keys)
+    
+    @classmethod
+    def configure_resilience(cls, config):
+        """Build the circuit breaker and bulkhead and set the request timeout from app config"""
+        cls.timeout = config.get('GITHUB_REQUEST_TIMEOUT', 10.0)
+        cls.breaker = CircuitBreaker(
+            'github',
+            failure_rate_threshold=config.get('GITHUB_BREAKER_FAILURE_RATE', 0.5),
+            slow_call_threshold=config.get('GITHUB_BREAKER_SLOW_CALL_SECONDS', 5.0),
+            window_size=config.get('GITHUB_BREAKER_WINDOW_SIZE', 20),
+            minimum_calls=config.get('GITHUB_BREAKER_MINIMUM_CALLS', 10),
+            open_seconds=config.get('GITHUB_BREAKER_OPEN_SECONDS', 30.0)
+        )
+        cls.bulkhead = Bulkhead(
+            'github',
+            max_concurrent=config.get('GITHUB_MAX_CONCURRENT_REQUESTS', 10),
+            max_wait=config.get('GITHUB_BULKHEAD_MAX_WAIT', 0.5)
+        )
+    
+    @classmethod
+    def configure_endpoints(cls, config):
+        """Point the client at the configured GitHub API and OAuth hosts"""
+        api_url = config.get('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+        oauth_url = config.get('GITHUB_OAUTH_URL', 'https://github.com/login/oauth').rstrip('/')
+        cls.BASE_API_URL = api_url
+        cls.GRAPHQL_URL = f"{api_url}/graphql"
+        cls.AUTH_URL = f"{oauth_url}/authorize"
+        cls.TOKEN_URL = f"{oauth_url}/access_token"
+    
+    @classmethod
+    def health(cls):
+        """Circuit breaker and bulkhead state for the health endpoint"""
+        return {
+            'circuit': cls.breaker.snapshot(),
+            'bulkhead': cls.bulkhead.snapshot()
+        }
+    
     def get_headers(self):
         """Get headers with authorization for API requests"""
         headers = {
@@ -204,11 +289,15 @@ class GitHubClient:
         # Generate cache key if caching is enabled
         cache_enabled = kwargs.pop('use_cache', True)
         cache_ttl = kwargs.pop('cache_ttl', 300)  # Default 5 minutes cache
+        # Return (data, last_page) parsed from the Link header instead of just data
+        include_last_page = kwargs.pop('include_last_page', False)
         
         if cache_enabled:
             # Create a cache key based on method, URL and params
             params = kwargs.get('params', {})
             cache_key = f"{method}:{url}:{json.dumps(params, sort_keys=True)}"
+            if include_last_page:
+                cache_key += ":pages"
             
             # Check if we have a cached response
             if cache_key in self._cache and datetime.now() < self._cache_expiry.get(cache_key, datetime.min):
@@ -225,12 +314,7 @@ class GitHubClient:
             retry_count += 1
             
             try:
-                response = requests.request(
-                    method,
-                    url,
-                    headers=self.get_headers(),
-                    **kwargs
-                )
+                response = self._send(method, url, **kwargs)
                 
                 # Handle rate limits
                 if self._handle_rate_limit(response):
@@ -241,6 +325,8 @@ class GitHubClient:
                 if cache_enabled and response.status_code == 200:
                     try:
                         result = response.json()
+                        if include_last_page:
+                            result = (result, self._parse_last_page(response.headers.get('Link')))
                         self._cache[cache_key] = result
                         self._cache_expiry[cache_key] = datetime.now() + timedelta(seconds=cache_ttl)
                         return result
@@ -248,7 +334,9 @@ class GitHubClient:
                         pass  # If parsing fails, just return the response normally
                 
                 # Return appropriate data based on status code
-                if response.status_code == 200:
+                if response.status_code in (200, 201):
+                    if include_last_page:
+                        return response.json(), self._parse_last_page(response.headers.get('Link'))
                     return response.json()
                 elif response.status_code == 204:  # No content
                     return True
@@ -256,6 +344,12 @@ class GitHubClient:
                     logger.error(f"GitHub API error: {response.status_code} - {response.text}")
                     return None
                     
+            except DependencyUnavailableError as e:
+                # GitHub is unhealthy or saturated: serve stale data if we have any, else fail fast
+                if cache_enabled and cache_key in self._cache:
+                    logger.warning(f"Serving stale GitHub response for {cache_key}: {e.reason}")
+                    return self._cache[cache_key]
+                raise
             except Exception as e:
                 logger.error(f"Request error: {str(e)}")
                 if retry_count <= max_retries:
@@ -267,6 +361,120 @@ class GitHubClient:
         
         return None  # Fallback return
     
+    def _send(self, method, url, **kwargs):
+        """
+        Send one request to GitHub through the circuit breaker and bulkhead.
+
+        Requests time out after GITHUB_REQUEST_TIMEOUT seconds unless a
+        timeout is passed; a timeout counts as a failure, like any other
+        error raised by requests.
+        """
+        headers = kwargs.pop('headers', None) or self.get_headers()
+        kwargs.setdefault('timeout', self.timeout)
+        breaker = self.breaker
+        if breaker.state == CircuitBreaker.OPEN:
+            raise DependencyUnavailableError('github', 'circuit open', retry_after=breaker.retry_after())
+        
+        with self.bulkhead.acquire():
+            if not breaker.allow_request():
+                raise DependencyUnavailableError('github', 'circuit open', retry_after=breaker.retry_after())
+            
+            start = time.monotonic()
+            try:
+                response = requests.request(method, url, headers=headers, **kwargs)
+            except Exception:
+                breaker.record_failure(time.monotonic() - start)
+                raise
+            
+            # Client errors mean GitHub is healthy; server errors and throttling mean it is not
+            duration = time.monotonic() - start
+            if response.status_code >= 500 or response.status_code == 429:
+                breaker.record_failure(duration)
+            else:
+                breaker.record_success(duration)
+            return response
+    
+    @staticmethod
+    def _parse_last_page(link_header):
+        """Extract the page number of the rel="last" link from a Link header"""
+        if not link_header:
+            return None
+        
+        for link in link_header.split(','):
+            segments = [segment.strip() for segment in link.split(';')]
+            if 'rel="last"' not in segments[1:]:
+                continue
+            
+            query = parse_qs(urlparse(segments[0].strip('<>')).query)
+            try:
+                return int(query['page'][0])
+            except (KeyError, IndexError, ValueError):
+                return None
+        
+        return None
+    
+    def iter_pages(self, url, params=None, max_in_flight=4, max_pages=50, cache_ttl=300, use_cache=True):
+        """
+        Yield each page of a paginated listing in order.
+        
+        The first page is fetched to learn the last page number from the Link
+        header; the remaining pages are fetched concurrently with at most
+        max_in_flight requests outstanding at any time.
+        
+        A page that cannot be fetched raises PageFetchError, or
+        DependencyUnavailableError when GitHub is unhealthy, so a partial
+        listing is never mistaken for a complete one. When max_pages stops
+        the listing early, a TruncatedListing is yielded after the last page.
+        """
+        params = dict(params or {})
+        
+        def fetch(page):
+            try:
+                result = self._make_request(
+                    'GET',
+                    url,
+                    params={**params, 'page': page},
+                    include_last_page=True,
+                    use_cache=use_cache,
+                    cache_ttl=cache_ttl
+                )
+            except DependencyUnavailableError:
+                raise
+            except Exception as e:
+                raise PageFetchError(page, str(e)) from e
+            if not isinstance(result, tuple):
+                raise PageFetchError(page, 'GitHub returned an error response')
+            return result
+        
+        first_page, last_page = fetch(1)
+        yield first_page or []
+        
+        if not last_page or last_page <= 1:
+            return
+        
+        fetched_pages = min(last_page, max_pages)
+        remaining = iter(range(2, fetched_pages + 1))
+        executor = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix='github-pages')
+        try:
+            in_flight = deque()
+            for page in remaining:
+                in_flight.append(executor.submit(fetch, page))
+                if len(in_flight) >= max_in_flight:
+                    break
+            
+            # Yield pages in order, topping up the window as each one completes
+            while in_flight:
+                items, _ = in_flight.popleft().result()
+                next_page = next(remaining, None)
+                if next_page is not None:
+                    in_flight.append(executor.submit(fetch, next_page))
+                yield items or []
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if fetched_pages < last_page:
+            yield TruncatedListing(fetched_pages, last_page)
+    
     def get_user_profile(self):
         """Get authenticated user's GitHub profile"""
         return self._make_request('GET', f"{self.BASE_API_URL}/user", use_cache=True, cache_ttl=300)
@@ -286,6 +494,19 @@ class GitHubClient:
             cache_ttl=300
         ) or []
     
+    def iter_user_repositories(self, per_page=100, max_in_flight=4, max_pages=50):
+        """Yield every page of the authenticated user's repositories"""
+        return self.iter_pages(
+            f"{self.BASE_API_URL}/user/repos",
+            params={
+                'per_page': per_page,
+                'sort': 'updated',
+                'affiliation': 'owner,collaborator,organization_member'
+            },
+            max_in_flight=max_in_flight,
+            max_pages=max_pages
+        )
+    
     def get_repository(self, owner, repo):
         """Get a specific repository by owner and name"""
         return self._make_request(
@@ -323,6 +544,127 @@ class GitHubClient:
             cache_ttl=300
         ) or []
     
+    def iter_repository_issues(self, owner, repo, state='open', per_page=100, max_in_flight=4, max_pages=50):
+        """Yield every page of issues for a repository"""
+        return self.iter_pages(
+            f"{self.BASE_API_URL}/repos/{owner}/{repo}/issues",
+            params={'state': state, 'per_page': per_page},
+            max_in_flight=max_in_flight,
+            max_pages=max_pages
+        )
+    
+    def iter_repository_pulls(self, owner, repo, state='open', per_page=100, max_in_flight=4, max_pages=50):
+        """Yield every page of pull requests for a repository"""
+        return self.iter_pages(
+            f"{self.BASE_API_URL}/repos/{owner}/{repo}/pulls",
+            params={'state': state, 'per_page': per_page},
+            max_in_flight=max_in_flight,
+            max_pages=max_pages
+        )
+    
+    @classmethod
+    def _build_status_query(cls, refs):
+        """
+        Build one aliased GraphQL query resolving every (owner, repo, number) ref.
+        
+        Returns the query and a mapping of repository alias to (owner, repo).
+        """
+        numbers_by_repo = OrderedDict()
+        for owner, repo, number in refs:
+            numbers_by_repo.setdefault((owner, repo), []).append(int(number))
+        
+        aliases = {}
+        selections = []
+        for index, ((owner, repo), numbers) in enumerate(numbers_by_repo.items()):
+            alias = f"r{index}"
+            aliases[alias] = (owner, repo)
+            fields = ' '.join(
+                f"n{number}: issueOrPullRequest(number: {number}) {{ ...LinkStatus }}"
+                for number in numbers
+            )
+            selections.append(f"{alias}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{ {fields} }}")
+        
+        query = "query {\n  " + "\n  ".join(selections) + "\n}\n" + cls.LINK_STATUS_FRAGMENT
+        return query, aliases
+    
+    @staticmethod
+    def _format_link_status(node):
+        """Flatten a LinkStatus GraphQL node"""
+        is_pull = node.get('__typename') == 'PullRequest'
+        checks = None
+        if is_pull:
+            commits = (node.get('commits') or {}).get('nodes') or []
+            rollup = ((commits[0].get('commit') or {}).get('statusCheckRollup') if commits else None) or {}
+            checks = rollup.get('state', '').lower() or None
+        
+        return {
+            'type': 'pull_request' if is_pull else 'issue',
+            'number': node.get('number'),
+            'title': node.get('title'),
+            'state': (node.get('state') or '').lower(),
+            'merged': bool(node.get('merged')) if is_pull else False,
+            'url': node.get('url'),
+            'checks': checks
+        }
+    
+    def get_issue_statuses(self, refs, batch_size=None):
+        """
+        Resolve state, title, merged flag and check status for many issues/PRs.
+        
+        Refs are (owner, repo, number) tuples; they are resolved with aliased
+        GraphQL queries of up to batch_size nodes each instead of one REST call
+        per ref. Returns a dict keyed by (owner, repo, number); refs GitHub could
+        not resolve are absent from the result.
+        """
+        batch_size = batch_size or self.GRAPHQL_BATCH_SIZE
+        unique_refs = list(dict.fromkeys((owner, repo, int(number)) for owner, repo, number in refs))
+        
+        statuses = {}
+        for start in range(0, len(unique_refs), batch_size):
+            query, aliases = self._build_status_query(unique_refs[start:start + batch_size])
+            response = self._make_request('POST', self.GRAPHQL_URL, json={'query': query}, use_cache=False)
+            if not isinstance(response, dict):
+                continue
+            
+            # Missing issues come back as null nodes plus NOT_FOUND errors
+            for error in response.get('errors') or []:
+                logger.warning(f"GitHub GraphQL error: {error.get('message')}")
+            
+            data = response.get('data') or {}
+            for alias, (owner, repo) in aliases.items():
+                for node in (data.get(alias) or {}).values():
+                    if node:
+                        statuses[(owner, repo, node['number'])] = self._format_link_status(node)
+        
+        return statuses
+    
+    def get_issue_comments(self, owner, repo, issue_number, since=None, per_page=100):
+        """Get comments on an issue or pull request, optionally only those updated since a datetime"""
+        params = {'per_page': per_page}
+        if since:
+            params['since'] = since.strftime('%Y-%m-%dT%H:%M:%SZ')
+        
+        return self._make_request(
+            'GET',
+            f"{self.BASE_API_URL}/repos/{owner}/{repo}/issues/{issue_number}/comments",
+            params=params,
+            use_cache=False
+        )
+    
+    def iter_issue_comments(self, owner, repo, issue_number, since=None, per_page=100, max_in_flight=4, max_pages=50):
+        """Yield every page of comments on an issue or pull request, bypassing the cache"""
+        params = {'per_page': per_page}
+        if since:
+            params['since'] = since.strftime('%Y-%m-%dT%H:%M:%SZ')
+        
+        return self.iter_pages(
+            f"{self.BASE_API_URL}/repos/{owner}/{repo}/issues/{issue_number}/comments",
+            params=params,
+            max_in_flight=max_in_flight,
+            max_pages=max_pages,
+            use_cache=False
+        )
+    
     def create_issue_comment(self, owner, repo, issue_number, body):
         """Add a comment to an issue or pull request"""
         return self._make_request(
@@ -0,0 +1,230 @@
+"""
+Durable background delivery of outbound GitHub writes.
+
+Writes are stored as GitHubJob rows and posted by a worker thread, so the
+request that triggers them returns as soon as its own data is committed.
+Failed jobs are retried with exponential backoff. Every job carries an
+idempotency key that is also embedded in the posted comment, so a retry
+after a lost response finds the earlier comment instead of posting again.
+"""
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+
+from ..db.models import db, GitHubJob, GitHubToken, TaskGitHubLink
+from .github_client import GitHubClient, TruncatedListing
+
+logger = logging.getLogger(__name__)
+
+JOB_ISSUE_COMMENT = 'issue_comment'
+
+class PermanentJobError(Exception):
+    """A job failure that retrying cannot fix"""
+    pass
+
+def idempotency_marker(key):
+    """Hidden marker identifying the comment posted for a job"""
+    return f"<!-- devsync:{key} -->"
+
+def enqueue_issue_comment(user_id, link, owner, repo, issue_number, body, max_attempts=5):
+    """
+    Queue a comment on an issue/PR for a task link and mark the link pending.
+    
+    The link must already have an id. The caller commits the session, so the
+    job is stored atomically with the link itself.
+    """
+    key = f"link-comment:{link.id}:{issue_number}"
+    job = GitHubJob.query.filter_by(idempotency_key=key).first()
+    
+    if job is None:
+        job = GitHubJob(
+            job_type=JOB_ISSUE_COMMENT,
+            idempotency_key=key,
+            user_id=user_id,
+            link_id=link.id,
+            payload=json.dumps({'owner': owner, 'repo': repo, 'issue_number': issue_number, 'body': body}),
+            max_attempts=max_attempts
+        )
+        try:
+            # Savepoint, so a concurrent enqueue of the same key does not undo the link
+            with db.session.begin_nested():
+                db.session.add(job)
+        except IntegrityError:
+            job = GitHubJob.query.filter_by(idempotency_key=key).one()
+    elif job.status == 'failed':
+        # Linking the same issue again retries a comment that previously gave up
+        job.status = 'pending'
+        job.attempts = 0
+        job.next_attempt_at = datetime.utcnow()
+    
+    link.comment_status = 'posted' if job.status == 'succeeded' else 'pending'
+    return job
+
+def _claimable():
+    """Jobs that are due, or whose worker died while running them"""
+    now = datetime.utcnow()
+    return or_(
+        and_(GitHubJob.status == 'pending', GitHubJob.next_attempt_at <= now),
+        and_(GitHubJob.status == 'running', GitHubJob.locked_at < now - timedelta(seconds=GitHubJobWorker.lease_seconds))
+    )
+
+def claim_jobs(limit):
+    """Lease up to limit due jobs to this worker"""
+    candidate_ids = [job_id for (job_id,) in db.session.query(GitHubJob.id)
+                     .filter(_claimable())
+                     .order_by(GitHubJob.next_attempt_at)
+                     .limit(limit).all()]
+    
+    claimed_ids = []
+    now = datetime.utcnow()
+    for job_id in candidate_ids:
+        # Conditional update, so two workers never lease the same job
+        claimed = GitHubJob.query.filter(GitHubJob.id == job_id, _claimable()).update(
+            {GitHubJob.status: 'running', GitHubJob.locked_at: now, GitHubJob.attempts: GitHubJob.attempts + 1},
+            synchronize_session=False
+        )
+        if claimed:
+            claimed_ids.append(job_id)
+    db.session.commit()
+    
+    return [db.session.get(GitHubJob, job_id) for job_id in claimed_ids]
+
+def _post_issue_comment(client, job, payload):
+    owner, repo, number = payload['owner'], payload['repo'], payload['issue_number']
+    marker = idempotency_marker(job.idempotency_key)
+    
+    # An earlier attempt may have posted the comment and then lost the response.
+    # A page that cannot be read raises, so the job is retried rather than posted twice.
+    if job.attempts > 1:
+        for page in client.iter_issue_comments(owner, repo, number, since=job.created_at):
+            if isinstance(page, TruncatedListing):
+                raise Exception(f"Could not search every comment on {owner}/{repo}#{number} for an earlier attempt")
+            for comment in page:
+                if marker in (comment.get('body') or ''):
+                    return comment
+    
+    comment = client.create_issue_comment(owner, repo, number, f"{payload['body']}\n\n{marker}")
+    if not comment:
+        raise Exception(f"GitHub did not accept the comment on {owner}/{repo}#{number}")
+    return comment
+
+def run_job(job):
+    """Perform a claimed job against GitHub and return the API result"""
+    token = GitHubToken.query.filter_by(user_id=job.user_id).first()
+    if not token:
+        raise PermanentJobError('GitHub account not connected')
+    
+    client = GitHubClient(token.access_token)
+    payload = json.loads(job.payload)
+    if job.job_type == JOB_ISSUE_COMMENT:
+        return _post_issue_comment(client, job, payload)
+    
+    raise PermanentJobError(f"Unknown job type {job.job_type}")
+
+def _record_outcome(job, result=None, error=None, permanent=False, retry_backoff=30):
+    """Store the job outcome and mirror it onto the link row"""
+    link = db.session.get(TaskGitHubLink, job.link_id) if job.link_id else None
+    job.locked_at = None
+    job.last_error = error
+    
+    if error is None:
+        job.status = 'succeeded'
+        if link:
+            link.comment_status = 'posted'
+            link.comment_id = result.get('id') if isinstance(result, dict) else None
+    elif permanent or job.attempts >= job.max_attempts:
+        job.status = 'failed'
+        if link:
+            link.comment_status = 'failed'
+        logger.error(f"GitHub job {job.id} failed after {job.attempts} attempts: {error}")
+    else:
+        job.status = 'pending'
+        job.next_attempt_at = datetime.utcnow() + timedelta(seconds=retry_backoff * 2 ** (job.attempts - 1))
+        logger.warning(f"GitHub job {job.id} attempt {job.attempts} failed, retrying: {error}")
+    
+    db.session.commit()
+
+class GitHubJobWorker:
+    """Background worker that delivers queued GitHub jobs"""
+    
+    # How long a running job is leased before another worker may take it over
+    lease_seconds = 300
+    
+    def __init__(self, app, batch_size=20, poll_interval=5.0, retry_backoff=30.0):
+        self.app = app
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self._stopped = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='github-jobs', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+    
+    def wake(self):
+        """Check for jobs now instead of at the next poll"""
+        self._wakeup.set()
+    
+    def process_pending(self):
+        """Run every job that is currently due. Returns a count per outcome."""
+        totals = {'succeeded': 0, 'retrying': 0, 'failed': 0}
+        with self.app.app_context():
+            while True:
+                jobs = claim_jobs(self.batch_size)
+                if not jobs:
+                    return totals
+                
+                for job in jobs:
+                    outcome = self._process_job(job)
+                    totals[outcome] += 1
+    
+    def _process_job(self, job):
+        try:
+            result = run_job(job)
+            _record_outcome(job, result=result)
+            return 'succeeded'
+        except PermanentJobError as e:
+            db.session.rollback()
+            _record_outcome(job, error=str(e), permanent=True)
+        except Exception as e:
+            db.session.rollback()
+            _record_outcome(job, error=str(e), retry_backoff=self.retry_backoff)
+        return 'failed' if job.status == 'failed' else 'retrying'
+    
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.process_pending()
+            except Exception as e:
+                logger.error(f"GitHub job worker error: {str(e)}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+def init_github_job_processing(app):
+    """Create the GitHub job worker for the app and start it outside of tests"""
+    GitHubJobWorker.lease_seconds = app.config.get('GITHUB_JOB_LEASE_SECONDS', GitHubJobWorker.lease_seconds)
+    worker = GitHubJobWorker(
+        app,
+        batch_size=app.config.get('GITHUB_JOB_BATCH_SIZE', 20),
+        poll_interval=app.config.get('GITHUB_JOB_POLL_INTERVAL', 5.0),
+        retry_backoff=app.config.get('GITHUB_JOB_RETRY_BACKOFF', 30.0)
+    )
+    app.extensions['github_jobs'] = worker
+    
+    if not app.config.get('TESTING'):
+        worker.start()
+    
+    return worker
@@ -0,0 +1,279 @@
+"""
+GitHub webhook ingestion for DevSync.
+
+Deliveries are verified against the shared webhook secret, queued in memory
+and applied to local state in batches by a background worker, so task boards
+pick up GitHub changes without polling the GitHub API.
+"""
+import hmac
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+
+from sqlalchemy import or_
+
+from ..db.models import db, GitHubRepository, TaskGitHubLink, Task
+from .github_client import GitHubClient
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EVENTS = ('issues', 'pull_request', 'issue_comment', 'push')
+
+def verify_signature(payload, signature_header, secret):
+    """Check an X-Hub-Signature-256 header against the raw request body"""
+    if not secret or not signature_header:
+        return False
+
+    algorithm, _, digest = signature_header.partition('=')
+    if algorithm != 'sha256' or not digest:
+        return False
+
+    expected = hmac.new(secret.encode('utf-8'), payload, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, digest)
+
+def normalise_event(event_type, payload):
+    """Reduce a webhook payload to the fields needed to update local state"""
+    repository = payload.get('repository') or {}
+    event = {
+        'type': event_type,
+        'action': payload.get('action'),
+        'repo_github_id': repository.get('id'),
+        'repo_full_name': repository.get('full_name'),
+        'kind': None,
+        'number': None,
+        'state': None,
+        'merged': False
+    }
+
+    if event_type == 'issues':
+        issue = payload.get('issue') or {}
+        event.update(kind='issue', number=issue.get('number'), state=issue.get('state'))
+    elif event_type == 'pull_request':
+        pull = payload.get('pull_request') or {}
+        event.update(
+            kind='pull',
+            number=pull.get('number'),
+            state=pull.get('state'),
+            merged=bool(pull.get('merged'))
+        )
+    elif event_type == 'issue_comment':
+        issue = payload.get('issue') or {}
+        event.update(
+            kind='pull' if issue.get('pull_request') else 'issue',
+            number=issue.get('number')
+        )
+
+    return event
+
+class WebhookEventQueue:
+    """Bounded, thread-safe queue of normalised webhook events"""
+
+    def __init__(self, max_size=10000, seen_deliveries=1000):
+        self.max_size = max_size
+        self._events = deque()
+        self._condition = threading.Condition()
+        # Recently seen delivery IDs, so GitHub redeliveries are not applied twice
+        self._seen = OrderedDict()
+        self._seen_limit = seen_deliveries
+
+    def __len__(self):
+        with self._condition:
+            return len(self._events)
+
+    def put(self, event_type, delivery_id, payload):
+        """Queue an event. Returns False if the queue is full."""
+        with self._condition:
+            if delivery_id and delivery_id in self._seen:
+                return True
+            if len(self._events) >= self.max_size:
+                return False
+
+            self._events.append(normalise_event(event_type, payload))
+
+            if delivery_id:
+                self._seen[delivery_id] = True
+                if len(self._seen) > self._seen_limit:
+                    self._seen.popitem(last=False)
+
+            self._condition.notify()
+            return True
+
+    def drain(self, max_items):
+        """Remove and return up to max_items queued events"""
+        with self._condition:
+            count = min(max_items, len(self._events))
+            return [self._events.popleft() for _ in range(count)]
+
+    def wait_for_batch(self, batch_size, timeout):
+        """Block until a full batch is queued or the timeout elapses"""
+        with self._condition:
+            self._condition.wait_for(lambda: len(self._events) >= batch_size, timeout=timeout)
+
+    def wake(self):
+        """Release any worker blocked in wait_for_batch"""
+        with self._condition:
+            self._condition.notify_all()
+
+    def clear(self):
+        with self._condition:
+            self._events.clear()
+            self._seen.clear()
+
+# Process-wide queue shared by the webhook route and the background worker
+event_queue = WebhookEventQueue()
+
+def apply_events(events):
+    """Apply a batch of normalised events to local state in one transaction"""
+    summary = {'events': len(events), 'links_updated': 0, 'tasks_completed': 0}
+    if not events:
+        return summary
+
+    # Coalesce the batch so only the latest state of each issue/PR is written
+    latest = OrderedDict()
+    repo_ids_seen = set()
+    repo_names_seen = set()
+    for event in events:
+        if event['repo_github_id']:
+            repo_ids_seen.add(event['repo_github_id'])
+        if event['repo_full_name']:
+            repo_names_seen.add(event['repo_full_name'])
+        if event['type'] in ('issues', 'pull_request') and event['number'] is not None:
+            key = (event['repo_github_id'], event['repo_full_name'], event['kind'], event['number'])
+            latest[key] = event
+
+    # Cached issue/PR listings for the touched repositories are now stale
+    for full_name in repo_names_seen:
+        GitHubClient.invalidate_cache(f"/repos/{full_name}/")
+
+    if not latest:
+        return summary
+
+    repositories = GitHubRepository.query.filter(or_(
+        GitHubRepository.github_id.in_(repo_ids_seen),
+        GitHubRepository.repo_name.in_(repo_names_seen)
+    )).all()
+    repos_by_github_id = {repo.github_id: repo.id for repo in repositories if repo.github_id}
+    repos_by_name = {repo.repo_name: repo.id for repo in repositories}
+
+    issue_numbers = {key[3] for key in latest if key[2] == 'issue'}
+    pull_numbers = {key[3] for key in latest if key[2] == 'pull'}
+    links = TaskGitHubLink.query.filter(
+        TaskGitHubLink.repo_id.in_(set(repos_by_name.values())),
+        or_(
+            TaskGitHubLink.issue_number.in_(issue_numbers),
+            TaskGitHubLink.pull_request_number.in_(pull_numbers)
+        )
+    ).all()
+
+    links_by_key = {}
+    for link in links:
+        if link.issue_number is not None:
+            links_by_key.setdefault((link.repo_id, 'issue', link.issue_number), []).append(link)
+        if link.pull_request_number is not None:
+            links_by_key.setdefault((link.repo_id, 'pull', link.pull_request_number), []).append(link)
+
+    now = datetime.utcnow()
+    merged_task_ids = set()
+    for (github_id, full_name, kind, number), event in latest.items():
+        repo_id = repos_by_github_id.get(github_id) or repos_by_name.get(full_name)
+        for link in links_by_key.get((repo_id, kind, number), []):
+            if kind == 'issue':
+                link.issue_state = event['state']
+            else:
+                link.pull_request_state = 'merged' if event['merged'] else event['state']
+                if event['merged']:
+                    merged_task_ids.add(link.task_id)
+            link.github_updated_at = now
+            summary['links_updated'] += 1
+
+    # A merged pull request completes the tasks linked to it
+    if merged_task_ids:
+        summary['tasks_completed'] = Task.query.filter(
+            Task.id.in_(merged_task_ids),
+            Task.status != 'done'
+        ).update(
+            {Task.status: 'done', Task.progress: 100, Task.updated_at: now},
+            synchronize_session=False
+        )
+
+    db.session.commit()
+    return summary
+
+class WebhookProcessor:
+    """Background worker that applies queued webhook events in batches"""
+
+    def __init__(self, app, queue=None, batch_size=50, flush_interval=2.0):
+        self.app = app
+        self.queue = queue or event_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='github-webhooks', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self.queue.wake()
+
+    def process_pending(self):
+        """Apply everything currently queued, one batch at a time"""
+        totals = {'events': 0, 'links_updated': 0, 'tasks_completed': 0}
+        while True:
+            batch = self.queue.drain(self.batch_size)
+            if not batch:
+                return totals
+
+            with self.app.app_context():
+                summary = self._apply_batch(batch)
+            for key in totals:
+                totals[key] += summary[key]
+
+    def _apply_batch(self, batch):
+        try:
+            return apply_events(batch)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error applying webhook batch of {len(batch)} events: {str(e)}")
+
+        # Fall back to one event at a time so a single bad event does not drop the batch
+        totals = {'events': len(batch), 'links_updated': 0, 'tasks_completed': 0}
+        for event in batch:
+            try:
+                summary = apply_events([event])
+                totals['links_updated'] += summary['links_updated']
+                totals['tasks_completed'] += summary['tasks_completed']
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Dropping webhook event {event['type']} for {event['repo_full_name']}: {str(e)}")
+        return totals
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self.queue.wait_for_batch(self.batch_size, self.flush_interval)
+            try:
+                self.process_pending()
+            except Exception as e:
+                logger.error(f"Webhook processor error: {str(e)}")
+
+def init_webhook_processing(app):
+    """Create the webhook processor for the app and start it outside of tests"""
+    event_queue.max_size = app.config.get('GITHUB_WEBHOOK_QUEUE_SIZE', event_queue.max_size)
+    processor = WebhookProcessor(
+        app,
+        batch_size=app.config.get('GITHUB_WEBHOOK_BATCH_SIZE', 50),
+        flush_interval=app.config.get('GITHUB_WEBHOOK_FLUSH_INTERVAL', 2.0)
+    )
+    app.extensions['github_webhooks'] = processor
+
+    if not app.config.get('TESTING'):
+        processor.start()
+
+    return processor
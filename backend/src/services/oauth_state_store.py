@@ -0,0 +1,208 @@
+"""
+Short-lived storage for GitHub OAuth state parameters.
+
+A state is written when the OAuth flow starts and consumed exactly once by
+the callback. Every backend expires states after a TTL, caps how many are
+kept, and consumes them with an atomic get-and-delete so a state cannot be
+replayed. The in-process backend is the default; the SQLite and Redis
+backends share states between gunicorn workers so a callback can be served
+by any worker.
+"""
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class MemoryStateBackend:
+    """States held in this process, oldest first"""
+
+    def __init__(self, max_size=10000, clock=time.time):
+        self.max_size = max_size
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            self._purge_expired(self._clock())
+            return len(self._entries)
+
+    def _purge_expired(self, now):
+        # States share one TTL, so insertion order is also expiry order
+        while self._entries:
+            expires_at, _ = next(iter(self._entries.values()))
+            if expires_at > now:
+                break
+            self._entries.popitem(last=False)
+
+    def put(self, state, data, ttl):
+        now = self._clock()
+        with self._lock:
+            self._purge_expired(now)
+            self._entries[state] = (now + ttl, data)
+            self._entries.move_to_end(state)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, state):
+        with self._lock:
+            entry = self._entries.pop(state, None)
+        if entry is None or entry[0] <= self._clock():
+            return None
+        return entry[1]
+
+class SQLiteStateBackend:
+    """States in a SQLite file shared by every worker on the host"""
+
+    def __init__(self, path, max_size=10000, clock=time.time):
+        self.path = path
+        self.max_size = max_size
+        self._clock = clock
+        self._local = threading.local()
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS oauth_states (
+                state TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_oauth_states_expires_at ON oauth_states (expires_at);
+        """)
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        row = self._connection().execute(
+            'SELECT COUNT(*) FROM oauth_states WHERE expires_at > ?', (self._clock(),)
+        ).fetchone()
+        return row[0]
+
+    def put(self, state, data, ttl):
+        now = self._clock()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO oauth_states (state, data, expires_at) VALUES (?, ?, ?)',
+                (state, json.dumps(data), now + ttl)
+            )
+            # Rowids only grow, so everything more than max_size rows behind the newest is oldest
+            conn.execute(
+                'DELETE FROM oauth_states WHERE expires_at <= ? '
+                'OR rowid <= (SELECT MAX(rowid) FROM oauth_states) - ?',
+                (now, self.max_size)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def pop(self, state):
+        row = self._connection().execute(
+            'DELETE FROM oauth_states WHERE state = ? RETURNING data, expires_at', (state,)
+        ).fetchone()
+        if row is None or row[1] <= self._clock():
+            return None
+        return json.loads(row[0])
+
+class RedisStateBackend:
+    """States in Redis, shared by every worker that can reach the server"""
+
+    # Store a state, index it by expiry and trim the index to max_size in one round trip
+    PUT_SCRIPT = """
+        redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+        redis.call('ZADD', KEYS[2], ARGV[3] + ARGV[2], KEYS[1])
+        redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[3])
+        local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[4])
+        if excess > 0 then
+            local oldest = redis.call('ZRANGE', KEYS[2], 0, excess - 1)
+            redis.call('DEL', unpack(oldest))
+            redis.call('ZREMRANGEBYRANK', KEYS[2], 0, excess - 1)
+        end
+    """
+
+    def __init__(self, url=None, client=None, max_size=10000, prefix='devsync:oauth_state:'):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("The redis package is required for OAUTH_STATE_BACKEND=redis")
+            client = redis.Redis.from_url(url)
+
+        self.client = client
+        self.max_size = max_size
+        self.prefix = prefix
+        self.index_key = f"{prefix}index"
+        self._put = client.register_script(self.PUT_SCRIPT)
+
+    def __len__(self):
+        return self.client.zcount(self.index_key, time.time(), '+inf')
+
+    def put(self, state, data, ttl):
+        self._put(
+            keys=[f"{self.prefix}{state}", self.index_key],
+            args=[json.dumps(data), int(ttl), int(time.time()), self.max_size]
+        )
+
+    def pop(self, state):
+        key = f"{self.prefix}{state}"
+        pipe = self.client.pipeline(transaction=True)
+        pipe.get(key)
+        pipe.delete(key)
+        pipe.zrem(self.index_key, key)
+        data, _, _ = pipe.execute()
+        return json.loads(data) if data else None
+
+def create_state_backend(config):
+    """Build the state backend selected by OAUTH_STATE_BACKEND"""
+    backend = config.get('OAUTH_STATE_BACKEND', 'memory')
+    max_size = config.get('OAUTH_STATE_MAX_SIZE', 10000)
+
+    if backend == 'sqlite':
+        path = config.get('OAUTH_STATE_SQLITE_PATH') or os.path.join(tempfile.gettempdir(), 'devsync_oauth_states.db')
+        return SQLiteStateBackend(path, max_size=max_size)
+    if backend == 'redis':
+        return RedisStateBackend(url=config.get('REDIS_URL'), max_size=max_size)
+    if backend != 'memory':
+        raise ValueError(f"Unknown OAUTH_STATE_BACKEND: {backend}")
+    return MemoryStateBackend(max_size=max_size)
+
+class OAuthStateStore:
+    """OAuth state store whose backend is chosen from app config by init_app"""
+
+    def __init__(self, backend=None, ttl=600):
+        self.backend = backend or MemoryStateBackend()
+        self.ttl = ttl
+
+    def init_app(self, app):
+        self.backend = create_state_backend(app.config)
+        self.ttl = app.config.get('OAUTH_STATE_TTL', self.ttl)
+        app.extensions['oauth_states'] = self
+        logger.info(f"OAuth states stored in {type(self.backend).__name__}")
+
+    def __len__(self):
+        return len(self.backend)
+
+    def put(self, state, data):
+        """Store data for a state until it is consumed or expires"""
+        self.backend.put(state, data, self.ttl)
+
+    def pop(self, state):
+        """Consume a state, returning its data, or None if unknown or expired"""
+        return self.backend.pop(state)
+
+# Process-wide store used by the GitHub OAuth flow
+oauth_states = OAuthStateStore()
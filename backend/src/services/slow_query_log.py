@@ -0,0 +1,184 @@
+"""
+Ring buffer of recent slow SQL statements.
+
+Statements slower than the threshold are kept with their bound parameters
+redacted (strings are replaced by their length, so no user data is stored)
+and the request that issued them. On PostgreSQL a sample of slow read-only
+SELECTs is re-run under EXPLAIN (ANALYZE, BUFFERS) so the plan, and which
+indexes it used, can be inspected from the admin API. EXPLAIN ANALYZE
+executes the statement, so it runs on a background thread with its own
+connection, in a read-only transaction that is always rolled back.
+"""
+import logging
+import queue
+import random
+import re
+import threading
+from collections import Counter, deque
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from flask import request, has_request_context
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_INDEX_IN_PLAN = re.compile(r"\b(?:Index|Index Only|Bitmap Index) Scan(?: Backward)? (?:using|on) (\w+)")
+_EXPLAINABLE = re.compile(r"^\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+# Data-modifying CTEs and locking reads must not be re-executed
+_WRITES = re.compile(
+    r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b|\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b",
+    re.IGNORECASE
+)
+
+def redact_parameters(parameters):
+    """Keep numbers, booleans and dates; replace everything else with a placeholder"""
+    def redact(value):
+        if value is None or isinstance(value, (bool, int, float, Decimal, date, datetime)):
+            return value if not isinstance(value, (Decimal, date, datetime)) else str(value)
+        if isinstance(value, (str, bytes)):
+            return f"<redacted {len(value)} chars>"
+        return f"<redacted {type(value).__name__}>"
+
+    if isinstance(parameters, dict):
+        return {key: redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact(value) for value in parameters]
+    return redact(parameters)
+
+def indexes_in_plan(plan):
+    """Names of the indexes a text EXPLAIN plan scans"""
+    return _INDEX_IN_PLAN.findall('\n'.join(plan or []))
+
+class SlowQueryLog:
+    """Keeps the most recent statements slower than threshold_ms"""
+
+    def __init__(self, threshold_ms=200, size=100, explain=True, explain_sample_rate=0.1, explain_queue_size=10):
+        self._lock = threading.Lock()
+        # Sampled statements waiting for the EXPLAIN thread; more are dropped rather than queued
+        self._pending_explains = queue.Queue(maxsize=explain_queue_size)
+        self._explain_thread = None
+        self.configure(threshold_ms, size, explain, explain_sample_rate)
+
+    def configure(self, threshold_ms, size, explain, explain_sample_rate):
+        with self._lock:
+            self.threshold_ms = threshold_ms
+            self.explain = explain
+            self.explain_sample_rate = explain_sample_rate
+            self._entries = deque(maxlen=size)
+
+    def init_app(self, app):
+        self.configure(
+            app.config.get('SLOW_QUERY_THRESHOLD_MS', 200),
+            app.config.get('SLOW_QUERY_LOG_SIZE', 100),
+            app.config.get('SLOW_QUERY_EXPLAIN', True),
+            app.config.get('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.1)
+        )
+        app.extensions['slow_query_log'] = self
+
+    def observe(self, conn, statement, parameters, duration, executemany=False):
+        """Record statement if it took longer than the threshold"""
+        duration_ms = duration * 1000
+        if duration_ms < self.threshold_ms:
+            return None
+
+        entry = {
+            'recorded_at': datetime.now(timezone.utc).isoformat(),
+            'duration_ms': round(duration_ms, 2),
+            'statement': _WHITESPACE.sub(' ', statement).strip()[:2000],
+            'parameters': None if executemany else redact_parameters(parameters),
+            'request': f"{request.method} {request.path}" if has_request_context() else None,
+            'plan': None
+        }
+        if not executemany and self._should_explain(conn, statement):
+            self._queue_explain(conn.engine, entry, statement, parameters)
+        logger.warning(f"Slow query ({entry['duration_ms']}ms): {entry['statement'][:200]}")
+
+        with self._lock:
+            self._entries.append(entry)
+        return entry
+
+    def _should_explain(self, conn, statement):
+        return (self.explain
+                and conn.dialect.name == 'postgresql'
+                and _EXPLAINABLE.match(statement) is not None
+                and _WRITES.search(statement) is None
+                and random.random() < self.explain_sample_rate)
+
+    def _queue_explain(self, engine, entry, statement, parameters):
+        """Hand the statement to the EXPLAIN thread; its plan is added to entry when ready"""
+        with self._lock:
+            if self._explain_thread is None or not self._explain_thread.is_alive():
+                self._explain_thread = threading.Thread(
+                    target=self._run_explains, name='slow-query-explain', daemon=True
+                )
+                self._explain_thread.start()
+
+        # Copy mutable parameters, which the caller's cursor may reuse
+        if isinstance(parameters, dict):
+            parameters = dict(parameters)
+        elif isinstance(parameters, list):
+            parameters = list(parameters)
+
+        try:
+            self._pending_explains.put_nowait((engine, entry, statement, parameters))
+        except queue.Full:
+            logger.debug("EXPLAIN queue full, skipping slow query plan")
+
+    def _run_explains(self):
+        while True:
+            engine, entry, statement, parameters = self._pending_explains.get()
+            try:
+                plan = self._explain(engine, statement, parameters)
+                with self._lock:
+                    entry['plan'] = plan
+            finally:
+                self._pending_explains.task_done()
+
+    def wait_for_explains(self):
+        """Block until every queued EXPLAIN has finished"""
+        self._pending_explains.join()
+
+    def _explain(self, engine, statement, parameters):
+        # A raw DBAPI connection keeps the EXPLAIN itself out of the statement
+        # listeners, and its transaction is read-only and always rolled back so
+        # nothing the statement does can persist
+        try:
+            dbapi_connection = engine.raw_connection()
+        except Exception as e:
+            logger.warning(f"Could not EXPLAIN slow query: {str(e)}")
+            return None
+
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute('SET TRANSACTION READ ONLY')
+                cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {statement}', parameters)
+                return [row[0] for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+                dbapi_connection.rollback()
+        except Exception as e:
+            logger.warning(f"Could not EXPLAIN slow query: {str(e)}")
+            return None
+        finally:
+            dbapi_connection.close()
+
+    def entries(self, limit=None):
+        """Most recent slow statements first"""
+        with self._lock:
+            entries = list(reversed(self._entries))
+        return entries[:limit] if limit else entries
+
+    def index_usage(self):
+        """How often each index appears in the captured plans"""
+        usage = Counter()
+        for entry in self.entries():
+            usage.update(indexes_in_plan(entry['plan']))
+        return dict(usage.most_common())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+slow_query_log = SlowQueryLog()
@@ -1,9 +1,14 @@
 import functools
-from flask import request
+import logging
+from flask import current_app, request
 from flask_socketio import SocketIO, emit, join_room, leave_room, disconnect
 from flask_jwt_extended import decode_token, verify_jwt_in_request
 from jwt.exceptions import InvalidTokenError
 
+from .auth.identity_cache import identity_cache
+
+logger = logging.getLogger(__name__)
+
 # Initialize SocketIO
 socketio = SocketIO(cors_allowed_origins="*")
 
@@ -23,11 +28,18 @@ def authenticated_only(f):
         try:
             token = auth_header.split(' ')[1]
             decoded_token = decode_token(token)
-            user_id = decoded_token.get('sub')
+            subject = decoded_token.get(current_app.config.get('JWT_IDENTITY_CLAIM', 'sub'))
+            # Tokens carry {'user_id': ...} as their identity
+            user_id = subject.get('user_id') if isinstance(subject, dict) else subject
             if not user_id:
                 disconnect()
                 return False
             
+            # Reject tokens for users that no longer exist, without a query per event
+            if not identity_cache.get(user_id):
+                disconnect()
+                return False
+            
             # Add user_id to the kwargs so event handlers can use it
             kwargs['user_id'] = user_id
             return f(*args, **kwargs)
@@ -41,7 +53,7 @@ def authenticated_only(f):
 def handle_connect():
     """Handle new connections"""
     # Authentication is handled separately via @authenticated_only decorator
-    print("Client connected:", request.sid)
+    logger.debug(f"Client connected: {request.sid}")
     return True
 
 @socketio.on('disconnect')
@@ -57,14 +69,14 @@ def handle_disconnect():
             if user_id in members:
                 members.remove(user_id)
         
-    print("Client disconnected:", request.sid)
+    logger.debug(f"Client disconnected: {request.sid}")
 
 @socketio.on('register')
 @authenticated_only
 def handle_register(data, user_id):
     """Register a user's socket connection"""
     connected_users[user_id] = request.sid
-    print(f"User {user_id} registered with socket ID {request.sid}")
+    logger.debug(f"User {user_id} registered with socket ID {request.sid}")
     return {"status": "success", "message": "Registered successfully"}
 
 # Room management handlers
@@ -86,7 +98,7 @@ def handle_join_project(data, user_id):
     if user_id not in project_rooms[project_id]:
         project_rooms[project_id].append(user_id)
     
-    print(f"User {user_id} joined project {project_id}")
+    logger.debug(f"User {user_id} joined project {project_id}")
     return {"status": "success", "message": "Joined project room"}
 
 @socketio.on('leave_project')
@@ -104,7 +116,7 @@ def handle_leave_project(data, user_id):
     if project_id in project_rooms and user_id in project_rooms[project_id]:
         project_rooms[project_id].remove(user_id)
     
-    print(f"User {user_id} left project {project_id}")
+    logger.debug(f"User {user_id} left project {project_id}")
     return {"status": "success", "message": "Left project room"}
 
 # Event handlers for various notifications
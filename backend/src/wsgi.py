@@ -0,0 +1,9 @@
+"""
+WSGI entry point for gunicorn.
+
+Run from the backend directory:
+    gunicorn --workers 4 --threads 8 --bind 0.0.0.0:8000 src.wsgi:app
+"""
+from .app import create_app
+
+app, socketio = create_app()
@@ -1,11 +1,13 @@
 import os
 import sys
 import pytest
+import flask
 from flask import Flask
 from unittest.mock import patch
 
 # Add the backend directory (parent of tests) to sys.path so that "src" can be imported
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 @pytest.fixture(scope='session')
 def app():
@@ -36,4 +38,35 @@ def client(app):
 @pytest.fixture
 def runner(app):
     """Create a test CLI runner for the app"""
-    return app.test_cli_runner()
\ No newline at end of file
+    return app.test_cli_runner()
+
+@pytest.fixture
+def db_app():
+    """Create a Flask app bound to a fresh in-memory SQLite database"""
+    from backend.src.db.models import db
+
+    app = Flask(__name__)
+    app.config.update({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+    })
+    db.init_app(app)
+
+    # Some controller tests patch flask.current_app at import time, which leaks
+    # into Flask-SQLAlchemy if it is first imported while the patch is active
+    with patch('flask_sqlalchemy.extension.current_app', flask.globals.current_app):
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.session.remove()
+            db.drop_all()
+
+@pytest.fixture(autouse=True)
+def reset_github_breaker():
+    """Keep GitHub circuit breaker state from leaking between tests"""
+    from backend.src.services.github_client import GitHubClient
+
+    GitHubClient.breaker.reset()
+    yield
+    GitHubClient.breaker.reset()
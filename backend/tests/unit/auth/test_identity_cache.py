@@ -0,0 +1,109 @@
+import sys
+import os
+import pytest
+from unittest.mock import patch
+import flask
+from flask_jwt_extended import JWTManager
+from sqlalchemy import event
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.db.models import db, User, GitHubToken
+from backend.src.auth import auth
+from backend.src.auth.helpers import _hash
+from backend.src.auth.identity_cache import IdentityCache, identity_cache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def user(db_app):
+    identity_cache.clear()
+    user = User(name='Ada', email='ada@example.com', password=_hash('s3cret!', 4), role='admin')
+    db.session.add(user)
+    db.session.commit()
+    yield user
+    identity_cache.clear()
+
+@pytest.fixture
+def queries():
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', listener)
+
+def test_cache_hit_skips_query(user, queries):
+    cache = IdentityCache()
+    user_id = user.id
+    queries.clear()
+
+    first = cache.get(user_id)
+    second = cache.get(user_id)
+
+    assert first == second
+    assert first['role'] == 'admin'
+    assert first['github_connected'] is False
+    assert len(queries) == 1
+    assert cache.get(999) is None
+
+def test_entries_expire_and_are_bounded(user):
+    clock = FakeClock()
+    cache = IdentityCache(ttl=30, max_size=1, clock=clock)
+    cache.get(user.id)
+
+    user.name = 'Ada Lovelace'
+    db.session.commit()
+    # A separate cache instance is not invalidated, so it serves the old name until the TTL runs out
+    assert cache.get(user.id)['name'] == 'Ada'
+    clock.now = 31
+    assert cache.get(user.id)['name'] == 'Ada Lovelace'
+
+    cache.set({'id': 999, 'name': 'Other'})
+    with patch('backend.src.auth.identity_cache.load_identity', return_value=None) as load:
+        assert cache.get(user.id) is None
+        load.assert_called_once()
+
+def test_commit_invalidates_user_and_token_changes(user):
+    assert identity_cache.get(user.id)['name'] == 'Ada'
+
+    user.role = 'client'
+    db.session.commit()
+    assert identity_cache.get(user.id)['role'] == 'client'
+
+    db.session.add(GitHubToken(user_id=user.id, access_token='gh-token'))
+    db.session.commit()
+    assert identity_cache.get(user.id)['github_connected'] is True
+
+def test_rollback_keeps_cached_identity(user):
+    identity_cache.get(user.id)
+    user.name = 'Changed'
+    db.session.flush()
+    db.session.rollback()
+
+    assert identity_cache.get(user.id)['name'] == 'Ada'
+
+def test_login_uses_one_query_and_warms_cache(db_app, user, queries):
+    db_app.config['JWT_SECRET_KEY'] = 'test-secret'
+    JWTManager(db_app)
+    db.session.add(GitHubToken(user_id=user.id, access_token='gh-token'))
+    db.session.commit()
+    identity_cache.clear()
+    queries.clear()
+
+    # Other tests replace these module globals with mocks
+    with db_app.test_request_context(json={'email': 'ada@example.com', 'password': 's3cret!'}), \
+         patch.object(auth, 'jsonify', flask.json.jsonify), \
+         patch.object(auth, 'request', flask.globals.request), \
+         patch('backend.src.auth.helpers.bcrypt_rounds', 4):
+        response = auth.login()
+
+    assert response.get_json()['user']['github_connected'] is True
+    assert len(queries) == 1
+    assert identity_cache.get(user.id)['github_connected'] is True
+    assert len(queries) == 1
@@ -0,0 +1,107 @@
+import sys
+import os
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from flask import Flask
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.auth import helpers
+from backend.src.auth.helpers import (
+    PasswordHashPool, hash_password, verify_password, password_needs_rehash,
+    rehash_password_if_needed, init_password_hashing
+)
+from backend.src.services.circuit_breaker import DependencyUnavailableError
+
+@pytest.fixture(autouse=True)
+def fast_rounds():
+    app = Flask(__name__)
+    app.config.update({'BCRYPT_ROUNDS': 4, 'PASSWORD_HASH_WORKERS': 2, 'PASSWORD_HASH_QUEUE_SIZE': 2})
+    init_password_hashing(app)
+    yield
+    app.config.update({'BCRYPT_ROUNDS': 12, 'PASSWORD_HASH_WORKERS': 4, 'PASSWORD_HASH_QUEUE_SIZE': 32})
+    init_password_hashing(app)
+
+def test_hash_and_verify_run_in_pool():
+    threads = []
+    original_hash = helpers._hash
+    helpers._hash = lambda password, rounds: threads.append(threading.current_thread().name) or original_hash(password, rounds)
+    try:
+        hashed = hash_password('s3cret!')
+    finally:
+        helpers._hash = original_hash
+
+    assert threads[0].startswith('bcrypt')
+    assert hashed.startswith('$2b$04$')
+    assert verify_password('s3cret!', hashed)
+    assert not verify_password('wrong', hashed)
+
+def test_pool_sheds_load_when_queue_is_full():
+    pool = PasswordHashPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_hash():
+        started.set()
+        release.wait()
+        return 'done'
+
+    results = []
+    running = threading.Thread(target=lambda: results.append(pool.run(slow_hash)))
+    queued = threading.Thread(target=lambda: results.append(pool.run(lambda: 'queued')))
+    running.start()
+    started.wait()
+    queued.start()
+    deadline = time.monotonic() + 5
+    while pool._slots._value and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    # One running and one queued: the third check is refused immediately
+    with pytest.raises(DependencyUnavailableError):
+        pool.run(lambda: 'refused')
+    assert pool.rejected == 1
+
+    release.set()
+    running.join()
+    queued.join()
+    assert sorted(results) == ['done', 'queued']
+    assert pool.run(lambda: 'after') == 'after'
+
+def test_concurrent_rejections_are_all_counted():
+    pool = PasswordHashPool(max_workers=1, max_queue=0)
+    release = threading.Event()
+    started = threading.Event()
+    running = threading.Thread(target=lambda: pool.run(lambda: started.set() or release.wait()))
+    running.start()
+    started.wait()
+
+    def refused():
+        for _ in range(200):
+            with pytest.raises(DependencyUnavailableError):
+                pool.run(lambda: 'refused')
+
+    threads = [threading.Thread(target=refused) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    release.set()
+    running.join()
+
+    assert pool.rejected == 1600
+
+def test_rehash_when_cost_factor_changes():
+    user = Mock(id=1)
+    user.password = helpers._hash('s3cret!', 5)
+
+    assert password_needs_rehash(user.password)
+    assert rehash_password_if_needed(user, 's3cret!')
+    assert user.password.startswith('$2b$04$')
+    assert verify_password('s3cret!', user.password)
+
+    assert not password_needs_rehash(user.password)
+    assert not rehash_password_if_needed(user, 's3cret!')
+    assert not password_needs_rehash('not-a-bcrypt-hash')
@@ -344,6 +344,30 @@ class TestAdminController(unittest.TestCase):
         self.assertEqual(data['tasks']['review'], 1)
         self.assertEqual(data['tasks']['done'], 1)
     
+    def test_get_slow_queries_actual(self):
+        import flask
+        from backend.src.api.controllers import admin_controller
+        from backend.src.services.slow_query_log import SlowQueryLog
+        
+        slow_log = SlowQueryLog(threshold_ms=100)
+        connection = MagicMock()
+        connection.dialect.name = 'sqlite'
+        slow_log.observe(connection, "SELECT * FROM tasks WHERE project_id = ?", (3,), 0.5)
+        slow_log.observe(connection, "SELECT * FROM users", (), 0.2)
+        
+        # Other tests replace the module's flask globals with mocks
+        with app.test_request_context('/admin/slow-queries?limit=1'), \
+             patch.object(admin_controller, 'slow_query_log', slow_log), \
+             patch.object(admin_controller, 'jsonify', flask.json.jsonify), \
+             patch.object(admin_controller, 'request', flask.globals.request):
+            response = admin_controller.get_slow_queries()
+            data = json.loads(response.data)
+        
+        self.assertEqual(data['threshold_ms'], 100)
+        self.assertEqual(len(data['queries']), 1)
+        self.assertEqual(data['queries'][0]['statement'], "SELECT * FROM users")
+        self.assertEqual(data['index_usage'], {})
+    
     def test_get_system_settings_actual(self):
         # Import the function directly to test
         from backend.src.api.controllers.admin_controller import get_system_settings
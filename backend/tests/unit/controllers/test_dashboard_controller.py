@@ -54,17 +54,18 @@ class TestDashboardController(unittest.TestCase):
     def tearDown(self):
         self.app_context.pop()
 
+    @patch('backend.src.api.controllers.dashboard_controller.get_user_projects')
     @patch('backend.src.api.controllers.dashboard_controller.get_recent_completed_tasks')
     @patch('backend.src.api.controllers.dashboard_controller.get_tasks_due_soon')
     @patch('backend.src.api.controllers.dashboard_controller.get_user_tasks')
     @patch('backend.src.api.controllers.dashboard_controller.get_jwt_identity')
     @patch('backend.src.api.controllers.dashboard_controller.get_jwt')
-    @patch('backend.src.api.controllers.dashboard_controller.User')
+    @patch('backend.src.api.controllers.dashboard_controller.identity_cache')
     @patch('backend.src.api.controllers.dashboard_controller.Task')
     @patch('backend.src.api.controllers.dashboard_controller.jsonify')
-    def test_get_user_dashboard(self, mock_jsonify, mock_task_class, mock_user_class, mock_get_jwt, 
+    def test_get_user_dashboard(self, mock_jsonify, mock_task_class, mock_identity_cache, mock_get_jwt, 
                               mock_jwt_identity, mock_get_user_tasks, mock_get_tasks_due_soon, 
-                              mock_get_recent_completed_tasks):
+                              mock_get_recent_completed_tasks, mock_get_user_projects):
         # Import locally to allow patching
         from backend.src.api.controllers.dashboard_controller import get_user_dashboard
         
@@ -90,8 +91,9 @@ class TestDashboardController(unittest.TestCase):
         user_mock.projects.all.return_value = [self.mock_project]
         user_mock.to_dict.return_value = user_dict
         
-        # Mock the User.query.get_or_404 to return our fixed user
-        mock_user_class.query.get_or_404.return_value = user_mock
+        # The dashboard reads the user from the identity cache
+        mock_identity_cache.get.return_value = user_dict
+        mock_get_user_projects.return_value = [self.mock_project]
         
         # Setup helper function mocks
         mock_get_user_tasks.return_value = [self.mock_task]
@@ -145,6 +147,8 @@ class TestDashboardController(unittest.TestCase):
         # Check user data
         self.assertEqual(result['user']['id'], 1)
         self.assertEqual(result['user']['name'], 'Test User')
+        mock_identity_cache.get.assert_called_once_with(1)
+        mock_get_user_projects.assert_called_once_with(1)
 
     @patch('backend.src.api.controllers.dashboard_controller.get_recent_updated_project_tasks')
     @patch('backend.src.api.controllers.dashboard_controller.get_project_tasks_due_soon')
@@ -86,8 +86,7 @@ class TestGitHubController(unittest.TestCase):
         # Setup mocks
         mock_request.args = ImmutableMultiDict([('code', 'test-code'), ('state', 'test-state')])
         
-        mock_oauth_states.__contains__.return_value = True
-        mock_oauth_states.__getitem__.return_value = {'user_id': 1}
+        mock_oauth_states.pop.return_value = {'user_id': 1}
         
         mock_github_client.exchange_code_for_token.return_value = {
             'access_token': 'test-access-token'
@@ -170,8 +169,9 @@ class TestGitHubController(unittest.TestCase):
     @patch('backend.src.api.controllers.github_controller.TaskGitHubLink')
     @patch('backend.src.api.controllers.github_controller.GitHubToken')
     @patch('backend.src.api.controllers.github_controller.GitHubClient')
+    @patch('backend.src.api.controllers.github_controller.enqueue_issue_comment')
     @patch('backend.src.api.controllers.github_controller.db')
-    def test_link_task_with_github(self, mock_db, mock_github_client, mock_token_class, 
+    def test_link_task_with_github(self, mock_db, mock_enqueue, mock_github_client, mock_token_class, 
                                 mock_link_class, mock_repo_class, mock_task_class, mock_validate):
         # Setup mocks
         mock_validate.return_value = None
@@ -208,7 +208,10 @@ class TestGitHubController(unittest.TestCase):
         self.assertEqual(result['link']['issue_number'], 42)
         mock_db.session.add.assert_called_once()
         mock_db.session.commit.assert_called_once()
-        mock_client_instance.create_issue_comment.assert_called_once()
+        # The comment is queued for the background worker instead of posted inline
+        mock_enqueue.assert_called_once()
+        self.assertEqual(mock_enqueue.call_args[0][2:5], ('owner', 'repo', 42))
+        mock_client_instance.create_issue_comment.assert_not_called()
 
     @patch('backend.src.api.controllers.github_controller.GitHubClient')
     @patch('backend.src.api.controllers.github_controller.oauth_states')
@@ -256,8 +259,8 @@ class TestGitHubController(unittest.TestCase):
         # Setup mocks
         mock_request.args = ImmutableMultiDict([('code', 'test-code'), ('state', url_safe_state)])
         
-        # Mock oauth_states to not contain this state
-        mock_oauth_states.__contains__.return_value = False
+        # Mock the state store to not contain this state
+        mock_oauth_states.pop.return_value = None
         
         # Setup token exchange mock
         mock_github_client.exchange_code_for_token.return_value = {
@@ -299,8 +302,7 @@ class TestGitHubController(unittest.TestCase):
         # Setup mocks
         mock_request.args = ImmutableMultiDict([('code', 'test-code'), ('state', 'test-state')])
         
-        mock_oauth_states.__contains__.return_value = True
-        mock_oauth_states.__getitem__.return_value = {'user_id': 1}
+        mock_oauth_states.pop.return_value = {'user_id': 1}
         
         # Setup token exchange mock
         mock_github_client.exchange_code_for_token.return_value = {
@@ -347,8 +349,7 @@ class TestGitHubController(unittest.TestCase):
         # Setup mocks
         mock_request.args = ImmutableMultiDict([('code', 'invalid-code'), ('state', 'test-state')])
         
-        mock_oauth_states.__contains__.return_value = True
-        mock_oauth_states.__getitem__.return_value = {'user_id': 1}
+        mock_oauth_states.pop.return_value = {'user_id': 1}
         
         # Mock token exchange failure
         mock_github_client.exchange_code_for_token.return_value = None
@@ -381,8 +382,7 @@ class TestGitHubController(unittest.TestCase):
         # Setup mocks
         mock_request.args = ImmutableMultiDict([('code', 'test-code'), ('state', 'test-state')])
         
-        mock_oauth_states.__contains__.return_value = True
-        mock_oauth_states.__getitem__.return_value = {'user_id': 1}
+        mock_oauth_states.pop.return_value = {'user_id': 1}
         
         # Setup token exchange mock
         mock_github_client.exchange_code_for_token.return_value = {
@@ -409,8 +409,8 @@ class TestGitHubController(unittest.TestCase):
         # Setup mocks for invalid state parameter
         mock_request.args = ImmutableMultiDict([('code', 'test-code'), ('state', 'invalid-state')])
         
-        # Mock oauth_states to not contain this state and to cause an exception when processing the state
-        mock_oauth_states.__contains__.return_value = False
+        # Mock the state store to not contain this state and to cause an exception when processing the state
+        mock_oauth_states.pop.return_value = None
         
         # Call the function
         result = github_callback()
@@ -432,8 +432,7 @@ class TestGitHubController(unittest.TestCase):
         # Setup mocks
         mock_request.args = ImmutableMultiDict([('code', 'test-code'), ('state', 'test-state')])
         
-        mock_oauth_states.__contains__.return_value = True
-        mock_oauth_states.__getitem__.return_value = {'user_id': 1}
+        mock_oauth_states.pop.return_value = {'user_id': 1}
         
         # Setup token exchange mock
         mock_github_client.exchange_code_for_token.return_value = {
@@ -475,8 +474,7 @@ class TestGitHubController(unittest.TestCase):
         # Setup mocks
         mock_request.args = ImmutableMultiDict([('code', 'test-code'), ('state', 'test-state')])
         
-        mock_oauth_states.__contains__.return_value = True
-        mock_oauth_states.__getitem__.return_value = {'user_id': 999}  # Non-existent user ID
+        mock_oauth_states.pop.return_value = {'user_id': 999}  # Non-existent user ID
         
         # Setup token exchange mock
         mock_github_client.exchange_code_for_token.return_value = {
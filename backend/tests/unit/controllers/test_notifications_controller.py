@@ -2,8 +2,16 @@ import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 from flask import Flask
+from sqlalchemy import DateTime, create_engine, literal, select
 
 # Fix imports to use the correct path
+def feed_row(**columns):
+    """A SQLAlchemy Row with the given labelled columns"""
+    statement = select(*(literal(value, type_=DateTime if isinstance(value, datetime) else None).label(name)
+                         for name, value in columns.items()))
+    with create_engine('sqlite://').connect() as conn:
+        return conn.execute(statement).one()
+
 @pytest.fixture
 def mock_get_jwt_identity():
     with patch('src.api.controllers.notifications_controller.get_jwt_identity') as mock:
@@ -31,6 +39,9 @@ def app_context():
     app = Flask(__name__)
     app.config['TESTING'] = True
     app.config["JWT_HEADER_TYPE"] = "Bearer"  # add this so JWT helpers know what to expect
+    # Serialize rows the way the app does
+    from src.api.middlewares.json_provider import apply_json_provider
+    apply_json_provider(app)
     # Use test_request_context to simulate an active request
     with app.test_request_context(json={'content': 'Test notification', 'user_id': 1, 'task_id': 2}):
         yield
@@ -43,14 +54,12 @@ def test_get_user_notifications(mock_get_jwt_identity, mock_db_session, app_cont
         mock_query.filter_by.return_value = mock_filter
         mock_filter.order_by.return_value = mock_order
         
-        notification = MagicMock()
-        notification.id = 1
-        notification.content = "Test notification"
-        notification.is_read = False
-        notification.task_id = 2
-        notification.created_at = datetime.utcnow()
+        # The feed is selected as rows of its columns
+        notification = feed_row(id=1, user_id=1, type='task_assigned', title='Task assigned',
+                                message='Test notification', reference_id='2', read=False,
+                                created_at=datetime(2025, 1, 15, 12, 0), read_at=None)
         
-        mock_order.all.return_value = [notification]
+        mock_order.with_entities.return_value.all.return_value = [notification]
         
         # Import inside test to use patched modules
         from src.api.controllers.notifications_controller import get_user_notifications
@@ -62,6 +71,8 @@ def test_get_user_notifications(mock_get_jwt_identity, mock_db_session, app_cont
         assert 'unread_count' in data
         assert len(data['notifications']) == 1
         assert data['unread_count'] == 1
+        assert data['notifications'][0]['message'] == 'Test notification'
+        assert data['notifications'][0]['created_at'] == '2025-01-15T12:00:00'
 
 def test_create_notification(mock_db_session, app_context):
     from flask import request
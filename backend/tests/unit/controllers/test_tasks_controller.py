@@ -59,26 +59,25 @@ def mock_task():
 def test_get_all_tasks_admin(app, mock_jwt_identity, mock_jwt):
     with app.test_request_context('?status=in_progress'):
         with patch('backend.src.api.controllers.tasks_controller.Task.query') as mock_query:
-            # Set up mock task with all required attributes for serialization
-            task1 = MagicMock()
-            task1.id = 1
-            task1.title = "Task 1"
-            task1.description = "Description 1"
-            task1.status = "in_progress"
-            task1.progress = 50
-            task1.assigned_to = 2
-            task1.created_by = 1
-            task1.deadline = None
-            task1.created_at = MagicMock()
-            task1.created_at.isoformat.return_value = "2023-01-01T00:00:00"
-            task1.updated_at = MagicMock()
-            task1.updated_at.isoformat.return_value = "2023-01-02T00:00:00"
+            # Rows of the listed columns, which the controller serializes as they are
+            task1 = {
+                'id': 1,
+                'title': "Task 1",
+                'description': "Description 1",
+                'status': "in_progress",
+                'progress': 50,
+                'assigned_to': 2,
+                'created_by': 1,
+                'deadline': None,
+                'created_at': "2023-01-01T00:00:00",
+                'updated_at': "2023-01-02T00:00:00"
+            }
             
             # Configure the mock query
             mock_filtered_query = MagicMock()
             mock_query.filter.return_value = mock_filtered_query
-            mock_filtered_query.all.return_value = [task1]
-            mock_query.all.return_value = [task1]
+            mock_filtered_query.with_entities.return_value.all.return_value = [task1]
+            mock_query.with_entities.return_value.all.return_value = [task1]
             
             # Import the function locally to use patched modules
             from backend.src.api.controllers.tasks_controller import get_all_tasks
@@ -102,7 +101,7 @@ def test_get_all_tasks_developer(app, mock_jwt_identity, mock_jwt):
             # Configure filter for developer (assigned_to or created_by)
             filter_mock = MagicMock()
             mock_query.filter.return_value = filter_mock
-            filter_mock.all.return_value = []
+            filter_mock.with_entities.return_value.all.return_value = []
             
             # Import the function locally to use patched modules
             from backend.src.api.controllers.tasks_controller import get_all_tasks
@@ -40,7 +40,6 @@ def mock_user():
     user.email = "test@example.com"
     user.role = "developer"
     user.github_username = "testuser"
-    user.avatar = "avatar_url"
     user.created_at = MagicMock()
     user.created_at.isoformat.return_value = "2023-01-01T00:00:00"
     return user
@@ -48,8 +47,15 @@ def mock_user():
 def test_get_all_users(app, mock_db, mock_user):
     with app.test_request_context():
         with patch('backend.src.api.controllers.users_controller.User.query') as mock_query:
-            # Configure the mock query
-            mock_query.all.return_value = [mock_user]
+            # Configure the mock query with a row of the user columns
+            mock_query.with_entities.return_value.all.return_value = [{
+                'id': 1,
+                'name': "Test User",
+                'email': "test@example.com",
+                'role': "developer",
+                'github_username': "testuser",
+                'created_at': "2023-01-01T00:00:00"
+            }]
             
             # Import the function locally to use patched modules
             from backend.src.api.controllers.users_controller import get_all_users
@@ -0,0 +1,101 @@
+import sys
+import os
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.api.middlewares.metrics import metrics
+from backend.src.db.connection_pool import (
+    TimedQueuePool, engine_options, get_db_connection, gunicorn_concurrency
+)
+
+POSTGRES = {'SQLALCHEMY_DATABASE_URI': 'postgresql+psycopg2cffi://devsync@db/devsync'}
+
+@pytest.fixture
+def reset_metrics():
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+def test_gunicorn_concurrency_from_environment():
+    assert gunicorn_concurrency({}) == (1, 1)
+    assert gunicorn_concurrency({'WEB_CONCURRENCY': '4', 'GUNICORN_THREADS': '8'}) == (4, 8)
+    # Command line arguments win over the plain variables
+    environ = {'GUNICORN_CMD_ARGS': '-w 3 --threads=6 --bind 0.0.0.0:8000', 'WEB_CONCURRENCY': '4'}
+    assert gunicorn_concurrency(environ) == (3, 6)
+
+def test_engine_options_sized_from_worker_threads():
+    config = dict(POSTGRES, DB_MAX_OVERFLOW=5, DB_STATEMENT_TIMEOUT_MS=15000)
+
+    options = engine_options(config, {'WEB_CONCURRENCY': '4', 'GUNICORN_THREADS': '8'})
+
+    assert options['poolclass'] is TimedQueuePool
+    assert options['pool_size'] == 10
+    assert options['max_overflow'] == 5
+    assert options['pool_pre_ping'] is True
+    assert options['connect_args'] == {'options': '-c statement_timeout=15000'}
+
+def test_engine_options_split_connection_budget_between_workers():
+    config = dict(POSTGRES, DB_MAX_CONNECTIONS=40, DB_MAX_OVERFLOW=5)
+
+    options = engine_options(config, {'WEB_CONCURRENCY': '4', 'GUNICORN_THREADS': '16'})
+
+    assert options['pool_size'] == 10
+    assert options['max_overflow'] == 0
+
+def test_engine_options_leave_sqlite_alone():
+    assert engine_options({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'}) == {}
+    assert engine_options({}) == {}
+
+def test_checkout_wait_is_exported(tmp_path, reset_metrics):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.05,
+                           on_checkout_wait=metrics.observe_pool_checkout)
+    holder = engine.connect()
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    holder.close()
+    with engine.connect():
+        pass
+
+    rendered = metrics.render()
+    assert 'db_pool_checkout_wait_seconds_count{pool="primary"} 3' in rendered
+    assert 'db_pool_checkout_timeouts_total{pool="primary"} 1' in rendered
+    engine.dispose()
+
+def test_checkout_wait_callback_comes_from_engine_options(tmp_path):
+    waits = []
+    options = engine_options(POSTGRES, on_checkout_wait=lambda pool, wait, timed_out=False: waits.append((pool, timed_out)))
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=options['poolclass'],
+                           pool_logging_name=options['pool_logging_name'], on_checkout_wait=options['on_checkout_wait'])
+
+    with engine.connect():
+        pass
+    # Recreated pools, as after dispose(), keep reporting
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    assert waits == [('primary', False), ('primary', False)]
+    assert 'on_checkout_wait' not in engine_options(POSTGRES)
+    engine.dispose()
+
+def test_get_db_connection_commits_or_rolls_back(tmp_path, reset_metrics):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool)
+    with get_db_connection(engine) as conn:
+        conn.execute(text('CREATE TABLE items (name TEXT)'))
+        conn.execute(text("INSERT INTO items VALUES ('kept')"))
+
+    with pytest.raises(RuntimeError):
+        with get_db_connection(engine) as conn:
+            conn.execute(text("INSERT INTO items VALUES ('discarded')"))
+            raise RuntimeError('boom')
+
+    with get_db_connection(engine) as conn:
+        assert conn.execute(text('SELECT name FROM items')).scalars().all() == ['kept']
+    # Every connection went back to the pool
+    assert engine.pool.checkedout() == 0
+    engine.dispose()
@@ -0,0 +1,76 @@
+import sys
+import os
+import csv
+import io
+from datetime import date
+from unittest.mock import MagicMock
+import bcrypt
+import pytest
+from sqlalchemy import create_engine, select, text
+
+# Set up proper import paths
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+# The script imports the app as the top-level src package, like setup_database.py
+from src.db.scripts.generate_data import BulkWriter, DataGenerator
+from src.db.models import db, Task, User
+from src.db.models.models import project_members
+
+def generate(tmp_path, name, **options):
+    engine = create_engine(f"sqlite:///{tmp_path / name}")
+    db.metadata.create_all(engine)
+    generator = DataGenerator(users=40, projects=8, tasks=500, notifications_per_user=3, seed=7,
+                              reference_date=date(2025, 1, 15), bcrypt_rounds=4, **options)
+    return engine, generator.generate(engine, chunk_size=64)
+
+def test_generated_data_is_deterministic_and_consistent(tmp_path):
+    engine, counts = generate(tmp_path, 'first.db')
+    other_engine, other_counts = generate(tmp_path, 'second.db')
+
+    assert counts['users'] == 40
+    assert counts['tasks'] == 500
+    assert counts['comments'] == 1000
+    assert counts['notifications'] == 120
+    assert counts == other_counts
+
+    query = select(Task.__table__).order_by(Task.id)
+    with engine.connect() as conn, other_engine.connect() as other_conn:
+        tasks = conn.execute(query).fetchall()
+        assert tasks == other_conn.execute(query).fetchall()
+
+        members = set(conn.execute(select(project_members.c.project_id, project_members.c.user_id)).fetchall())
+        for task in tasks:
+            assert (task.project_id, task.created_by) in members
+            assert task.assigned_to is None or (task.project_id, task.assigned_to) in members
+            assert (task.status == 'done') == (task.progress == 100) or task.status == 'review'
+
+        admin = conn.execute(select(User.__table__).where(User.id == 1)).one()
+        assert admin.role == 'admin'
+        assert admin.email == 'user1@example.com'
+        assert bcrypt.checkpw(b'DevSync-Load-Test-1!', admin.password.encode())
+
+def test_different_seeds_give_different_data():
+    other = DataGenerator(users=40, projects=8, tasks=500, seed=8, reference_date=date(2025, 1, 15), bcrypt_rounds=4)
+    first = DataGenerator(users=40, projects=8, tasks=500, seed=7, reference_date=date(2025, 1, 15), bcrypt_rounds=4)
+    for generator in (first, other):
+        list(generator.project_rows())
+        list(generator.membership_rows())
+
+    assert [row['status'] for row in first.task_rows()] != [row['status'] for row in other.task_rows()]
+
+def test_copy_marks_nulls_apart_from_empty_strings():
+    conn = MagicMock()
+    conn.dialect.name = 'postgresql'
+    copied = {}
+    cursor = conn.connection.cursor.return_value
+    cursor.copy_expert.side_effect = lambda sql, buffer: copied.update(sql=sql, data=buffer.read())
+
+    writer = BulkWriter(conn, chunk_size=10)
+    written = writer.write(Task.__table__, [{'id': 1, 'title': 'Say "hi", then go', 'description': '', 'status': 'todo'}])
+
+    assert written == 1
+    assert copied['sql'].startswith('COPY tasks (id, title, description, status, progress,')
+    assert copied['sql'].endswith("FROM STDIN WITH (FORMAT csv, NULL '\\N')")
+    row = next(csv.reader(io.StringIO(copied['data'])))
+    assert row[:5] == ['1', 'Say "hi", then go', '', 'todo', '\\N']
+    conn.commit.assert_called_once()
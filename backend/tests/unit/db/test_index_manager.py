@@ -0,0 +1,70 @@
+import sys
+import os
+import pytest
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, create_engine, inspect, text
+from sqlalchemy.dialects import postgresql
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.db.index_manager import IndexManager
+
+def make_metadata(*indexes):
+    metadata = MetaData()
+    table = Table(
+        'tasks', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('project_id', Integer),
+        Column('status', String(20)),
+        Column('code', String(20), unique=True)
+    )
+    for name, columns in indexes:
+        Index(name, *[table.c[column] for column in columns])
+    return metadata
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'indexes.db'}")
+    make_metadata().create_all(engine)
+    yield engine
+    engine.dispose()
+
+def index_names(engine):
+    return sorted(index['name'] for index in inspect(engine).get_indexes('tasks'))
+
+def test_sync_only_creates_missing_indexes(engine):
+    with engine.begin() as conn:
+        conn.execute(text('CREATE INDEX idx_tasks_status ON tasks (status)'))
+    manager = IndexManager(make_metadata(
+        ('idx_tasks_status', ['status']),
+        ('idx_tasks_project_status', ['project_id', 'status'])
+    ))
+
+    with engine.connect() as conn:
+        assert manager.diff(conn) == {'missing': ['idx_tasks_project_status'], 'invalid': [], 'undeclared': []}
+
+    assert manager.sync(engine) == ['idx_tasks_project_status']
+    assert manager.sync(engine) == []
+    assert index_names(engine) == ['idx_tasks_project_status', 'idx_tasks_status']
+
+def test_drop_unused_removes_only_undeclared_indexes(engine):
+    with engine.begin() as conn:
+        conn.execute(text('CREATE INDEX idx_tasks_status ON tasks (status)'))
+        conn.execute(text('CREATE INDEX idx_tasks_legacy ON tasks (project_id)'))
+    manager = IndexManager(make_metadata(('idx_tasks_status', ['status'])))
+
+    assert manager.drop_unused(engine, dry_run=True) == ['idx_tasks_legacy']
+    assert index_names(engine) == ['idx_tasks_legacy', 'idx_tasks_status']
+
+    assert manager.drop_unused(engine) == ['idx_tasks_legacy']
+    # The unique constraint's index is never a candidate
+    assert index_names(engine) == ['idx_tasks_status']
+
+def test_postgres_indexes_are_built_concurrently():
+    manager = IndexManager(make_metadata(('idx_tasks_project_status', ['project_id', 'status'])))
+
+    class Connection:
+        dialect = postgresql.dialect()
+
+    statement = manager.create_statement(manager.declared()['idx_tasks_project_status'], Connection)
+    assert statement == 'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_project_status ON tasks (project_id, status)'
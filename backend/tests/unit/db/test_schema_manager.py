@@ -0,0 +1,80 @@
+import sys
+import os
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, inspect, text
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.db.schema_manager import SchemaManager
+from backend.src.db.models.models import db
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    yield engine
+    engine.dispose()
+
+def column_names(engine, table):
+    return [column['name'] for column in inspect(engine).get_columns(table)]
+
+def test_sync_adds_the_link_columns_to_an_existing_table(engine):
+    db.metadata.create_all(engine, tables=[
+        table for table in db.metadata.sorted_tables if table.name not in ('task_github_links', 'github_jobs')
+    ])
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE task_github_links (id INTEGER PRIMARY KEY, task_id INTEGER NOT NULL, '
+            'repo_id INTEGER NOT NULL, issue_number INTEGER, pull_request_number INTEGER, created_at DATETIME)'
+        ))
+        conn.execute(text('INSERT INTO task_github_links (task_id, repo_id, issue_number) VALUES (1, 2, 3)'))
+
+    added = SchemaManager(db.metadata).sync(engine)
+
+    assert added == [
+        'github_jobs', 'task_github_links.issue_state', 'task_github_links.pull_request_state',
+        'task_github_links.github_updated_at', 'task_github_links.comment_status',
+        'task_github_links.comment_id'
+    ]
+    with engine.connect() as conn:
+        row = conn.execute(text('SELECT issue_number, issue_state, comment_id FROM task_github_links')).one()
+    assert tuple(row) == (3, None, None)
+
+def test_sync_creates_the_github_jobs_table(engine):
+    tables = [table for table in db.metadata.sorted_tables if table.name != 'github_jobs']
+    db.metadata.create_all(engine, tables=tables)
+
+    assert SchemaManager(db.metadata).sync(engine) == ['github_jobs']
+    assert 'idempotency_key' in column_names(engine, 'github_jobs')
+    assert 'idx_github_jobs_status_next_attempt' in {
+        index['name'] for index in inspect(engine).get_indexes('github_jobs')
+    }
+
+def test_sync_is_idempotent(engine):
+    db.metadata.create_all(engine)
+
+    assert SchemaManager(db.metadata).sync(engine) == []
+
+def test_not_null_columns_without_a_server_default_are_skipped(engine):
+    metadata = MetaData()
+    Table(
+        'tasks', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('status', String(20), nullable=False),
+        Column('label', String(20), nullable=False, server_default='none')
+    )
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE tasks (id INTEGER PRIMARY KEY)'))
+
+    assert SchemaManager(metadata).sync(engine) == ['tasks.label']
+    assert column_names(engine, 'tasks') == ['id', 'label']
+
+def test_add_column_statement_on_postgresql():
+    from sqlalchemy.dialects import postgresql
+
+    class Conn:
+        dialect = postgresql.dialect()
+
+    column = db.metadata.tables['task_github_links'].c.comment_id
+    assert SchemaManager(db.metadata).add_column_statement(column, Conn()) == \
+        'ALTER TABLE task_github_links ADD COLUMN comment_id BIGINT'
@@ -107,17 +107,11 @@ def test_apply_api_usage_logger(reset_usage_stats):
         before_funcs = test_app.before_request_funcs.get(None, [])
         after_funcs = test_app.after_request_funcs.get(None, [])
         
-        # Check that handlers were registered
-        assert len(before_funcs) == 1
+        # Only usage counting is registered; request timing belongs to the request logger
+        assert len(before_funcs) == 0
         assert len(after_funcs) == 1
         
-        # Test before_request handler
         with test_app.test_request_context(method='GET', path='/api/test'):
-            before_funcs[0]()  # Call the before_request handler
-            
-            # Check if start time was set
-            assert hasattr(g, 'request_start_time')
-            
             # Test after_request handler with a normal API path
             response = jsonify({"success": True})
             
@@ -126,10 +120,8 @@ def test_apply_api_usage_logger(reset_usage_stats):
                       return_value={'user_id': 123}):
                 result = after_funcs[0](response)  # Call the after_request handler
             
-            # Check if logger was called
-            assert mock_logger.info.called
-            assert "API usage:" in mock_logger.info.call_args[0][0]
-            assert "User: 123" in mock_logger.info.call_args[0][0]
+            # The request is logged once by the request logger, not here
+            assert not mock_logger.info.called
             
             # Check that stats were updated using None instead of "None"
             assert None in api_usage_stats  # None endpoint in test context - not a string
@@ -2,6 +2,7 @@ import sys
 import os
 import pytest
 from unittest.mock import patch, Mock
+import flask
 from flask import Flask, jsonify
 
 # Set up proper import paths
@@ -10,8 +11,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.
 # Import after path setup
 from backend.src.api.middlewares.error_handler import (
     APIError, handle_api_error, handle_404_error, 
-    handle_validation_error, handle_generic_error, register_error_handlers
+    handle_validation_error, handle_generic_error, register_error_handlers,
+    handle_dependency_unavailable
 )
+from backend.src.services.circuit_breaker import DependencyUnavailableError
 
 # Create a test Flask app
 app = Flask(__name__)
@@ -141,9 +144,22 @@ def test_register_error_handlers():
         register_error_handlers(test_app)
         
         # Check that handlers were registered
-        assert mock_register.call_count == 3
+        assert mock_register.call_count == 4
         
         # Check specific registrations
         mock_register.assert_any_call(APIError, handle_api_error)
         mock_register.assert_any_call(404, handle_404_error)
-        mock_register.assert_any_call(Exception, handle_generic_error)
\ No newline at end of file
+        mock_register.assert_any_call(Exception, handle_generic_error)
+        mock_register.assert_any_call(DependencyUnavailableError, handle_dependency_unavailable)
+
+def test_handle_dependency_unavailable():
+    """Test that refused dependency calls become 503 with Retry-After"""
+    # Other tests replace flask.jsonify with a mock at import time
+    with app.test_request_context(), \
+         patch('backend.src.api.middlewares.error_handler.jsonify', flask.json.jsonify):
+        error = DependencyUnavailableError('github', 'circuit open', retry_after=12.4)
+        response = handle_dependency_unavailable(error)
+        
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '12'
+        assert response.get_json()['error'] == 'circuit open'
\ No newline at end of file
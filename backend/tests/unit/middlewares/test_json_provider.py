@@ -0,0 +1,112 @@
+import sys
+import os
+import enum
+import uuid
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from flask import Flask
+from unittest.mock import patch
+from sqlalchemy import DateTime, create_engine, literal, select
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.api.middlewares import json_provider as json_provider_module
+from backend.src.api.middlewares.json_provider import (
+    OrjsonProvider, StdlibJSONProvider, apply_json_provider, json_provider_class
+)
+
+class Status(enum.Enum):
+    DONE = 'done'
+
+def task_rows():
+    statement = select(
+        literal(1).label('id'),
+        literal('Write docs').label('title'),
+        literal(datetime(2025, 1, 15, 12, 0, 0, 250000), type_=DateTime).label('updated_at'),
+        literal(None, type_=DateTime).label('deadline')
+    )
+    with create_engine('sqlite://').connect() as conn:
+        return conn.execute(statement).all()
+
+def make_app(provider='auto', debug=False):
+    app = Flask(__name__)
+    app.config['JSON_PROVIDER'] = provider
+    app.debug = debug
+    apply_json_provider(app)
+
+    @app.route('/tasks')
+    def tasks():
+        return {'tasks': task_rows(), 'generated_on': date(2025, 1, 15)}
+
+    return app
+
+PAYLOAD = {
+    'when': datetime(2025, 1, 15, 12, 0),
+    'day': date(2025, 1, 15),
+    'amount': Decimal('12.50'),
+    'ref': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'status': Status.DONE,
+    3: 'int key'
+}
+
+EXPECTED = {
+    'when': '2025-01-15T12:00:00',
+    'day': '2025-01-15',
+    'amount': '12.50',
+    'ref': '12345678-1234-5678-1234-567812345678',
+    'status': 'done',
+    '3': 'int key'
+}
+
+@pytest.mark.parametrize('provider', ['orjson', 'stdlib'])
+def test_providers_encode_the_same_documents(provider):
+    app = make_app(provider)
+
+    assert app.json.loads(app.json.dumps(PAYLOAD)) == EXPECTED
+
+@pytest.mark.parametrize('provider', ['orjson', 'stdlib'])
+def test_rows_serialize_by_label_with_iso_datetimes(provider):
+    response = make_app(provider).test_client().get('/tasks')
+
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == {
+        'tasks': [{'id': 1, 'title': 'Write docs', 'updated_at': '2025-01-15T12:00:00.250000', 'deadline': None}],
+        'generated_on': '2025-01-15'
+    }
+
+def test_keys_keep_their_order():
+    app = make_app('orjson')
+
+    assert app.json.dumps({'b': 1, 'a': 2}) == '{"b":1,"a":2}'
+
+def test_debug_responses_are_indented():
+    compact = make_app('orjson').test_client().get('/tasks').get_data(as_text=True)
+    indented = make_app('orjson', debug=True).test_client().get('/tasks').get_data(as_text=True)
+
+    assert '\n  "tasks"' in indented
+    assert compact.count('\n') == 1
+
+def test_request_bodies_are_parsed_by_the_provider():
+    app = make_app('orjson')
+
+    assert app.json.loads(b'{"title": "Write docs", "ids": [1, 2]}') == {'title': 'Write docs', 'ids': [1, 2]}
+
+def test_encoder_arguments_fall_back_to_the_standard_library():
+    app = make_app('orjson')
+
+    assert app.json.dumps({'a': 1}, indent=4) == '{\n    "a": 1\n}'
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(TypeError):
+        make_app('orjson').json.dumps({'value': object()})
+
+def test_provider_selection():
+    assert json_provider_class('auto') is OrjsonProvider
+    assert json_provider_class('stdlib') is StdlibJSONProvider
+
+    with patch.object(json_provider_module, 'orjson', None):
+        assert json_provider_class('auto') is StdlibJSONProvider
+        with pytest.raises(RuntimeError):
+            json_provider_class('orjson')
@@ -0,0 +1,124 @@
+import sys
+import os
+import pytest
+import flask
+from flask import Flask
+from unittest.mock import patch
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.api.middlewares import load_shedder as load_shedder_module
+from backend.src.api.middlewares.load_shedder import (
+    LoadShedder, apply_load_shedding, load_shedder, CRITICAL, NORMAL, LOW
+)
+
+CRITICAL_ROUTES = ['* /api/v1/auth/*', 'POST /api/v1/tasks*']
+LOW_PRIORITY_ROUTES = ['GET /api/v1/admin/stats', 'GET /api/v1/github/repositories*']
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def shedder(clock):
+    return LoadShedder(max_in_flight=4, low_priority_share=0.5, low_priority_concurrency=1,
+                       latency_target=1.0, critical_routes=CRITICAL_ROUTES,
+                       low_priority_routes=LOW_PRIORITY_ROUTES, clock=clock)
+
+def test_classify_routes(shedder):
+    assert shedder.classify('POST', '/api/v1/auth/login') == CRITICAL
+    assert shedder.classify('POST', '/api/v1/tasks') == CRITICAL
+    assert shedder.classify('GET', '/api/v1/tasks') == NORMAL
+    assert shedder.classify('GET', '/api/v1/admin/stats') == LOW
+    assert shedder.classify('GET', '/api/v1/github/repositories/3/issues') == LOW
+
+def test_saturation_sheds_by_priority(shedder):
+    # Two requests in flight is half of max_in_flight: low priority is refused
+    assert shedder.admit('tasks.get', NORMAL) == (True, 0)
+    assert shedder.admit('tasks.get', NORMAL) == (True, 0)
+    assert shedder.admit('admin.stats', LOW)[0] is False
+
+    # At max_in_flight normal routes are refused too, but critical ones still get in
+    assert shedder.admit('tasks.get', NORMAL) == (True, 0)
+    assert shedder.admit('tasks.get', NORMAL) == (True, 0)
+    assert shedder.admit('tasks.get', NORMAL)[0] is False
+    assert shedder.admit('auth.login', CRITICAL) == (True, 0)
+
+    assert shedder.snapshot()['shed'] == 2
+    assert shedder.snapshot()['endpoints']['admin.stats']['shed'] == 1
+
+def test_low_priority_concurrency_cap(shedder):
+    assert shedder.admit('github.repositories', LOW) == (True, 0)
+    assert shedder.admit('github.repositories', LOW)[0] is False
+
+    shedder.release('github.repositories', LOW, 0.2)
+    assert shedder.admit('github.repositories', LOW) == (True, 0)
+
+def test_slow_protected_traffic_sheds_low_priority(shedder, clock):
+    for _ in range(20):
+        shedder.admit('tasks.get', NORMAL)
+        shedder.release('tasks.get', NORMAL, 3.0)
+
+    admitted, retry_after = shedder.admit('admin.stats', LOW)
+    assert admitted is False
+    assert retry_after == 3
+    assert shedder.admit('tasks.get', NORMAL) == (True, 0)
+
+    # Slow samples stop counting once they are older than the latency window
+    clock.now += LoadShedder.latency_window
+    assert shedder.admit('admin.stats', LOW) == (True, 0)
+
+def test_slow_low_priority_routes_do_not_shed_themselves(shedder):
+    for _ in range(5):
+        shedder.admit('admin.stats', LOW)
+        shedder.release('admin.stats', LOW, 5.0)
+
+    assert shedder.admit('admin.stats', LOW) == (True, 0)
+
+@pytest.fixture
+def shed_app():
+    app = Flask(__name__)
+    app.config.update({
+        'TESTING': True,
+        'LOAD_SHED_MAX_IN_FLIGHT': 4,
+        'LOAD_SHED_CRITICAL_ROUTES': CRITICAL_ROUTES,
+        'LOAD_SHED_LOW_PRIORITY_ROUTES': LOW_PRIORITY_ROUTES
+    })
+    apply_load_shedding(app)
+
+    @app.route('/api/v1/admin/stats')
+    def stats():
+        return 'stats'
+
+    @app.route('/api/v1/tasks', methods=['GET', 'POST'])
+    def tasks():
+        return 'tasks'
+
+    # Other tests replace these module globals with mocks
+    with patch.object(load_shedder_module, 'jsonify', flask.json.jsonify), \
+         patch.object(load_shedder_module, 'request', flask.globals.request):
+        yield app
+    load_shedder.configure(64, 0.5, 4, 1.0, [], [])
+
+def test_saturated_worker_returns_503_for_low_priority(shed_app):
+    client = shed_app.test_client()
+    assert client.get('/api/v1/admin/stats').status_code == 200
+    assert load_shedder.in_flight == 0
+
+    # Simulate two requests already being served by this worker
+    load_shedder.in_flight = 2
+
+    response = client.get('/api/v1/admin/stats')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert client.get('/api/v1/tasks').status_code == 200
+    assert client.post('/api/v1/tasks').status_code == 200
+    assert load_shedder.in_flight == 2
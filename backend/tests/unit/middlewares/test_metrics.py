@@ -0,0 +1,118 @@
+import sys
+import os
+import json
+import pytest
+import flask
+from flask import Flask
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.api.middlewares import metrics as metrics_module
+from backend.src.api.middlewares.metrics import (
+    MetricsRegistry, apply_metrics, histogram_quantile, metrics, LATENCY_BUCKETS
+)
+
+def test_histogram_quantile_interpolates_within_bucket():
+    buckets = (0.1, 0.2, 0.4)
+    counts = [50, 40, 10, 0]
+
+    assert histogram_quantile(0.5, buckets, counts) == pytest.approx(0.1)
+    assert histogram_quantile(0.7, buckets, counts) == pytest.approx(0.15)
+    assert histogram_quantile(0.95, buckets, counts) == pytest.approx(0.3)
+    assert histogram_quantile(0.5, buckets, [0, 0, 0, 0]) is None
+    # Values past the last bucket are reported at its bound
+    assert histogram_quantile(0.99, buckets, [0, 0, 0, 5]) == 0.4
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    for _ in range(9):
+        registry.observe_request('/api/v1/tasks', 'GET', 200, 0.01, 2)
+    registry.observe_request('/api/v1/tasks', 'GET', 500, 2.0, 40)
+    registry.track_in_flight('/api/v1/tasks', 1)
+
+    text_output = registry.render()
+
+    assert 'http_requests_total{route="/api/v1/tasks",method="GET",status="200"} 9' in text_output
+    assert 'http_requests_total{route="/api/v1/tasks",method="GET",status="500"} 1' in text_output
+    assert 'http_requests_in_flight{route="/api/v1/tasks"} 1' in text_output
+    assert 'http_request_duration_seconds_bucket{route="/api/v1/tasks",method="GET",le="+Inf"} 10' in text_output
+    assert 'http_request_duration_seconds_count{route="/api/v1/tasks",method="GET"} 10' in text_output
+    assert 'db_queries_per_request_sum{route="/api/v1/tasks",method="GET"} 58.0' in text_output
+    assert 'quantile="0.5"' in text_output and 'quantile="0.99"' in text_output
+
+def test_multiprocess_directory_merges_workers(tmp_path):
+    registry = MetricsRegistry()
+    registry.configure(str(tmp_path))
+    registry.observe_request('/api/v1/tasks', 'GET', 200, 0.01, 1)
+    registry.track_in_flight('/api/v1/tasks', 1)
+
+    # A worker that has since exited left its snapshot behind
+    other = MetricsRegistry()
+    other.observe_request('/api/v1/tasks', 'GET', 200, 0.02, 3)
+    other.track_in_flight('/api/v1/tasks', 5)
+    snapshot = other.snapshot()
+    snapshot['pid'] = 999999999
+    (tmp_path / 'metrics_999999999.json').write_text(json.dumps(snapshot))
+
+    merged = registry.collect()
+
+    assert merged['requests'][('/api/v1/tasks', 'GET', '200')] == 2
+    assert sum(merged['latency'][('/api/v1/tasks', 'GET')][0]) == 2
+    assert merged['queries'][('/api/v1/tasks', 'GET')][1] == 4
+    # Gauges only count workers that are still running
+    assert merged['in_flight'] == {'/api/v1/tasks': 1}
+    assert (tmp_path / f'metrics_{os.getpid()}.json').exists()
+
+@pytest.fixture
+def metrics_app():
+    app = Flask(__name__)
+    app.config.update({'TESTING': True, 'METRICS_AUTH_TOKEN': 'scrape-token'})
+    engine = create_engine('sqlite://')
+    apply_metrics(app)
+    metrics.reset()
+
+    @app.route('/api/v1/tasks/<int:task_id>')
+    def task(task_id):
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+            conn.execute(text('SELECT 2'))
+        return 'task'
+
+    # Other tests replace this module global with a mock
+    with patch.object(metrics_module, 'request', flask.globals.request):
+        yield app
+    metrics.reset()
+
+def test_requests_are_recorded_per_route(metrics_app):
+    client = metrics_app.test_client()
+    client.get('/api/v1/tasks/1')
+    client.get('/api/v1/tasks/2')
+    client.get('/nowhere')
+
+    snapshot = metrics.collect()
+    assert snapshot['requests'][('/api/v1/tasks/<int:task_id>', 'GET', '200')] == 2
+    assert snapshot['requests'][('unmatched', 'GET', '404')] == 1
+    assert snapshot['queries'][('/api/v1/tasks/<int:task_id>', 'GET')][1] == 4
+    assert snapshot['in_flight']['/api/v1/tasks/<int:task_id>'] == 0
+
+    assert client.get('/metrics').status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'})
+    assert response.status_code == 200
+    assert 'route="/api/v1/tasks/<int:task_id>"' in response.get_data(as_text=True)
+
+@pytest.mark.parametrize('config, status', [
+    ({}, 403),
+    ({'METRICS_PUBLIC': True}, 200),
+    ({'TESTING': True}, 200),
+    ({'METRICS_AUTH_TOKEN': 'scrape-token', 'METRICS_PUBLIC': True}, 401)
+])
+def test_metrics_need_a_token_unless_made_public(config, status):
+    app = Flask(__name__)
+    app.config.update(config)
+    apply_metrics(app)
+
+    with patch.object(metrics_module, 'request', flask.globals.request):
+        assert app.test_client().get('/metrics').status_code == status
@@ -0,0 +1,81 @@
+import sys
+import os
+import pytest
+import flask
+from flask import Flask, g
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.api.middlewares import query_stats as query_stats_module
+from backend.src.api.middlewares.query_stats import (
+    apply_query_stats, statement_shape, NPlusOneError
+)
+
+def test_statement_shape_ignores_values():
+    assert statement_shape("SELECT * FROM comments WHERE user_id = 7 AND body = 'it''s'") == \
+        "SELECT * FROM comments WHERE user_id = ? AND body = ?"
+    assert statement_shape("SELECT * FROM users\n  WHERE id IN (?, ?, ?)") == \
+        statement_shape("SELECT * FROM users WHERE id IN (%(id_1)s)")
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)'))
+        conn.execute(text("INSERT INTO users (id, name) VALUES (1, 'a'), (2, 'b'), (3, 'c')"))
+    return engine
+
+def make_app(engine, **config):
+    app = Flask(__name__)
+    app.config.update({'TESTING': True, 'QUERY_STATS_SERVER_TIMING': True, 'N_PLUS_ONE_THRESHOLD': 3, **config})
+    apply_query_stats(app)
+    captured = {}
+
+    @app.route('/comments')
+    def comments():
+        # One query per comment author, the N+1 shape
+        with engine.connect() as conn:
+            conn.execute(text('SELECT id FROM users'))
+            for user_id in (1, 2, 3):
+                conn.execute(text('SELECT name FROM users WHERE id = :id'), {'id': user_id})
+        return 'ok'
+
+    @app.teardown_request
+    def capture_fields(exc):
+        captured['fields'] = dict(g.get('request_log_fields', {}))
+
+    return app, captured
+
+def test_request_stats_and_server_timing(engine):
+    app, captured = make_app(engine)
+
+    with patch.object(query_stats_module, 'logger') as logger:
+        response = app.test_client().get('/comments')
+
+    assert response.status_code == 200
+    assert response.headers['Server-Timing'].startswith('db;dur=')
+    assert 'desc="4 queries"' in response.headers['Server-Timing']
+
+    fields = captured['fields']
+    assert fields['db_queries'] == 4
+    assert fields['db_time_ms'] >= fields['db_slowest_ms'] >= 0
+    assert fields['db_slowest_statement'].startswith('SELECT')
+    assert fields['n_plus_one'] == [{'statement': 'SELECT name FROM users WHERE id = ?', 'count': 3}]
+    assert 'Possible N+1 queries' in logger.warning.call_args[0][0]
+
+def test_n_plus_one_fails_requests_in_ci_mode(engine):
+    app, _ = make_app(engine, N_PLUS_ONE_RAISE=True)
+
+    # Other tests replace the module's request global with a mock
+    with patch.object(query_stats_module, 'request', flask.globals.request):
+        with pytest.raises(NPlusOneError, match='GET /comments'):
+            app.test_client().get('/comments')
+
+def test_failed_statements_do_not_leak_timers(engine):
+    with engine.connect() as conn:
+        with pytest.raises(Exception):
+            conn.execute(text('SELECT * FROM missing_table'))
+        assert not conn.info.get('query_start_time')
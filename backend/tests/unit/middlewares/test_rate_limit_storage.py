@@ -0,0 +1,117 @@
+import sys
+import os
+import threading
+import pytest
+from flask import Flask
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.api.middlewares.rate_limit_storage import (
+    MemoryRateLimitStorage, SQLiteRateLimitStorage, RedisRateLimitStorage, create_rate_limit_storage
+)
+from backend.src.api.middlewares.rate_limiter import RateLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def storage(request, clock, tmp_path):
+    if request.param == 'memory':
+        return MemoryRateLimitStorage(clock=clock)
+    return SQLiteRateLimitStorage(str(tmp_path / 'rate_limits.db'), clock=clock)
+
+def test_sliding_window_weights_previous_window(storage, clock):
+    # Fill the first 60-second window
+    for _ in range(10):
+        assert storage.hit('client', 10, 60) == (True, 0)
+    assert storage.hit('client', 10, 60) == (False, 60)
+
+    # A quarter into the next window, 75% of the previous count still applies
+    clock.now = 75
+    allowed = sum(storage.hit('client', 10, 60)[0] for _ in range(5))
+    assert allowed == 3
+
+    # Room for one more opens once the previous window's weight drops below 7
+    assert storage.hit('client', 10, 60) == (False, 3)
+
+    # Two windows later the key starts from scratch
+    clock.now = 240
+    assert storage.hit('client', 10, 60) == (True, 0)
+
+def test_keys_are_limited_independently(storage):
+    assert storage.hit('global:ip:1', 1, 60)[0]
+    assert not storage.hit('global:ip:1', 1, 60)[0]
+    assert storage.hit('global:ip:2', 1, 60)[0]
+    assert len(storage) == 2
+
+def test_memory_storage_evicts_idle_and_least_recent_keys(clock):
+    storage = MemoryRateLimitStorage(max_keys=4, stripes=1, clock=clock)
+
+    for client in range(10):
+        storage.hit(f'client-{client}', 1, 60)
+    assert len(storage) == 4
+
+    # The oldest clients were evicted, so their limit starts over
+    assert storage.hit('client-0', 1, 60)[0]
+    assert not storage.hit('client-9', 1, 60)[0]
+
+    # Keys idle for two windows are dropped on the next hit to their stripe
+    clock.now = 180
+    storage.hit('client-new', 1, 60)
+    assert len(storage) == 1
+
+def test_sqlite_counts_are_shared_between_workers(tmp_path):
+    path = str(tmp_path / 'rate_limits.db')
+    workers = [SQLiteRateLimitStorage(path) for _ in range(4)]
+    results = []
+    start = threading.Barrier(8)
+
+    def request(worker):
+        start.wait()
+        results.append(worker.hit('global:ip:1', 5, 60)[0])
+
+    threads = [threading.Thread(target=request, args=(workers[i % 4],)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 5
+
+def test_init_app_selects_storage(tmp_path):
+    app = Flask(__name__)
+    app.config.update({
+        'RATE_LIMIT_STORAGE': 'sqlite',
+        'RATE_LIMIT_SQLITE_PATH': str(tmp_path / 'rate_limits.db')
+    })
+    limiter = RateLimiter()
+
+    limiter.init_app(app)
+
+    assert isinstance(limiter.storage, SQLiteRateLimitStorage)
+    assert app.extensions['rate_limiter'] is limiter
+    assert limiter.hit('global:ip:1', 1, 60) == (True, 0)
+
+def test_unknown_storage_is_rejected():
+    with pytest.raises(ValueError):
+        create_rate_limit_storage({'RATE_LIMIT_STORAGE': 'memcached'})
+
+@pytest.mark.skipif(not os.getenv('TEST_REDIS_URL'), reason='TEST_REDIS_URL not set')
+def test_redis_storage():
+    storage = RedisRateLimitStorage(url=os.getenv('TEST_REDIS_URL'), prefix='devsync:test:rate_limit:')
+    storage.reset()
+
+    assert storage.hit('global:ip:1', 2, 60) == (True, 0)
+    assert storage.hit('global:ip:1', 2, 60) == (True, 0)
+    allowed, retry_after = storage.hit('global:ip:1', 2, 60)
+    assert not allowed and retry_after >= 1
+    assert len(storage) == 1
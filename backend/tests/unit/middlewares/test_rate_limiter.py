@@ -10,8 +10,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.
 
 # Import after path setup
 from backend.src.api.middlewares.rate_limiter import (
-    get_client_identifier, clean_old_requests, rate_limit,
-    apply_global_rate_limit, request_counts, request_timestamps
+    get_client_identifier, rate_limit, apply_global_rate_limit, limiter
 )
 
 # Create a test Flask app
@@ -20,11 +19,9 @@ app = Flask(__name__)
 @pytest.fixture
 def reset_rate_limit_data():
     """Reset rate limit data between tests"""
-    request_counts.clear()
-    request_timestamps.clear()
+    limiter.reset()
     yield
-    request_counts.clear()
-    request_timestamps.clear()
+    limiter.reset()
 
 def test_get_client_identifier_with_jwt():
     """Test getting client identifier with JWT"""
@@ -44,32 +41,6 @@ def test_get_client_identifier_without_jwt():
             client_id = get_client_identifier()
             assert client_id == f"ip:{request.remote_addr}"
 
-def test_clean_old_requests(reset_rate_limit_data):
-    """Test cleaning old request timestamps"""
-    # Set up test data
-    client_id = "test_client"
-    endpoint = "test_endpoint"
-    
-    # Add timestamps - some old, some new
-    current_time = time.time()
-    request_timestamps[client_id][endpoint] = [
-        current_time - 100,  # Old (should be removed)
-        current_time - 30,   # Recent (should be kept)
-        current_time - 10    # Recent (should be kept)
-    ]
-    request_counts[client_id][endpoint] = 3
-    
-    # Run the cleanup with a 60-second window
-    clean_old_requests(client_id, endpoint, 60)
-    
-    # Check that old requests were removed
-    assert len(request_timestamps[client_id][endpoint]) == 2
-    assert request_counts[client_id][endpoint] == 2
-    
-    # All remaining timestamps should be within the window
-    for ts in request_timestamps[client_id][endpoint]:
-        assert current_time - ts < 60
-
 def test_rate_limit_decorator_under_limit(reset_rate_limit_data):
     """Test rate limit decorator when under the limit"""
     with app.test_request_context():
@@ -112,6 +83,7 @@ def test_rate_limit_decorator_exceeding_limit(reset_rate_limit_data):
                         resp, status = response
                         assert status == 429
                         assert "Rate limit exceeded" in resp.get_json()["message"]
+                        assert int(resp.headers["Retry-After"]) > 0
                     else:
                         assert response.status_code == 429
                         assert "Rate limit exceeded" in response.get_json()["message"]
@@ -158,4 +130,19 @@ def test_global_rate_limit(reset_rate_limit_data):
                 assert "Global rate limit exceeded" in resp.get_json()["message"]
             else:
                 assert result.status_code == 429
-                assert "Global rate limit exceeded" in result.get_json()["message"]
\ No newline at end of file
+                assert "Global rate limit exceeded" in result.get_json()["message"]
+
+def test_storage_outage_allows_requests(reset_rate_limit_data):
+    """Test that a failing storage backend does not block traffic"""
+    with app.test_request_context(), \
+         patch.object(limiter, 'storage') as storage, \
+         patch('backend.src.api.middlewares.rate_limiter.get_client_identifier',
+               return_value="test_client"):
+        storage.hit.side_effect = ConnectionError("storage down")
+        
+        @rate_limit(requests_per_window=1, window_seconds=60)
+        def test_route():
+            return "ok"
+        
+        assert test_route() == "ok"
+        assert test_route() == "ok"
@@ -0,0 +1,102 @@
+import sys
+import os
+import pytest
+import flask
+from flask import Flask, jsonify
+from unittest.mock import patch
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.api.middlewares import read_replica as read_replica_module
+from backend.src.api.middlewares.read_replica import (
+    apply_read_replica_routing, read_only, STICKY_COOKIE
+)
+from backend.src.db.models import db, User
+
+def make_app(tmp_path, replica=True, seed=True):
+    """App whose primary and replica are two SQLite files holding different names"""
+    app = Flask(__name__)
+    app.config.update({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+        'SQLALCHEMY_BINDS': {'replica': f"sqlite:///{tmp_path / 'replica.db'}"} if replica else {},
+        'REPLICA_STICKY_SECONDS': 5
+    })
+    db.init_app(app)
+    apply_read_replica_routing(app)
+
+    def first_name():
+        return jsonify({'name': db.session.get(User, 1).name})
+
+    @app.route('/users/1')
+    def get_user():
+        return first_name()
+
+    @app.route('/users/search', methods=['POST'])
+    @read_only()
+    def search_users():
+        return first_name()
+
+    @app.route('/users/sync')
+    @read_only(False)
+    def sync_user():
+        return first_name()
+
+    @app.route('/users/1', methods=['PUT'])
+    def update_user():
+        user = db.session.get(User, 1)
+        user.name = 'updated'
+        db.session.commit()
+        return jsonify({'name': user.name})
+
+    if not seed:
+        return app
+    with app.app_context():
+        engines = [db.engines[None]] + ([db.engines['replica']] if replica else [])
+        for engine, name in zip(engines, ('primary', 'replica')):
+            db.metadata.create_all(engine)
+            with engine.begin() as conn:
+                conn.execute(User.__table__.insert(), {
+                    'id': 1, 'name': name, 'email': 'ada@example.com', 'password': 'x', 'role': 'developer'
+                })
+    return app
+
+@pytest.fixture(autouse=True)
+def unpatched_flask_globals():
+    # Some controller tests patch flask.request and flask.current_app at import time
+    with patch('flask_sqlalchemy.extension.current_app', flask.globals.current_app), \
+         patch.object(read_replica_module, 'request', flask.globals.request):
+        yield
+    # init_app adds a metadata per bind key, which later apps without the bind would create_all
+    db.metadatas.pop('replica', None)
+
+def test_get_requests_read_from_replica(tmp_path):
+    client = make_app(tmp_path).test_client()
+
+    assert client.get('/users/1').json['name'] == 'replica'
+    assert client.post('/users/search').json['name'] == 'replica'
+    assert client.get('/users/sync').json['name'] == 'primary'
+
+def test_writer_reads_own_writes_until_sticky_window_passes(tmp_path):
+    client = make_app(tmp_path).test_client()
+
+    response = client.put('/users/1')
+    assert response.json['name'] == 'updated'
+    assert STICKY_COOKIE in response.headers['Set-Cookie']
+
+    # The write went to the primary and this client now reads from it
+    assert client.get('/users/1').json['name'] == 'updated'
+
+    # Other clients, and this one once the window has passed, use the replica
+    assert make_app(tmp_path, seed=False).test_client().get('/users/1').json['name'] == 'replica'
+    client.set_cookie(STICKY_COOKIE, '1.0')
+    assert client.get('/users/1').json['name'] == 'replica'
+
+def test_without_replica_everything_uses_primary(tmp_path):
+    app = make_app(tmp_path, replica=False)
+    client = app.test_client()
+
+    assert client.get('/users/1').json['name'] == 'primary'
+    response = client.put('/users/1')
+    assert 'Set-Cookie' not in response.headers
@@ -1,14 +1,22 @@
 import sys
 import os
+import io
+import json
+import logging
+import queue
+import time
 import pytest
+import flask
 from unittest.mock import patch, Mock, call
-from flask import Flask, jsonify, g
+from flask import Flask, Response, jsonify, g
 
 # Set up proper import paths
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
 
 # Import after path setup
-from backend.src.api.middlewares.request_logger import log_request, apply_request_logger
+from backend.src.api.middlewares.request_logger import (
+    log_request, apply_request_logger, AsyncRequestLog, DroppingQueueHandler
+)
 
 # Create a test Flask app
 app = Flask(__name__)
@@ -45,6 +53,7 @@ def test_log_request_decorator():
 def test_apply_request_logger():
     """Test applying the request logger to an app"""
     test_app = Flask(__name__)
+    test_app.config['TESTING'] = True
     
     # Mock the logger
     mock_logger = Mock()
@@ -65,21 +74,84 @@ def test_apply_request_logger():
         with test_app.test_request_context(method='GET', path='/test'):
             before_funcs[0]()  # Call the before_request handler
             
-            # Check if start time was set
+            # Check if start time was set, and nothing logged yet
             assert hasattr(g, 'request_start_time')
-            
-            # Check if logger was called
-            assert mock_logger.info.call_count == 1
-            assert "Request started:" in mock_logger.info.call_args[0][0]
+            assert not mock_logger.log.called
             
             # Test after_request handler
-            response = jsonify({"success": True})
+            g.request_log_fields = {'db_queries': 3}
+            response = Response('{"success": true}', status=200, mimetype='application/json')
             result = after_funcs[0](response)  # Call the after_request handler
             
-            # Check if logger was called again
-            assert mock_logger.info.call_count == 2
-            assert "Request completed:" in mock_logger.info.call_args[0][0]
-            assert "Status: 200" in mock_logger.info.call_args[0][0]
+            # Check that a single structured record was logged
+            assert mock_logger.log.call_count == 1
+            level, message = mock_logger.log.call_args[0]
+            fields = mock_logger.log.call_args[1]['extra']['fields']
+            assert level == logging.INFO
+            assert message == "GET /test 200"
+            assert fields['status'] == 200
+            assert fields['path'] == '/test'
+            assert fields['db_queries'] == 3
+            assert fields['slow'] is False
             
             # Check that the original response was returned
-            assert result == response
\ No newline at end of file
+            assert result == response
+
+@pytest.mark.parametrize('status, duration, logged, level', [
+    (200, 0.0, False, None),
+    (404, 0.0, True, logging.WARNING),
+    (500, 0.0, True, logging.ERROR),
+    (200, 2.0, True, logging.WARNING),
+])
+def test_sampling_keeps_errors_and_slow_requests(status, duration, logged, level):
+    """Test that sampled-out successes are dropped but errors and slow requests are not"""
+    test_app = Flask(__name__)
+    test_app.config.update({'TESTING': True, 'REQUEST_LOG_SAMPLE_RATE': 0.0, 'REQUEST_LOG_SLOW_MS': 1000})
+    mock_logger = Mock()
+    
+    # Other tests replace the module's request global with a mock
+    with patch('backend.src.api.middlewares.request_logger.logger', mock_logger), \
+         patch('backend.src.api.middlewares.request_logger.request', flask.globals.request):
+        apply_request_logger(test_app)
+        after_request = test_app.after_request_funcs[None][0]
+        
+        with test_app.test_request_context(method='POST', path='/api/v1/tasks'):
+            g.request_start_time = time.time() - duration
+            after_request(Response('', status=status))
+    
+    assert mock_logger.log.called == logged
+    if logged:
+        assert mock_logger.log.call_args[0][0] == level
+        assert mock_logger.log.call_args[1]['extra']['fields']['sample_rate'] == 1.0
+
+def test_async_request_log_writes_json_off_thread():
+    """Test that records pass through the queue and are formatted as JSON"""
+    stream = io.StringIO()
+    target = logging.getLogger('test.async_request_log')
+    target.setLevel(logging.INFO)
+    request_log = AsyncRequestLog()
+    
+    request_log.start(target, logging.StreamHandler(stream), queue_size=10)
+    try:
+        target.info("GET /api/v1/tasks 200", extra={'fields': {'status': 200, 'duration_ms': 1.5}})
+    finally:
+        # Stopping drains the queue
+        request_log.stop()
+    
+    entry = json.loads(stream.getvalue().strip())
+    assert entry['message'] == "GET /api/v1/tasks 200"
+    assert entry['level'] == 'INFO'
+    assert entry['status'] == 200
+    assert entry['duration_ms'] == 1.5
+    assert target.propagate is True
+
+def test_full_queue_drops_records():
+    """Test that a full queue drops records instead of blocking the request thread"""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord('api.requests', logging.INFO, __file__, 1, 'message', None, None)
+    
+    handler.emit(record)
+    handler.emit(record)
+    
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
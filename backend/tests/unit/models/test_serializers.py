@@ -0,0 +1,88 @@
+import sys
+import os
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.api.serializers import (
+    Serializer, get_serializer, register_serializer, task_serializer,
+    task_completed_serializer, user_serializer, notification_serializer
+)
+from backend.src.db.models.models import User, Task, Notification, db
+
+NOW = datetime(2025, 1, 15, 12, 0)
+
+def make_task(**overrides):
+    fields = dict(
+        id=1, title='Write docs', description='API reference', status='todo', progress=10,
+        assigned_to=2, created_by=1, deadline=None, created_at=NOW, updated_at=NOW, project_id=3
+    )
+    fields.update(overrides)
+    return Task(**fields)
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    db.Model.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+def test_dump_matches_the_task_shape():
+    assert task_serializer.dump(make_task()) == {
+        'id': 1,
+        'title': 'Write docs',
+        'description': 'API reference',
+        'status': 'todo',
+        'progress': 10,
+        'assigned_to': 2,
+        'created_by': 1,
+        'deadline': None,
+        'created_at': '2025-01-15T12:00:00',
+        'updated_at': '2025-01-15T12:00:00'
+    }
+
+def test_fields_can_be_returned_under_another_key():
+    assert task_completed_serializer.dump(make_task()) == {
+        'id': 1, 'title': 'Write docs', 'completed_date': '2025-01-15T12:00:00', 'project_id': 3
+    }
+
+def test_user_shape_leaves_out_the_password():
+    user = User(id=1, name='Ada', email='ada@example.com', password='hash', role='admin', created_at=NOW)
+
+    assert user_serializer.dump(user) == {
+        'id': 1, 'name': 'Ada', 'email': 'ada@example.com', 'role': 'admin',
+        'github_username': None, 'created_at': '2025-01-15T12:00:00'
+    }
+    assert 'password' not in user_serializer.keys
+
+def test_notification_shape_matches_to_dict():
+    notification = Notification(
+        id=1, user_id=2, notification_type='task_assigned', title='Task assigned', message='Write docs',
+        reference_id='42', is_read=False, created_at=NOW, read_at=None
+    )
+
+    assert notification_serializer.dump(notification) == notification.to_dict()
+
+def test_select_returns_rows_keyed_by_response_key(session):
+    session.add(User(id=1, name='Ada', email='ada@example.com', password='hash', role='admin'))
+    session.add(make_task(deadline=NOW))
+    session.commit()
+
+    query = task_completed_serializer.select(session.query(Task))
+    row = query.one()
+
+    assert 'password' not in str(user_serializer.select(session.query(User)))
+    assert row._asdict() == {'id': 1, 'title': 'Write docs', 'completed_date': NOW, 'project_id': 3}
+
+def test_single_field_shapes():
+    assert Serializer(Task, ['created_at']).dump(make_task()) == {'created_at': '2025-01-15T12:00:00'}
+
+def test_registry():
+    assert get_serializer('task') is task_serializer
+
+    with pytest.raises(ValueError):
+        register_serializer('task', Task, 'id')
@@ -0,0 +1,106 @@
+import sys
+import os
+import threading
+import pytest
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.services.circuit_breaker import CircuitBreaker, Bulkhead, DependencyUnavailableError
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker('test', failure_rate_threshold=0.5, slow_call_threshold=1.0,
+                          window_size=10, minimum_calls=4, open_seconds=30, clock=clock)
+
+def test_opens_when_failure_rate_reached(breaker):
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+def test_needs_minimum_calls_before_opening(breaker):
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_slow_calls_count_as_failures(breaker):
+    for _ in range(4):
+        breaker.record_success(duration=2.5)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_half_open_trial_closes_circuit(breaker, clock):
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.retry_after() == 30
+
+    clock.now = 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    # Only one trial call at a time
+    assert not breaker.allow_request()
+
+    breaker.record_success(duration=0.1)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+    assert breaker.snapshot()['window_calls'] == 0
+
+def test_half_open_failure_reopens_circuit(breaker, clock):
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 31
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+
+    snapshot = breaker.snapshot()
+    assert snapshot['state'] == CircuitBreaker.OPEN
+    assert snapshot['times_opened'] == 2
+    assert snapshot['retry_after'] == 30
+
+def test_bulkhead_limits_concurrency():
+    bulkhead = Bulkhead('test', max_concurrent=2, max_wait=0.01)
+    release = threading.Event()
+    entered = threading.Barrier(3)
+
+    def hold_slot():
+        with bulkhead.acquire():
+            entered.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=hold_slot) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    entered.wait()
+
+    assert bulkhead.snapshot()['in_use'] == 2
+    with pytest.raises(DependencyUnavailableError):
+        with bulkhead.acquire():
+            pass
+
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    snapshot = bulkhead.snapshot()
+    assert snapshot['in_use'] == 0
+    assert snapshot['rejected'] == 1
+    with bulkhead.acquire():
+        assert bulkhead.snapshot()['in_use'] == 1
@@ -3,13 +3,18 @@ import os
 import unittest
 from unittest.mock import patch, MagicMock
 import json
+import re
+import threading
+import time
 import requests
-from flask import Flask
+import flask
+from flask import Flask, Blueprint
 
 # Set up proper import paths
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
 
-from backend.src.services.github_client import GitHubClient
+from backend.src.services.github_client import GitHubClient, PageFetchError, TruncatedListing
+from backend.src.services.circuit_breaker import CircuitBreaker, DependencyUnavailableError
 
 class TestGitHubClient(unittest.TestCase):
     def setUp(self):
@@ -33,7 +38,7 @@ class TestGitHubClient(unittest.TestCase):
         self.assertIn('state=test_state', auth_url)
         self.assertIn('scope=repo user', auth_url)
 
-    @patch('backend.src.services.github_client.requests.post')
+    @patch('backend.src.services.github_client.requests.request')
     def test_exchange_code_for_token_success(self, mock_post):
         # Mock successful response
         mock_response = MagicMock()
@@ -49,8 +54,11 @@ class TestGitHubClient(unittest.TestCase):
         
         self.assertEqual(token_data['access_token'], 'test_access_token')
         mock_post.assert_called_once()
+        self.assertEqual(mock_post.call_args.args, ('POST', GitHubClient.TOKEN_URL))
+        self.assertEqual(mock_post.call_args.kwargs['headers'], {'Accept': 'application/json'})
+        self.assertEqual(mock_post.call_args.kwargs['timeout'], GitHubClient.timeout)
         
-    @patch('backend.src.services.github_client.requests.post')
+    @patch('backend.src.services.github_client.requests.request')
     def test_exchange_code_for_token_failure(self, mock_post):
         # Mock failed response
         mock_response = MagicMock()
@@ -178,5 +186,392 @@ class TestGitHubClient(unittest.TestCase):
             headers=self.client.get_headers()
         )
 
+class TestGitHubClientPagination(unittest.TestCase):
+    def setUp(self):
+        GitHubClient._cache.clear()
+        GitHubClient._cache_expiry.clear()
+        self.client = GitHubClient(access_token='test_token')
+
+    def tearDown(self):
+        GitHubClient._cache.clear()
+        GitHubClient._cache_expiry.clear()
+
+    def test_parse_last_page(self):
+        header = ('<https://api.github.com/user/repos?page=2&per_page=30>; rel="next", '
+                  '<https://api.github.com/user/repos?page=14&per_page=30>; rel="last"')
+        self.assertEqual(GitHubClient._parse_last_page(header), 14)
+        self.assertIsNone(GitHubClient._parse_last_page(
+            '<https://api.github.com/user/repos?page=2>; rel="next"'))
+        self.assertIsNone(GitHubClient._parse_last_page(None))
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_iter_pages_fetches_remaining_pages_concurrently(self, mock_request):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def fake_request(method, url, headers=None, params=None, timeout=None):
+            page = params['page']
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+            response = MagicMock()
+            response.status_code = 200
+            response.headers = {
+                'Link': f'<{url}?page=6&per_page=2>; rel="last"' if page == 1 else ''
+            }
+            response.json.return_value = [{'id': page * 10 + 1}, {'id': page * 10 + 2}]
+            return response
+
+        mock_request.side_effect = fake_request
+
+        pages = list(self.client.iter_user_repositories(per_page=2, max_in_flight=2))
+
+        self.assertEqual(len(pages), 6)
+        # Pages come back in order even though they are fetched concurrently
+        self.assertEqual([page[0]['id'] for page in pages], [11, 21, 31, 41, 51, 61])
+        self.assertEqual(mock_request.call_count, 6)
+        self.assertGreater(state['peak'], 1)
+        self.assertLessEqual(state['peak'], 2)
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_iter_pages_respects_page_cap(self, mock_request):
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {'Link': '<https://api.github.com/x?page=500>; rel="last"'}
+        response.json.return_value = [{'id': 1}]
+        mock_request.return_value = response
+
+        pages = list(self.client.iter_repository_pulls('owner', 'repo1', max_pages=3))
+
+        self.assertEqual(pages[:3], [[{'id': 1}]] * 3)
+        # The cap is reported after the last page fetched
+        self.assertIsInstance(pages[3], TruncatedListing)
+        self.assertEqual((pages[3].pages, pages[3].last_page), (3, 500))
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_iter_pages_raises_on_a_failed_page(self, mock_request):
+        def fake_request(method, url, headers=None, params=None, timeout=None):
+            response = MagicMock()
+            response.status_code = 502 if params['page'] == 3 else 200
+            response.headers = {'Link': f'<{url}?page=5>; rel="last"'}
+            response.json.return_value = [{'id': params['page']}]
+            return response
+
+        mock_request.side_effect = fake_request
+
+        pages = self.client.iter_repository_issues('owner', 'repo1', max_in_flight=2)
+
+        self.assertEqual([next(pages), next(pages)], [[{'id': 1}], [{'id': 2}]])
+        with self.assertRaises(PageFetchError) as raised:
+            next(pages)
+        self.assertEqual(raised.exception.page, 3)
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_iter_pages_single_page(self, mock_request):
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {}
+        response.json.return_value = [{'id': 1}]
+        mock_request.return_value = response
+
+        pages = list(self.client.iter_repository_issues('owner', 'repo1'))
+
+        self.assertEqual(pages, [[{'id': 1}]])
+        mock_request.assert_called_once()
+
+class TestStreamAllPages(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def stream(self, pages):
+        from backend.src.api.controllers.github_controller import _stream_all_pages
+
+        with self.app.test_request_context():
+            response = _stream_all_pages(pages, lambda item: {'id': item['id']})
+            return [json.loads(line) for line in ''.join(response.response).splitlines()]
+
+    def test_complete_listing(self):
+        self.assertEqual(self.stream(iter([[{'id': 1}], [{'id': 2}]])), [{'id': 1}, {'id': 2}])
+
+    def test_failed_page_ends_with_an_error_line(self):
+        def pages():
+            yield [{'id': 1}]
+            raise PageFetchError(2, 'GitHub returned an error response')
+
+        lines = self.stream(pages())
+
+        self.assertEqual(lines[0], {'id': 1})
+        self.assertEqual(lines[1], {'error': 'GitHub page 2 could not be fetched: GitHub returned an error response'})
+        self.assertEqual(len(lines), 2)
+
+    def test_unavailable_dependency_ends_with_an_error_line(self):
+        def pages():
+            yield [{'id': 1}]
+            raise DependencyUnavailableError('github', 'circuit open')
+
+        self.assertEqual(self.stream(pages())[-1], {'error': 'github is unavailable: circuit open'})
+
+    def test_capped_listing_ends_with_a_truncated_line(self):
+        lines = self.stream(iter([[{'id': 1}], [{'id': 2}], TruncatedListing(2, 9)]))
+
+        self.assertEqual(lines, [{'id': 1}, {'id': 2}, {'truncated': True, 'pages': 2, 'last_page': 9}])
+
+# Recorded GraphQL nodes, keyed by (owner, repo, number)
+RECORDED_NODES = {
+    ('octo', 'devsync', 7): {
+        '__typename': 'Issue', 'number': 7, 'title': 'Fix login redirect',
+        'state': 'CLOSED', 'url': 'https://github.com/octo/devsync/issues/7'
+    },
+    ('octo', 'devsync', 42): {
+        '__typename': 'PullRequest', 'number': 42, 'title': 'Add webhook receiver',
+        'state': 'MERGED', 'merged': True, 'url': 'https://github.com/octo/devsync/pull/42',
+        'commits': {'nodes': [{'commit': {'statusCheckRollup': {'state': 'SUCCESS'}}}]}
+    },
+    ('octo', 'docs', 3): {
+        '__typename': 'PullRequest', 'number': 3, 'title': 'Update README',
+        'state': 'OPEN', 'merged': False, 'url': 'https://github.com/octo/docs/pull/3',
+        'commits': {'nodes': [{'commit': {'statusCheckRollup': None}}]}
+    }
+}
+
+REPOSITORY_PATTERN = re.compile(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\) \{(.*?)\}\s*$', re.M)
+NODE_PATTERN = re.compile(r'(n\d+): issueOrPullRequest\(number: (\d+)\)')
+
+def stub_graphql_endpoint(method, url, headers=None, json=None, timeout=None):
+    """Answer an aliased status query from RECORDED_NODES the way GitHub does"""
+    data, errors = {}, []
+    for repo_alias, owner, name, fields in REPOSITORY_PATTERN.findall(json['query']):
+        data[repo_alias] = {}
+        for node_alias, number in NODE_PATTERN.findall(fields):
+            node = RECORDED_NODES.get((owner, name, int(number)))
+            data[repo_alias][node_alias] = node
+            if node is None:
+                errors.append({'type': 'NOT_FOUND', 'message': f'Could not resolve number {number}'})
+
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {'data': data, 'errors': errors} if errors else {'data': data}
+    return response
+
+class TestGitHubClientGraphQL(unittest.TestCase):
+    def setUp(self):
+        self.client = GitHubClient(access_token='test_token')
+
+    def test_build_status_query_aliases_by_repository(self):
+        query, aliases = GitHubClient._build_status_query([
+            ('octo', 'devsync', 7), ('octo', 'docs', 3), ('octo', 'devsync', 42)
+        ])
+
+        self.assertEqual(aliases, {'r0': ('octo', 'devsync'), 'r1': ('octo', 'docs')})
+        self.assertIn('r0: repository(owner: "octo", name: "devsync") '
+                      '{ n7: issueOrPullRequest(number: 7) { ...LinkStatus } '
+                      'n42: issueOrPullRequest(number: 42) { ...LinkStatus } }', query)
+        self.assertIn('fragment LinkStatus on IssueOrPullRequest', query)
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_get_issue_statuses(self, mock_request):
+        mock_request.side_effect = stub_graphql_endpoint
+
+        statuses = self.client.get_issue_statuses([
+            ('octo', 'devsync', 7), ('octo', 'devsync', 42), ('octo', 'docs', 3),
+            ('octo', 'devsync', 7), ('octo', 'devsync', 999)
+        ])
+
+        mock_request.assert_called_once()
+        self.assertEqual(mock_request.call_args[0][:2], ('POST', GitHubClient.GRAPHQL_URL))
+        self.assertEqual(set(statuses), {('octo', 'devsync', 7), ('octo', 'devsync', 42), ('octo', 'docs', 3)})
+        self.assertEqual(statuses[('octo', 'devsync', 7)]['state'], 'closed')
+        self.assertEqual(statuses[('octo', 'devsync', 7)]['type'], 'issue')
+        self.assertTrue(statuses[('octo', 'devsync', 42)]['merged'])
+        self.assertEqual(statuses[('octo', 'devsync', 42)]['checks'], 'success')
+        self.assertIsNone(statuses[('octo', 'docs', 3)]['checks'])
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_get_issue_statuses_batches_queries(self, mock_request):
+        mock_request.side_effect = stub_graphql_endpoint
+        refs = [('octo', 'devsync', number) for number in range(1, 251)]
+
+        self.client.get_issue_statuses(refs)
+
+        self.assertEqual(mock_request.call_count, 3)
+        node_counts = [len(NODE_PATTERN.findall(call.kwargs['json']['query']))
+                       for call in mock_request.call_args_list]
+        self.assertEqual(node_counts, [100, 100, 50])
+
+class TestGitHubClientCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        GitHubClient._cache.clear()
+        GitHubClient._cache_expiry.clear()
+        GitHubClient.configure_resilience({'GITHUB_BREAKER_MINIMUM_CALLS': 2, 'GITHUB_BREAKER_WINDOW_SIZE': 4})
+        self.client = GitHubClient(access_token='test_token')
+
+    def tearDown(self):
+        GitHubClient._cache.clear()
+        GitHubClient._cache_expiry.clear()
+        GitHubClient.configure_resilience({})
+
+    def server_error(self):
+        response = MagicMock()
+        response.status_code = 502
+        response.headers = {}
+        response.text = 'Bad Gateway'
+        return response
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_requests_use_the_configured_timeout(self, mock_request):
+        GitHubClient.configure_resilience({'GITHUB_REQUEST_TIMEOUT': 2.5})
+        mock_request.return_value = MagicMock(status_code=200, headers={})
+
+        self.client.get_repository('owner', 'repo1')
+
+        self.assertEqual(mock_request.call_args.kwargs['timeout'], 2.5)
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_timeouts_count_as_failures(self, mock_request):
+        mock_request.side_effect = requests.Timeout('read timed out')
+
+        with self.assertRaises(requests.Timeout):
+            self.client._send('GET', 'https://api.github.com/repos/owner/repo1')
+        with self.assertRaises(requests.Timeout):
+            self.client._send('GET', 'https://api.github.com/repos/owner/repo2')
+
+        self.assertEqual(GitHubClient.breaker.state, CircuitBreaker.OPEN)
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_server_errors_open_the_circuit(self, mock_request):
+        mock_request.return_value = self.server_error()
+
+        self.client.get_repository('owner', 'repo1')
+        self.client.get_repository('owner', 'repo2')
+
+        self.assertEqual(GitHubClient.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(DependencyUnavailableError):
+            self.client.get_repository('owner', 'repo3')
+        # The open circuit fails fast without calling GitHub
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_open_circuit_serves_stale_cache(self, mock_request):
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {}
+        response.json.return_value = {'id': 1, 'name': 'repo1'}
+        mock_request.return_value = response
+        self.client.get_repository('owner', 'repo1')
+
+        # Expire the cached entry, then take GitHub down
+        for key in GitHubClient._cache_expiry:
+            GitHubClient._cache_expiry[key] = GitHubClient._cache_expiry[key].replace(year=2000)
+        mock_request.return_value = self.server_error()
+        self.client.get_repository('owner', 'repo2')
+        self.assertEqual(GitHubClient.breaker.state, CircuitBreaker.OPEN)
+
+        repo = self.client.get_repository('owner', 'repo1')
+
+        self.assertEqual(repo['name'], 'repo1')
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_health_reports_breaker_and_bulkhead(self):
+        health = GitHubClient.health()
+
+        self.assertEqual(health['circuit']['state'], CircuitBreaker.CLOSED)
+        self.assertEqual(health['bulkhead']['max_concurrent'], 10)
+        self.assertEqual(health['bulkhead']['in_use'], 0)
+
+class TestGitHubClientEndpoints(unittest.TestCase):
+    def tearDown(self):
+        GitHubClient.configure_endpoints({})
+
+    def test_defaults_to_github(self):
+        GitHubClient.configure_endpoints({})
+
+        self.assertEqual(GitHubClient.BASE_API_URL, 'https://api.github.com')
+        self.assertEqual(GitHubClient.GRAPHQL_URL, 'https://api.github.com/graphql')
+        self.assertEqual(GitHubClient.TOKEN_URL, 'https://github.com/login/oauth/access_token')
+
+    @patch('backend.src.services.github_client.requests.request')
+    def test_requests_go_to_the_configured_hosts(self, mock_request):
+        GitHubClient.configure_endpoints({
+            'GITHUB_API_URL': 'http://127.0.0.1:9100/',
+            'GITHUB_OAUTH_URL': 'http://127.0.0.1:9100/login/oauth'
+        })
+        mock_request.return_value = MagicMock(status_code=200, headers={}, json=lambda: {'login': 'octocat'})
+
+        GitHubClient(access_token='test_token')._make_request('GET', f"{GitHubClient.BASE_API_URL}/user")
+
+        self.assertEqual(mock_request.call_args[0][1], 'http://127.0.0.1:9100/user')
+        self.assertEqual(GitHubClient.GRAPHQL_URL, 'http://127.0.0.1:9100/graphql')
+        self.assertEqual(GitHubClient.AUTH_URL, 'http://127.0.0.1:9100/login/oauth/authorize')
+
+def test_project_github_status_route(db_app):
+    from backend.src.db.models import db, User, Project, Task, GitHubToken, GitHubRepository, TaskGitHubLink
+    from backend.src.api.routes.github_routes import register_routes
+    from backend.src.api.controllers import github_controller
+
+    user = User(name='Dev', email='dev@example.com', password='x', role='client')
+    db.session.add(user)
+    db.session.flush()
+    project = Project(name='DevSync', created_by=user.id)
+    project.team_members.append(user)
+    repo = GitHubRepository(repo_name='octo/devsync', repo_url='https://github.com/octo/devsync', github_id=555)
+    db.session.add_all([project, repo, GitHubToken(user_id=user.id, access_token='gh-token')])
+    db.session.flush()
+    task = Task(title='Webhooks', status='in_progress', created_by=user.id, project_id=project.id)
+    db.session.add(task)
+    db.session.flush()
+    db.session.add(TaskGitHubLink(task_id=task.id, repo_id=repo.id, issue_number=7, pull_request_number=42))
+    db.session.commit()
+
+    bp = Blueprint('github_status_test', __name__)
+    register_routes(bp)
+    db_app.register_blueprint(bp)
+
+    # Other controller tests replace these module globals with mocks
+    with patch.object(github_controller, 'jsonify', flask.json.jsonify), \
+         patch.object(github_controller, 'get_jwt_identity', return_value={'user_id': user.id}), \
+         patch.object(github_controller, 'get_jwt', return_value={'role': 'client'}), \
+         patch('flask_jwt_extended.view_decorators.verify_jwt_in_request'), \
+         patch('backend.src.services.github_client.requests.request', side_effect=stub_graphql_endpoint) as mock_request:
+        response = db_app.test_client().get(f'/projects/{project.id}/github-status')
+
+    assert response.status_code == 200
+    assert mock_request.call_count == 1
+    link = response.get_json()['links'][0]
+    assert link['issue']['state'] == 'closed'
+    assert link['pull_request']['merged'] is True
+    assert link['pull_request']['checks'] == 'success'
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
+
+def test_project_github_status_requires_membership(db_app):
+    from backend.src.db.models import db, User, Project, GitHubToken
+    from backend.src.api.routes.github_routes import register_routes
+    from backend.src.api.controllers import github_controller
+
+    owner = User(name='Lead', email='lead@example.com', password='x', role='admin')
+    outsider = User(name='Dev', email='dev@example.com', password='x', role='client')
+    db.session.add_all([owner, outsider])
+    db.session.flush()
+    project = Project(name='DevSync', created_by=owner.id)
+    db.session.add_all([project, GitHubToken(user_id=outsider.id, access_token='gh-token')])
+    db.session.commit()
+
+    bp = Blueprint('github_status_membership_test', __name__)
+    register_routes(bp)
+    db_app.register_blueprint(bp)
+
+    with patch.object(github_controller, 'jsonify', flask.json.jsonify), \
+         patch.object(github_controller, 'get_jwt_identity', return_value={'user_id': outsider.id}), \
+         patch.object(github_controller, 'get_jwt', return_value={'role': 'client'}), \
+         patch('flask_jwt_extended.view_decorators.verify_jwt_in_request'), \
+         patch('backend.src.services.github_client.requests.request') as mock_request:
+        response = db_app.test_client().get(f'/projects/{project.id}/github-status')
+
+    assert response.status_code == 403
+    assert not mock_request.called
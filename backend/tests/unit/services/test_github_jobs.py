@@ -0,0 +1,167 @@
+import sys
+import os
+import json
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.db.models import db, User, Task, GitHubToken, GitHubRepository, TaskGitHubLink, GitHubJob
+from backend.src.services.github_client import PageFetchError, TruncatedListing
+from backend.src.services.github_jobs import (
+    enqueue_issue_comment, claim_jobs, idempotency_marker, GitHubJobWorker
+)
+
+@pytest.fixture
+def link(db_app):
+    user = User(name='Dev', email='dev@example.com', password='x', role='client')
+    db.session.add(user)
+    db.session.flush()
+    repo = GitHubRepository(repo_name='octo/devsync', repo_url='https://github.com/octo/devsync', github_id=555)
+    task = Task(title='Queue comments', status='todo', created_by=user.id)
+    db.session.add_all([repo, task, GitHubToken(user_id=user.id, access_token='gh-token')])
+    db.session.flush()
+    link = TaskGitHubLink(task_id=task.id, repo_id=repo.id, issue_number=7)
+    db.session.add(link)
+    db.session.commit()
+    return link
+
+@pytest.fixture
+def worker(db_app):
+    return GitHubJobWorker(db_app, retry_backoff=30)
+
+@pytest.fixture
+def github():
+    with patch('backend.src.services.github_jobs.GitHubClient') as client_class:
+        client = MagicMock()
+        client.iter_issue_comments.side_effect = lambda *args, **kwargs: iter([[]])
+        client.create_issue_comment.return_value = {'id': 9001}
+        client_class.return_value = client
+        yield client
+
+def queue_comment(link, max_attempts=5):
+    user_id = db.session.get(Task, link.task_id).created_by
+    job = enqueue_issue_comment(user_id, link,
+                                'octo', 'devsync', 7, 'Linked to DevSync', max_attempts=max_attempts)
+    db.session.commit()
+    return job
+
+def test_enqueue_is_idempotent(link):
+    first = queue_comment(link)
+    second = queue_comment(link)
+
+    assert first.id == second.id
+    assert GitHubJob.query.count() == 1
+    assert link.comment_status == 'pending'
+    assert json.loads(first.payload)['issue_number'] == 7
+
+def test_worker_posts_comment_with_marker(link, worker, github):
+    job = queue_comment(link)
+
+    totals = worker.process_pending()
+
+    assert totals == {'succeeded': 1, 'retrying': 0, 'failed': 0}
+    body = github.create_issue_comment.call_args[0][3]
+    assert body.startswith('Linked to DevSync')
+    assert idempotency_marker(job.idempotency_key) in body
+    assert db.session.get(GitHubJob, job.id).status == 'succeeded'
+    link = db.session.get(TaskGitHubLink, job.link_id)
+    assert link.comment_status == 'posted'
+    assert link.comment_id == 9001
+
+def test_failed_attempt_is_retried_with_backoff(link, worker, github):
+    job = queue_comment(link)
+    github.create_issue_comment.return_value = None
+
+    totals = worker.process_pending()
+
+    job = db.session.get(GitHubJob, job.id)
+    assert totals['retrying'] == 1
+    assert job.status == 'pending'
+    assert job.attempts == 1
+    assert job.next_attempt_at > datetime.utcnow() + timedelta(seconds=20)
+    # Not due yet, so nothing is claimed
+    assert claim_jobs(10) == []
+
+def lose_first_attempt(job, worker, github):
+    """The first attempt posted the comment but the response was lost"""
+    github.create_issue_comment.side_effect = Exception('Read timed out')
+    worker.process_pending()
+    GitHubJob.query.filter_by(id=job.id).update({GitHubJob.next_attempt_at: datetime.utcnow()})
+    db.session.commit()
+    github.create_issue_comment.side_effect = None
+
+def test_retry_does_not_post_duplicate_comment(link, worker, github):
+    job = queue_comment(link)
+    lose_first_attempt(job, worker, github)
+
+    # The earlier comment is on the second page of the issue's comments
+    github.iter_issue_comments.side_effect = lambda *args, **kwargs: iter([
+        [{'id': 1, 'body': 'Unrelated'}],
+        [{'id': 9002, 'body': 'Linked to DevSync\n\n' + idempotency_marker(job.idempotency_key)}]
+    ])
+    totals = worker.process_pending()
+
+    assert totals['succeeded'] == 1
+    assert github.create_issue_comment.call_count == 1
+    assert db.session.get(TaskGitHubLink, link.id).comment_id == 9002
+
+def failed_lookup(*args, **kwargs):
+    yield [{'id': 1, 'body': 'Unrelated'}]
+    raise PageFetchError(2, 'GitHub returned an error response')
+
+def truncated_lookup(*args, **kwargs):
+    yield [{'id': 1, 'body': 'Unrelated'}]
+    yield TruncatedListing(1, 3)
+
+@pytest.mark.parametrize('lookup', [failed_lookup, truncated_lookup], ids=['failed', 'truncated'])
+def test_retry_is_not_posted_when_the_lookup_is_incomplete(link, worker, github, lookup):
+    job = queue_comment(link)
+    lose_first_attempt(job, worker, github)
+
+    github.iter_issue_comments.side_effect = lookup
+    totals = worker.process_pending()
+
+    assert totals['retrying'] == 1
+    assert github.create_issue_comment.call_count == 1
+    job = db.session.get(GitHubJob, job.id)
+    assert job.status == 'pending'
+    assert job.attempts == 2
+
+def test_job_fails_after_max_attempts(link, worker, github):
+    job = queue_comment(link, max_attempts=1)
+    github.create_issue_comment.return_value = None
+
+    totals = worker.process_pending()
+
+    assert totals['failed'] == 1
+    assert db.session.get(GitHubJob, job.id).status == 'failed'
+    assert db.session.get(TaskGitHubLink, link.id).comment_status == 'failed'
+
+def test_job_without_token_fails_permanently(link, worker, github):
+    job = queue_comment(link)
+    GitHubToken.query.delete()
+    db.session.commit()
+
+    worker.process_pending()
+
+    job = db.session.get(GitHubJob, job.id)
+    assert job.status == 'failed'
+    assert job.attempts == 1
+    assert 'not connected' in job.last_error
+    github.create_issue_comment.assert_not_called()
+
+def test_running_job_is_reclaimed_after_lease_expires(link):
+    job = queue_comment(link)
+    assert [claimed.id for claimed in claim_jobs(10)] == [job.id]
+    assert claim_jobs(10) == []
+
+    GitHubJob.query.filter_by(id=job.id).update(
+        {GitHubJob.locked_at: datetime.utcnow() - timedelta(seconds=GitHubJobWorker.lease_seconds + 1)})
+    db.session.commit()
+
+    reclaimed = claim_jobs(10)
+    assert [claimed.id for claimed in reclaimed] == [job.id]
+    assert reclaimed[0].attempts == 2
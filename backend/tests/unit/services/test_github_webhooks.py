@@ -0,0 +1,169 @@
+import sys
+import os
+import hmac
+import hashlib
+import json
+import pytest
+from unittest.mock import patch
+import flask
+from flask import Blueprint
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.db.models import db, User, Task, GitHubRepository, TaskGitHubLink
+from backend.src.services.github_client import GitHubClient
+from backend.src.services.github_webhooks import (
+    verify_signature, normalise_event, WebhookEventQueue, WebhookProcessor,
+    apply_events, event_queue
+)
+
+SECRET = 'webhook-secret-for-tests'
+
+def sign(body, secret=SECRET):
+    return 'sha256=' + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+def pull_request_payload(number, state='closed', merged=True, repo_id=555, full_name='octo/devsync'):
+    return {
+        'action': 'closed',
+        'repository': {'id': repo_id, 'full_name': full_name},
+        'pull_request': {'number': number, 'state': state, 'merged': merged}
+    }
+
+def issue_payload(number, state, repo_id=555, full_name='octo/devsync'):
+    return {
+        'action': 'closed' if state == 'closed' else 'reopened',
+        'repository': {'id': repo_id, 'full_name': full_name},
+        'issue': {'number': number, 'state': state}
+    }
+
+@pytest.fixture
+def app(db_app):
+    db_app.config['GITHUB_WEBHOOK_SECRET'] = SECRET
+    user = User(name='Dev', email='dev@example.com', password='x', role='client')
+    db.session.add(user)
+    db.session.flush()
+    repo = GitHubRepository(repo_name='octo/devsync', repo_url='https://github.com/octo/devsync', github_id=555)
+    db.session.add(repo)
+    db.session.flush()
+    for title, issue, pull in [('Issue task', 7, None), ('PR task', None, 42)]:
+        task = Task(title=title, status='in_progress', progress=50, created_by=user.id)
+        db.session.add(task)
+        db.session.flush()
+        db.session.add(TaskGitHubLink(task_id=task.id, repo_id=repo.id,
+                                      issue_number=issue, pull_request_number=pull))
+    db.session.commit()
+    return db_app
+
+@pytest.fixture(autouse=True)
+def clear_queue():
+    event_queue.clear()
+    yield
+    event_queue.clear()
+
+def test_verify_signature():
+    body = b'{"zen": "Keep it logically awesome."}'
+    assert verify_signature(body, sign(body), SECRET)
+    assert not verify_signature(body, sign(body, 'other-secret'), SECRET)
+    assert not verify_signature(body, 'sha1=' + sign(body)[7:], SECRET)
+    assert not verify_signature(body, None, SECRET)
+    assert not verify_signature(body, sign(body), '')
+
+def test_normalise_issue_comment_on_pull_request():
+    event = normalise_event('issue_comment', {
+        'action': 'created',
+        'repository': {'id': 1, 'full_name': 'a/b'},
+        'issue': {'number': 3, 'pull_request': {'url': 'x'}}
+    })
+    assert event['kind'] == 'pull'
+    assert event['number'] == 3
+
+def test_queue_ignores_redeliveries_and_respects_capacity():
+    queue = WebhookEventQueue(max_size=2)
+    assert queue.put('issues', 'delivery-1', issue_payload(1, 'open'))
+    assert queue.put('issues', 'delivery-1', issue_payload(1, 'open'))
+    assert len(queue) == 1
+    assert queue.put('issues', 'delivery-2', issue_payload(2, 'open'))
+    assert not queue.put('issues', 'delivery-3', issue_payload(3, 'open'))
+    assert len(queue.drain(10)) == 2
+
+def test_apply_events_coalesces_issue_state(app):
+    events = [
+        normalise_event('issues', issue_payload(7, 'closed')),
+        normalise_event('issues', issue_payload(7, 'open')),
+    ]
+    summary = apply_events(events)
+
+    link = TaskGitHubLink.query.filter_by(issue_number=7).one()
+    assert summary['links_updated'] == 1
+    assert link.issue_state == 'open'
+    assert link.github_updated_at is not None
+
+def test_apply_events_completes_task_when_pr_merges(app):
+    summary = apply_events([normalise_event('pull_request', pull_request_payload(42))])
+
+    link = TaskGitHubLink.query.filter_by(pull_request_number=42).one()
+    task = db.session.get(Task, link.task_id)
+    assert summary['tasks_completed'] == 1
+    assert link.pull_request_state == 'merged'
+    assert task.status == 'done'
+    assert task.progress == 100
+
+def test_apply_events_matches_repository_by_name(app):
+    payload = pull_request_payload(42, state='closed', merged=False, repo_id=None)
+    apply_events([normalise_event('pull_request', payload)])
+
+    link = TaskGitHubLink.query.filter_by(pull_request_number=42).one()
+    assert link.pull_request_state == 'closed'
+    assert db.session.get(Task, link.task_id).status == 'in_progress'
+
+def test_apply_events_invalidates_cached_listings(app):
+    GitHubClient._cache['GET:https://api.github.com/repos/octo/devsync/issues:{}'] = []
+    GitHubClient._cache['GET:https://api.github.com/repos/octo/other/issues:{}'] = []
+    try:
+        apply_events([normalise_event('push', {'repository': {'id': 555, 'full_name': 'octo/devsync'}})])
+        assert 'GET:https://api.github.com/repos/octo/devsync/issues:{}' not in GitHubClient._cache
+        assert 'GET:https://api.github.com/repos/octo/other/issues:{}' in GitHubClient._cache
+    finally:
+        GitHubClient._cache.clear()
+        GitHubClient._cache_expiry.clear()
+
+def test_processor_applies_queue_in_batches(app):
+    queue = WebhookEventQueue()
+    for number in range(5):
+        queue.put('issues', f'delivery-{number}', issue_payload(number, 'closed'))
+    queue.put('pull_request', 'delivery-pr', pull_request_payload(42))
+
+    processor = WebhookProcessor(app, queue=queue, batch_size=2)
+    totals = processor.process_pending()
+
+    assert totals['events'] == 6
+    assert totals['tasks_completed'] == 1
+    assert len(queue) == 0
+
+def test_webhook_route_verifies_and_queues(app):
+    from backend.src.api.routes.github_routes import register_routes
+    from backend.src.api.controllers import github_controller
+
+    bp = Blueprint('github_webhook_test', __name__)
+    register_routes(bp)
+    app.register_blueprint(bp)
+    client = app.test_client()
+
+    # Other controller tests replace these module globals with mocks
+    with patch.object(github_controller, 'jsonify', flask.json.jsonify), \
+         patch.object(github_controller, 'request', flask.globals.request), \
+         patch.object(github_controller, 'current_app', flask.globals.current_app):
+        body = json.dumps(issue_payload(7, 'closed')).encode('utf-8')
+        headers = {'Content-Type': 'application/json', 'X-GitHub-Event': 'issues',
+                   'X-GitHub-Delivery': 'abc'}
+
+        response = client.post('/github/webhook', data=body,
+                               headers={**headers, 'X-Hub-Signature-256': sign(body, 'wrong')})
+        assert response.status_code == 401
+        assert len(event_queue) == 0
+
+        response = client.post('/github/webhook', data=body,
+                               headers={**headers, 'X-Hub-Signature-256': sign(body)})
+        assert response.status_code == 202
+        assert len(event_queue) == 1
@@ -0,0 +1,117 @@
+import sys
+import os
+import threading
+import pytest
+from flask import Flask
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.services.oauth_state_store import (
+    MemoryStateBackend, SQLiteStateBackend, RedisStateBackend, OAuthStateStore, create_state_backend
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, clock, tmp_path):
+    if request.param == 'memory':
+        return MemoryStateBackend(max_size=3, clock=clock)
+    return SQLiteStateBackend(str(tmp_path / 'states.db'), max_size=3, clock=clock)
+
+def test_pop_consumes_state_once(backend):
+    backend.put('abc', {'user_id': 7}, ttl=600)
+
+    assert backend.pop('abc') == {'user_id': 7}
+    assert backend.pop('abc') is None
+    assert backend.pop('unknown') is None
+
+def test_states_expire(backend, clock):
+    backend.put('old', {'user_id': 1}, ttl=600)
+    clock.now += 300
+    backend.put('new', {'user_id': 2}, ttl=600)
+    clock.now += 301
+
+    assert len(backend) == 1
+    assert backend.pop('old') is None
+    assert backend.pop('new') == {'user_id': 2}
+
+def test_size_cap_evicts_oldest(backend, clock):
+    for number in range(5):
+        backend.put(f'state-{number}', {'user_id': number}, ttl=600)
+        clock.now += 1
+
+    assert len(backend) == 3
+    assert backend.pop('state-0') is None
+    assert backend.pop('state-1') is None
+    assert backend.pop('state-4') == {'user_id': 4}
+
+def test_sqlite_states_are_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'states.db')
+    first_worker = SQLiteStateBackend(path)
+    second_worker = SQLiteStateBackend(path)
+
+    first_worker.put('abc', {'user_id': 7}, ttl=600)
+
+    assert second_worker.pop('abc') == {'user_id': 7}
+    assert first_worker.pop('abc') is None
+
+def test_sqlite_pop_is_atomic_across_threads(tmp_path):
+    backend = SQLiteStateBackend(str(tmp_path / 'states.db'))
+    backend.put('abc', {'user_id': 7}, ttl=600)
+    results = []
+    start = threading.Barrier(8)
+
+    def consume():
+        start.wait()
+        results.append(backend.pop('abc'))
+
+    threads = [threading.Thread(target=consume) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [result for result in results if result] == [{'user_id': 7}]
+
+def test_init_app_selects_backend(tmp_path):
+    app = Flask(__name__)
+    app.config.update({
+        'OAUTH_STATE_BACKEND': 'sqlite',
+        'OAUTH_STATE_SQLITE_PATH': str(tmp_path / 'states.db'),
+        'OAUTH_STATE_TTL': 120
+    })
+    store = OAuthStateStore()
+
+    store.init_app(app)
+    store.put('abc', {'user_id': 7})
+
+    assert isinstance(store.backend, SQLiteStateBackend)
+    assert store.ttl == 120
+    assert app.extensions['oauth_states'] is store
+    assert store.pop('abc') == {'user_id': 7}
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_state_backend({'OAUTH_STATE_BACKEND': 'memcached'})
+
+@pytest.mark.skipif(not os.getenv('TEST_REDIS_URL'), reason='TEST_REDIS_URL not set')
+def test_redis_backend():
+    backend = RedisStateBackend(url=os.getenv('TEST_REDIS_URL'), max_size=2, prefix='devsync:test:oauth_state:')
+    backend.client.delete(backend.index_key)
+    for number in range(3):
+        backend.put(f'state-{number}', {'user_id': number}, ttl=60)
+
+    assert len(backend) == 2
+    assert backend.pop('state-0') is None
+    assert backend.pop('state-2') == {'user_id': 2}
+    assert backend.pop('state-2') is None
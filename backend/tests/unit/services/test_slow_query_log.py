@@ -0,0 +1,134 @@
+import sys
+import os
+import datetime
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine, text
+
+# Set up proper import paths
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from backend.src.services import slow_query_log as slow_query_log_module
+from backend.src.services.slow_query_log import SlowQueryLog, redact_parameters, indexes_in_plan
+
+PLAN = [
+    'Nested Loop  (cost=0.29..16.33 rows=1 width=72) (actual time=0.020..0.021 rows=1 loops=1)',
+    '  ->  Index Scan using idx_task_project_id on tasks  (cost=0.29..8.30 rows=1 width=40)',
+    '  ->  Index Only Scan using users_pkey on users  (cost=0.29..8.30 rows=1 width=32)',
+    '  Buffers: shared hit=6'
+]
+
+def postgres_connection(plan=PLAN, fail=False):
+    """A PostgreSQL connection whose engine hands out a separate DBAPI connection for EXPLAIN"""
+    conn = MagicMock()
+    conn.dialect.name = 'postgresql'
+    cursor = conn.engine.raw_connection.return_value.cursor.return_value
+
+    def execute(sql, parameters=None):
+        if fail and sql.startswith('EXPLAIN'):
+            raise RuntimeError('canceling statement due to statement timeout')
+
+    cursor.execute.side_effect = execute
+    cursor.fetchall.return_value = [(line,) for line in plan]
+    return conn, cursor
+
+def test_redact_parameters_keeps_only_non_identifying_values():
+    redacted = redact_parameters({
+        'id': 7, 'done': True, 'email': 'ada@example.com', 'token': b'secret',
+        'deadline': datetime.date(2025, 1, 2), 'missing': None
+    })
+
+    assert redacted == {
+        'id': 7, 'done': True, 'email': '<redacted 15 chars>', 'token': '<redacted 6 chars>',
+        'deadline': '2025-01-02', 'missing': None
+    }
+    assert redact_parameters(('x', 1)) == ['<redacted 1 chars>', 1]
+
+def test_only_statements_over_threshold_are_kept_in_a_ring_buffer():
+    log = SlowQueryLog(threshold_ms=100, size=2, explain=False)
+    conn = MagicMock()
+
+    assert log.observe(conn, 'SELECT 1', (), 0.05) is None
+    for number in range(3):
+        log.observe(conn, f'SELECT {number}', (), 0.2)
+
+    assert [entry['statement'] for entry in log.entries()] == ['SELECT 2', 'SELECT 1']
+    assert log.entries(limit=1)[0]['duration_ms'] == 200.0
+
+def test_postgres_selects_are_explained_off_the_request_thread():
+    log = SlowQueryLog(threshold_ms=100, explain_sample_rate=1.0)
+    conn, cursor = postgres_connection()
+    explain_connection = conn.engine.raw_connection.return_value
+
+    entry = log.observe(conn, 'SELECT * FROM tasks WHERE project_id = %(project_id)s', {'project_id': 3}, 0.3)
+    log.wait_for_explains()
+
+    # The caller's connection is never used to re-run the statement
+    assert not conn.connection.cursor.called
+    executed = [call[0][0] for call in cursor.execute.call_args_list]
+    assert executed[0] == 'SET TRANSACTION READ ONLY'
+    assert executed[1].startswith('EXPLAIN (ANALYZE, BUFFERS) SELECT')
+    assert explain_connection.rollback.called
+    assert explain_connection.close.called
+    assert entry['plan'] == PLAN
+    assert log.index_usage() == {'idx_task_project_id': 1, 'users_pkey': 1}
+
+@pytest.mark.parametrize('statement', [
+    'UPDATE tasks SET status = %(status)s',
+    'WITH moved AS (UPDATE tasks SET status = \'done\' RETURNING id) SELECT * FROM moved',
+    'WITH gone AS (DELETE FROM notifications RETURNING id) SELECT count(*) FROM gone',
+    'SELECT * FROM tasks WHERE id = %(id)s FOR UPDATE',
+    'SELECT * FROM tasks FOR NO KEY UPDATE SKIP LOCKED',
+    'SELECT * FROM github_jobs FOR SHARE'
+])
+def test_writes_and_locking_reads_are_not_explained(statement):
+    log = SlowQueryLog(threshold_ms=100, explain_sample_rate=1.0)
+    conn, _ = postgres_connection()
+
+    entry = log.observe(conn, statement, {}, 0.3)
+    log.wait_for_explains()
+
+    assert entry['plan'] is None
+    assert not conn.engine.raw_connection.called
+
+def test_failed_explains_are_rolled_back():
+    log = SlowQueryLog(threshold_ms=100, explain_sample_rate=1.0)
+    conn, cursor = postgres_connection(fail=True)
+
+    select = log.observe(conn, 'SELECT * FROM tasks', {}, 0.3)
+    log.wait_for_explains()
+
+    assert select['plan'] is None
+    assert conn.engine.raw_connection.return_value.rollback.called
+
+def test_explains_beyond_the_queue_are_dropped():
+    log = SlowQueryLog(threshold_ms=100, explain_sample_rate=1.0, explain_queue_size=1)
+    conn, _ = postgres_connection()
+    release = threading.Event()
+    conn.engine.raw_connection.side_effect = lambda: release.wait() and conn.engine.raw_connection.return_value
+
+    entries = [log.observe(conn, 'SELECT * FROM tasks', {}, 0.3) for _ in range(5)]
+    release.set()
+    log.wait_for_explains()
+
+    # One statement was being explained and one queued; the rest were skipped
+    assert sum(entry['plan'] is not None for entry in entries) <= 2
+    assert entries[-1]['plan'] is None
+
+def test_indexes_in_plan():
+    assert indexes_in_plan(['Bitmap Index Scan on idx_task_status  (cost=0.00..4.18 rows=10 width=0)']) == ['idx_task_status']
+    assert indexes_in_plan(None) == []
+
+def test_engine_statements_are_observed():
+    engine = create_engine('sqlite://')
+    log = SlowQueryLog(threshold_ms=0, explain=False)
+
+    with patch('backend.src.api.middlewares.query_stats.slow_query_log', log):
+        with engine.connect() as conn:
+            conn.execute(text('SELECT :value'), {'value': 'secret'})
+
+    entry = log.entries()[0]
+    assert entry['statement'] == 'SELECT ?'
+    assert entry['parameters'] == ['<redacted 6 chars>']
+    assert entry['request'] is None